@@ -6,6 +6,7 @@ A command-line task management system with user authentication and task manageme
 This project is organized into the following modules:
 - user_management: User authentication and registration functionality
 - task_management: Core task management operations (add, load, view tasks)
+- storage: Pluggable storage backends (flat file, SQLite)
 - utils: Utility functions and helpers
 
 Author: Alex Clark
@@ -0,0 +1,20 @@
+"""
+Task Management System - Benchmarks
+
+This package measures the storage-facing operations of the task manager on synthetic
+data sets, so that performance regressions show up as numbers rather than anecdotes.
+
+The package is organized into the following components:
+- generate: Deterministic generator for large tasks.txt/users.txt data sets
+- run: Benchmark runner reporting latency percentiles, throughput and peak memory as JSON
+- kdf: Password hashing throughput, for tuning the KDF cost settings
+
+Usage:
+    python -m benchmarks.run --scales 1k,100k --output results.json
+    python -m benchmarks.run --scales 1k,100k --compare results.json
+    python -m benchmarks.kdf --threads 4
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
@@ -0,0 +1,166 @@
+"""
+Benchmarks - Synthetic Dataset Generator
+
+This module writes realistic tasks.txt and users.txt files at a configurable scale, so
+the storage layer can be measured on data sets far larger than any hand-made one. The
+output is deterministic for a given seed, and rows are streamed to disk in batches, so
+even tens of millions of tasks are generated in constant memory.
+
+Usage:
+    python -m benchmarks.generate --out DIR [--users 1000] [--tasks-per-user 100]
+        [--status-mix pending=0.6,completed=0.3,in_progress=0.07,cancelled=0.03]
+        [--title-words 2-8] [--seed 0]
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+
+# Vocabulary that generated titles are drawn from
+TITLE_WORDS = (
+    "buy milk eggs bread call mom dad dentist doctor finish project report review code "
+    "deploy release fix bug write docs plan sprint meeting email reply invoice pay rent "
+    "book flights hotel pack bags clean kitchen garage laundry water plants walk dog "
+    "gym run yoga read chapter study exam homework essay draft slides prepare demo "
+    "update resume apply job renew passport license schedule call backup laptop"
+).split()
+
+DEFAULT_STATUS_MIX = {"pending": 0.6, "completed": 0.3, "in_progress": 0.07, "cancelled": 0.03}
+
+# Rows written per write() call
+_BATCH_SIZE = 10000
+
+
+@dataclass
+class DatasetSpec:
+    """
+    Shape of a generated data set.
+
+    Attributes:
+        users (int): Number of registered users
+        tasks_per_user (int): Average number of tasks per user
+        status_mix (Dict[str, float]): Relative weight of each task status
+        title_words (Tuple[int, int]): Minimum and maximum number of words per title
+        seed (int): Random seed; the same spec always produces the same files
+    """
+    users: int = 1000
+    tasks_per_user: int = 100
+    status_mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_STATUS_MIX))
+    title_words: Tuple[int, int] = (2, 8)
+    seed: int = 0
+
+    @property
+    def rows(self) -> int:
+        return self.users * self.tasks_per_user
+
+
+def username_for(index: int) -> str:
+    """Return the generated username with the given index."""
+    return f"user{index:07d}"
+
+
+def password_for(username: str) -> str:
+    """Return the plain-text password the generator gives a user."""
+    return f"password-{username}"
+
+
+def generate_dataset(directory: str, spec: DatasetSpec, sample_size: int = 1000) -> List[Tuple[str, str]]:
+    """
+    Write tasks.txt and users.txt for a data set into a directory.
+
+    Args:
+        directory (str): Output directory (created if needed; existing files are replaced)
+        spec (DatasetSpec): Shape of the data set
+        sample_size (int): Number of (task_id, username) pairs to return
+
+    Returns:
+        List[Tuple[str, str]]: A uniform random sample of the generated tasks, for
+        benchmarks that need existing task IDs
+
+    Note:
+        Tasks of different users are interleaved, as they would be in a shared file
+        written over time.
+    """
+    rng = random.Random(spec.seed)
+    os.makedirs(directory, exist_ok=True)
+    statuses = list(spec.status_mix)
+    weights = [spec.status_mix[status] for status in statuses]
+    min_words, max_words = spec.title_words
+
+    with open(os.path.join(directory, "users.txt"), "w", encoding="utf-8") as file:
+        for index in range(spec.users):
+            username = username_for(index)
+            password_hash = hashlib.sha256(password_for(username).encode()).hexdigest()
+            file.write(f"{username}:{password_hash}\n")
+
+    sample: List[Tuple[str, str]] = []
+    with open(os.path.join(directory, "tasks.txt"), "w", encoding="utf-8") as file:
+        for start in range(0, spec.rows, _BATCH_SIZE):
+            count = min(_BATCH_SIZE, spec.rows - start)
+            owners = [username_for(rng.randrange(spec.users)) for _ in range(count)]
+            chosen = rng.choices(statuses, weights, k=count)
+            lines = []
+            for offset, (username, status) in enumerate(zip(owners, chosen)):
+                task_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+                title = " ".join(rng.choices(TITLE_WORDS, k=rng.randint(min_words, max_words))).capitalize()
+                lines.append(f"{task_id}|{username}|{title}|{status}\n")
+
+                # Reservoir sampling keeps the sample uniform over every row
+                row = start + offset
+                if row < sample_size:
+                    sample.append((task_id, username))
+                else:
+                    slot = rng.randrange(row + 1)
+                    if slot < sample_size:
+                        sample[slot] = (task_id, username)
+            file.writelines(lines)
+    return sample
+
+
+def parse_status_mix(text: str) -> Dict[str, float]:
+    """Parse a "status=weight,status=weight" string."""
+    mix = {}
+    for item in text.split(","):
+        status, _, weight = item.partition("=")
+        mix[status.strip()] = float(weight)
+    if not mix or any(weight < 0 for weight in mix.values()) or not sum(mix.values()):
+        raise ValueError("Status mix needs at least one positive weight")
+    return mix
+
+
+def parse_range(text: str) -> Tuple[int, int]:
+    """Parse an "a-b" (or single "a") word-count range."""
+    low, _, high = text.partition("-")
+    bounds = (int(low), int(high or low))
+    if bounds[0] < 1 or bounds[1] < bounds[0]:
+        raise ValueError("Word range must satisfy 1 <= min <= max")
+    return bounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic tasks.txt/users.txt data set.")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--users", type=int, default=1000, help="Number of users")
+    parser.add_argument("--tasks-per-user", type=int, default=100, help="Average tasks per user")
+    parser.add_argument("--status-mix", type=parse_status_mix, default=dict(DEFAULT_STATUS_MIX),
+                        help="Status weights, e.g. pending=0.6,completed=0.4")
+    parser.add_argument("--title-words", type=parse_range, default=(2, 8), help="Words per title, e.g. 2-8")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    spec = DatasetSpec(args.users, args.tasks_per_user, args.status_mix, args.title_words, args.seed)
+    generate_dataset(args.out, spec, sample_size=0)
+    print(f"Wrote {spec.rows} tasks for {spec.users} users to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmarks - Password Hashing
+
+This module measures how many password verifications per second the configured
+password hashing settings allow, so their cost can be tuned against real throughput.
+Running it with as many threads as the API server's hashing pool shows how many
+logins per second the server can accept before login requests start to queue.
+
+The settings under test are read from the same environment variables the application
+uses (see user_management.passwords), for example:
+    TASK_MANAGER_SCRYPT_N=32768 python -m benchmarks.kdf --threads 4
+
+Usage:
+    python -m benchmarks.kdf [--seconds 3] [--threads 4]
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path for application imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from user_management.passwords import (
+    SCRYPT, SCRYPT_P, SCRYPT_R, current_scheme, hash_password, kdf_workers, pbkdf2_iterations,
+    scrypt_n, verify_password
+)
+
+
+def measure(seconds: float = 3.0, threads: int = 1) -> float:
+    """
+    Measure password verifications per second with the current settings.
+
+    Args:
+        seconds (float): How long to keep hashing
+        threads (int): Number of threads hashing concurrently, as the server's pool would
+
+    Returns:
+        float: Verifications per second across all threads
+    """
+    stored_password = hash_password("benchmark-password")
+    deadline = time.perf_counter() + seconds
+
+    def worker(_: int) -> int:
+        done = 0
+        while True:
+            verify_password("benchmark-password", stored_password)
+            done += 1
+            if time.perf_counter() >= deadline:
+                return done
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        total = sum(executor.map(worker, range(threads)))
+    return total / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the cost of the password hashing settings.")
+    parser.add_argument("--seconds", type=float, default=3.0, help="How long to measure for")
+    parser.add_argument("--threads", type=int, default=kdf_workers(), help="Concurrent hashing threads")
+    args = parser.parse_args()
+
+    threads = max(1, args.threads)
+    scheme = current_scheme()
+    if scheme == SCRYPT:
+        cost = f"n={scrypt_n()}, r={SCRYPT_R}, p={SCRYPT_P}"
+    else:
+        cost = f"iterations={pbkdf2_iterations()}"
+    rate = measure(args.seconds, threads)
+    print(f"{scheme} ({cost}), {threads} thread(s): {rate:.1f} verifications/s, "
+          f"{1000 * threads / rate:.1f} ms per verification")
+
+
+if __name__ == "__main__":
+    main()
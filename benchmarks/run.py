@@ -0,0 +1,334 @@
+"""
+Benchmarks - Runner
+
+This module times the operations the rest of the application relies on - loading,
+looking up, updating and deleting tasks, and looking up users - against generated data
+sets of increasing size. Each operation is called through its public function, exactly
+as the CLI and server call it, with the active storage backend pointed at the data set.
+
+For every (scale, operation) pair the runner reports p50/p99 latency, mean latency,
+throughput and the peak memory allocated by a call, prints a table and optionally
+writes everything as JSON. A previous JSON report can be passed with --compare to see
+how each number moved.
+
+Usage:
+    python -m benchmarks.run [--scales 1k,100k,10M] [--storage flat] [--iterations 200]
+        [--tasks-per-user 100] [--output results.json] [--compare baseline.json]
+        [--skip-memory] [--workdir DIR]
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Add parent directory to path for application imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage import create_backend, get_backend, migrate, set_backend
+from storage.flat_file import FlatFileBackend
+from task_management.complete_task import update_task_status
+from task_management.delete_task import delete_task
+from task_management.load_task import get_task_by_id, load_tasks
+from task_management.query_cache import QueryCache, set_query_cache
+from user_management.login import find_user_credentials
+from user_management.register import check_username
+
+from .generate import DatasetSpec, generate_dataset, username_for
+
+
+SCALE_NAMES = {"1k": 1000, "100k": 100_000, "10m": 10_000_000}
+
+# Cold loads re-parse the whole file, so they get far fewer iterations
+COLD_ITERATIONS = 3
+
+# Extra calls per operation made under tracemalloc, separately from the timed calls
+MEMORY_ITERATIONS = 5
+
+
+def parse_scale(text: str) -> int:
+    """Parse a row count such as "1k", "100k", "10M" or "2500"."""
+    text = text.strip().lower()
+    if text in SCALE_NAMES:
+        return SCALE_NAMES[text]
+    multiplier = {"k": 1000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * multiplier)
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of an ascending sequence."""
+    rank = max(1, -(-len(sorted_values) * fraction // 1))
+    return sorted_values[int(rank) - 1]
+
+
+class Operation:
+    """
+    One benchmarked call.
+
+    Attributes:
+        name (str): Name shown in the report
+        call (Callable[[int], Any]): Performs the i-th call
+        iterations (int): Number of timed calls
+        setup (Optional[Callable[[], None]]): Run before every call, outside the timing
+    """
+
+    def __init__(self, name: str, call: Callable[[int], Any], iterations: int,
+                 setup: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.call = call
+        self.iterations = iterations
+        self.setup = setup
+
+
+def measure(operation: Operation, memory: bool) -> Dict[str, Any]:
+    """
+    Time an operation and, optionally, measure its peak allocation.
+
+    Args:
+        operation (Operation): The operation to run
+        memory (bool): Also run MEMORY_ITERATIONS calls under tracemalloc
+
+    Returns:
+        Dict[str, Any]: Latency percentiles (ms), throughput (ops/s) and peak memory (bytes)
+
+    Note:
+        The application prints progress messages; they are discarded while measuring
+        so that terminal output does not dominate the timings.
+    """
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()) as sink:
+        for index in range(operation.iterations):
+            if operation.setup is not None:
+                operation.setup()
+            start = time.perf_counter_ns()
+            operation.call(index)
+            timings.append(time.perf_counter_ns() - start)
+            sink.seek(0)
+            sink.truncate()
+
+        peak = None
+        if memory:
+            tracemalloc.start()
+            peak = 0
+            for index in range(operation.iterations, operation.iterations + MEMORY_ITERATIONS):
+                if operation.setup is not None:
+                    operation.setup()
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                operation.call(index)
+                peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+                sink.seek(0)
+                sink.truncate()
+            tracemalloc.stop()
+
+    timings.sort()
+    total_seconds = sum(timings) / 1e9
+    return {
+        "operation": operation.name,
+        "iterations": operation.iterations,
+        "p50_ms": round(percentile(timings, 0.50) / 1e6, 4),
+        "p99_ms": round(percentile(timings, 0.99) / 1e6, 4),
+        "mean_ms": round(total_seconds * 1000 / len(timings), 4),
+        "ops_per_sec": round(len(timings) / total_seconds, 1) if total_seconds else None,
+        "peak_memory_bytes": peak,
+    }
+
+
+def build_operations(storage: str, spec: DatasetSpec, sample: List[Tuple[str, str]],
+                     iterations: int) -> List[Operation]:
+    """
+    Create the operations to benchmark against a generated data set.
+
+    Args:
+        storage (str): Storage specification, as for TASK_MANAGER_STORAGE
+        spec (DatasetSpec): Shape of the data set
+        sample (List[Tuple[str, str]]): Existing (task_id, username) pairs
+        iterations (int): Timed calls per operation
+
+    Returns:
+        List[Operation]: The operations, in the order they must run (deletions last)
+    """
+    rng = random.Random(spec.seed + 1)
+    calls = iterations + MEMORY_ITERATIONS
+    # Deletions need tasks no other operation touches
+    doomed, survivors = sample[-calls:], sample[:-calls]
+    lookups = [rng.choice(survivors) for _ in range(calls)]
+    usernames = [username_for(rng.randrange(spec.users)) for _ in range(calls)]
+    # Half of the availability checks are for names that are not taken
+    candidates = [name if index % 2 else f"new-{name}" for index, name in enumerate(usernames)]
+    statuses = ["completed", "in_progress", "pending"]
+
+    def reload_backend() -> None:
+        set_backend(create_backend(storage))
+
+    return [
+        Operation("find_user_credentials", lambda i: find_user_credentials(usernames[i]), iterations),
+        Operation("check_username", lambda i: check_username(candidates[i]), iterations),
+        Operation("load_tasks_cold", lambda i: load_tasks(usernames[i]), COLD_ITERATIONS, setup=reload_backend),
+        Operation("load_tasks", lambda i: load_tasks(usernames[i]), iterations),
+        Operation("get_task_by_id", lambda i: get_task_by_id(*lookups[i]), iterations),
+        Operation("update_task_status",
+                  lambda i: update_task_status(lookups[i][0], lookups[i][1], statuses[i % len(statuses)]),
+                  iterations),
+        Operation("delete_task", lambda i: delete_task(*doomed[i]), iterations),
+    ]
+
+
+@contextlib.contextmanager
+def confirm_prompts():
+    """Answer 'y' to every interactive confirmation (delete_task asks before deleting)."""
+    original = builtins.input
+    builtins.input = lambda prompt="": "y"
+    try:
+        yield
+    finally:
+        builtins.input = original
+
+
+def run_scale(rows: int, storage: str, tasks_per_user: int, iterations: int,
+              memory: bool, workdir: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Generate a data set of the given size and benchmark every operation against it.
+
+    Args:
+        rows (int): Number of tasks to generate
+        storage (str): Storage specification to benchmark
+        tasks_per_user (int): Average tasks per user
+        iterations (int): Timed calls per operation
+        memory (bool): Whether to measure peak memory
+        workdir (Optional[str]): Directory to create the data set in, created if missing
+            (default: system temp)
+
+    Returns:
+        List[Dict[str, Any]]: One result per operation
+    """
+    spec = DatasetSpec(users=max(1, rows // tasks_per_user), tasks_per_user=tasks_per_user)
+    spec.tasks_per_user = rows // spec.users
+    if workdir:
+        os.makedirs(workdir, exist_ok=True)
+    directory = tempfile.mkdtemp(prefix=f"benchmark-{rows}-", dir=workdir)
+    previous_directory = os.getcwd()
+    calls = iterations + MEMORY_ITERATIONS
+    backend = None
+    try:
+        started = time.perf_counter()
+        sample = generate_dataset(directory, spec, sample_size=min(spec.rows, 2 * calls))
+        print(f"Generated {spec.rows} tasks for {spec.users} users in {time.perf_counter() - started:.1f}s")
+        if len(sample) < 2 * calls:
+            raise ValueError(f"{spec.rows} rows are too few for {iterations} iterations")
+
+        # The default storage paths are relative, so run inside the data set
+        os.chdir(directory)
+        if storage != "flat":
+            started = time.perf_counter()
+            source, target = FlatFileBackend(), create_backend(storage)
+            if target.user_exists(username_for(0)):
+                # The file-based engines share users.txt with the flat backend
+                target.add_tasks(source.iter_tasks())
+            else:
+                migrate(source, target)
+            target.close()
+            print(f"Migrated the data set to {storage} in {time.perf_counter() - started:.1f}s")
+        backend = create_backend(storage)
+        set_backend(backend)
+        # Time the storage path itself; repeated lookups would otherwise be cache hits
+        set_query_cache(QueryCache(max_entries=0))
+
+        results = []
+        with confirm_prompts():
+            for operation in build_operations(storage, spec, sample, iterations):
+                result = measure(operation, memory)
+                result.update(rows=spec.rows, users=spec.users)
+                results.append(result)
+                print(format_row(result))
+        return results
+    finally:
+        if backend is not None:
+            # Cold-load runs replace the backend, so close whichever one is active
+            get_backend().close()
+        os.chdir(previous_directory)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def format_row(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """Format one result as a table row, with p50/p99 ratios against a baseline if given."""
+    peak = result["peak_memory_bytes"]
+    row = (f"{result['rows']:>10}  {result['operation']:<22} {result['p50_ms']:>10.4f} "
+           f"{result['p99_ms']:>10.4f} {result['ops_per_sec'] or 0:>12.1f} "
+           f"{'-' if peak is None else f'{peak / 1024:.1f} KiB':>12}")
+    if baseline:
+        ratios = [result[key] / baseline[key] if baseline.get(key) else float("nan") for key in ("p50_ms", "p99_ms")]
+        row += f"  p50 x{ratios[0]:.2f}  p99 x{ratios[1]:.2f}"
+    return row
+
+
+def print_table(results: List[Dict[str, Any]], baseline: Optional[Dict[Tuple[int, str], Dict[str, Any]]] = None) -> None:
+    """Print results as a table, compared with a baseline report if given."""
+    print(f"\n{'rows':>10}  {'operation':<22} {'p50 (ms)':>10} {'p99 (ms)':>10} {'ops/sec':>12} {'peak mem':>12}")
+    for result in results:
+        previous = baseline.get((result["rows"], result["operation"])) if baseline else None
+        print(format_row(result, previous))
+
+
+def load_report(path: str) -> Dict[Tuple[int, str], Dict[str, Any]]:
+    """Load a previous JSON report, keyed by (rows, operation)."""
+    with open(path, "r", encoding="utf-8") as file:
+        report = json.load(file)
+    return {(result["rows"], result["operation"]): result for result in report["results"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark task and user operations on synthetic data sets.")
+    parser.add_argument("--scales", default="1k,100k", help="Comma-separated row counts, e.g. 1k,100k,10M")
+    parser.add_argument("--storage", default="flat", help="Storage specification, as for TASK_MANAGER_STORAGE")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per operation")
+    parser.add_argument("--tasks-per-user", type=int, default=100, help="Average tasks per user")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    parser.add_argument("--skip-memory", action="store_true", help="Do not measure peak memory")
+    parser.add_argument("--workdir", help="Directory for the generated data sets (default: system temp)")
+    args = parser.parse_args()
+    if args.iterations < 1:
+        parser.error("--iterations must be at least 1")
+
+    # Load the baseline first so a bad path fails before a long run
+    baseline = load_report(args.compare) if args.compare else None
+    results = []
+    for scale in args.scales.split(","):
+        results.extend(run_scale(parse_scale(scale), args.storage, args.tasks_per_user,
+                                 args.iterations, not args.skip_memory, args.workdir))
+
+    print_table(results, baseline)
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "storage": args.storage,
+                "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Task Manager System - Metrics Module
+
+This module provides lightweight instrumentation for the task and user operations:
+call counts, latency histograms and errors per operation, plus counters for the rows
+parsed and bytes read or written while serving them. The numbers can be read as a
+snapshot, rendered in the Prometheus text exposition format, or streamed to callbacks.
+
+Instrumentation is off by default and costs one global flag check per call while off.
+Turn it on with the TASK_MANAGER_METRICS=1 environment variable or with enable().
+
+A single call can also be profiled with cProfile through profile_call(); the API
+server uses the same report format to profile individual requests on demand.
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+METRICS_ENV_VAR = "TASK_MANAGER_METRICS"
+
+# Upper bounds of the latency histogram buckets, in seconds (the last bucket is +Inf)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Counters that operations may add to with count()
+COUNTERS = ("rows_parsed", "bytes_read", "bytes_written")
+
+# Called with (operation, metric, value) for every observation; metric is "seconds",
+# "errors" or one of COUNTERS
+Listener = Callable[[str, str, float], None]
+
+_enabled = os.environ.get(METRICS_ENV_VAR, "") not in ("", "0")
+_lock = threading.Lock()
+_operations: Dict[str, "_OperationStats"] = {}
+_listeners: List[Listener] = []
+
+
+class _OperationStats:
+    """Accumulated measurements for one operation."""
+
+    __slots__ = ("calls", "errors", "seconds", "buckets", "counters")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+
+def is_enabled() -> bool:
+    """Return True if measurements are currently being recorded."""
+    return _enabled
+
+
+def enable() -> None:
+    """Start recording measurements."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording measurements (already recorded ones are kept)."""
+    global _enabled
+    _enabled = False
+
+
+def reset() -> None:
+    """Discard every recorded measurement."""
+    with _lock:
+        _operations.clear()
+
+
+def add_listener(listener: Listener) -> None:
+    """
+    Register a callback that receives every observation as it is recorded.
+
+    Args:
+        listener (Listener): Called with (operation, metric, value)
+
+    Note:
+        Listeners run on the thread that made the observation, so they should be quick;
+        an exception raised by a listener is printed and otherwise ignored.
+    """
+    with _lock:
+        _listeners.append(listener)
+
+
+def remove_listener(listener: Listener) -> None:
+    """Unregister a callback added with add_listener()."""
+    with _lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def _stats(operation: str) -> _OperationStats:
+    # Callers hold _lock
+    stats = _operations.get(operation)
+    if stats is None:
+        stats = _operations[operation] = _OperationStats()
+    return stats
+
+
+def _notify(operation: str, metric: str, value: float) -> None:
+    for listener in list(_listeners):
+        try:
+            listener(operation, metric, value)
+        except Exception as e:
+            print(f"Warning: Metrics listener failed: {e}")
+
+
+def observe(operation: str, seconds: float, error: bool = False) -> None:
+    """
+    Record one call of an operation.
+
+    Args:
+        operation (str): Operation name, e.g. "load_tasks"
+        seconds (float): How long the call took
+        error (bool): Whether the call raised an exception
+    """
+    if not _enabled:
+        return
+    bucket = 0
+    while bucket < len(LATENCY_BUCKETS) and seconds > LATENCY_BUCKETS[bucket]:
+        bucket += 1
+    with _lock:
+        stats = _stats(operation)
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.buckets[bucket] += 1
+        if error:
+            stats.errors += 1
+    if _listeners:
+        _notify(operation, "seconds", seconds)
+        if error:
+            _notify(operation, "errors", 1)
+
+
+def count(operation: str, counter: str, amount: int) -> None:
+    """
+    Add to one of an operation's counters.
+
+    Args:
+        operation (str): Operation name, e.g. "task_store.load"
+        counter (str): One of COUNTERS
+        amount (int): Amount to add
+    """
+    if not _enabled:
+        return
+    with _lock:
+        counters = _stats(operation).counters
+        counters[counter] = counters.get(counter, 0) + amount
+    if _listeners:
+        _notify(operation, counter, amount)
+
+
+def instrument(operation: Optional[str] = None) -> Callable:
+    """
+    Decorator that records the call count, latency and errors of a function.
+
+    Args:
+        operation (Optional[str]): Operation name (defaults to the function's name)
+
+    Returns:
+        Callable: The decorator
+
+    Example:
+        @instrument("task_store.load")
+        def _load(self, signature): ...
+    """
+    def decorator(function: Callable) -> Callable:
+        name = operation or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except BaseException:
+                observe(name, time.perf_counter() - start, error=True)
+                raise
+            observe(name, time.perf_counter() - start)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """
+    Return a copy of everything recorded so far.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Maps each operation to its "calls", "errors",
+        "seconds" (total), "buckets" (cumulative counts per LATENCY_BUCKETS bound,
+        then +Inf) and one entry per counter
+    """
+    with _lock:
+        result = {}
+        for operation, stats in sorted(_operations.items()):
+            cumulative, total = [], 0
+            for bucket_count in stats.buckets:
+                total += bucket_count
+                cumulative.append(total)
+            result[operation] = {"calls": stats.calls, "errors": stats.errors,
+                                 "seconds": stats.seconds, "buckets": cumulative, **stats.counters}
+        return result
+
+
+def _label(operation: str) -> str:
+    escaped = operation.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'operation="{escaped}"'
+
+
+def render_prometheus(prefix: str = "task_manager") -> str:
+    """
+    Render the recorded measurements in the Prometheus text exposition format.
+
+    Args:
+        prefix (str): Prefix for every metric name
+
+    Returns:
+        str: One histogram of operation latencies plus one counter per measurement
+    """
+    data = snapshot()
+    lines = [f"# HELP {prefix}_operation_seconds Latency of task manager operations.",
+             f"# TYPE {prefix}_operation_seconds histogram"]
+    for operation, stats in data.items():
+        label = _label(operation)
+        if not stats["calls"]:
+            continue  # Only counters were recorded for this operation
+        for bound, cumulative in zip(LATENCY_BUCKETS + ("+Inf",), stats["buckets"]):
+            lines.append(f'{prefix}_operation_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+        lines.append(f"{prefix}_operation_seconds_sum{{{label}}} {stats['seconds']:.9f}")
+        lines.append(f"{prefix}_operation_seconds_count{{{label}}} {stats['calls']}")
+
+    for metric, description in (("errors", "Operation calls that raised an exception."),
+                                ("rows_parsed", "Rows parsed from storage files."),
+                                ("bytes_read", "Bytes read from storage files."),
+                                ("bytes_written", "Bytes written to storage files.")):
+        lines.append(f"# HELP {prefix}_{metric}_total {description}")
+        lines.append(f"# TYPE {prefix}_{metric}_total counter")
+        for operation, stats in data.items():
+            if stats[metric]:
+                lines.append(f"{prefix}_{metric}_total{{{_label(operation)}}} {stats[metric]}")
+    return "\n".join(lines) + "\n"
+
+
+def profile_report(profiler: cProfile.Profile, sort: str = "cumulative", limit: int = 25) -> str:
+    """
+    Format the statistics collected by a profiler.
+
+    Args:
+        profiler (cProfile.Profile): Profiler that has run one or more calls
+        sort (str): pstats sort key
+        limit (int): Number of functions to include
+
+    Returns:
+        str: The pstats report
+    """
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats(sort).print_stats(limit)
+    return report.getvalue()
+
+
+def profile_call(function: Callable, *args, **kwargs) -> Tuple[Any, str]:
+    """
+    Run one call under cProfile.
+
+    Args:
+        function (Callable): The function to call
+        *args: Positional arguments for the function
+        **kwargs: Keyword arguments for the function
+
+    Returns:
+        Tuple[Any, str]: The function's return value and the profile report
+
+    Note:
+        Works whether or not metrics are enabled. Profiling slows the call down
+        several times over, so use it for single requests, not continuously.
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(function, *args, **kwargs)
+    return result, profile_report(profiler)
@@ -0,0 +1,424 @@
+"""
+HTTP/JSON API server for the Task Manager application.
+
+This file exposes the user_management and task_management packages over a small
+asyncio-based HTTP/1.1 server built only on the standard library. All storage work
+runs in a thread pool, so slow file or database I/O never blocks the event loop and
+a single process can keep thousands of client connections open. Password hashing
+runs in a separate, smaller pool (TASK_MANAGER_KDF_WORKERS threads), so a burst of
+logins queues behind itself instead of starving the storage calls of other requests.
+
+Endpoints (all request and response bodies are JSON):
+    POST   /login                  {"username", "password"}  -> check credentials and
+                                   start a session: {"token", "expires_at", ...}
+    POST   /logout                 end the session of the Bearer token sent
+    POST   /signup                 {"username", "password"}  -> register a user
+    GET    /tasks[?status=<s>]     list the caller's tasks, optionally by status
+           [&limit=<n>&cursor=<c>]  ... one page at a time: {"tasks", "next_cursor"}
+    GET    /tasks?q=<query>        search the caller's task titles (all terms must match)
+           [&status=<s>]           ... optionally only tasks with one status
+    POST   /tasks                  {"title"}                 -> add a pending task
+    GET    /tasks/<id>             fetch one task
+    POST   /tasks/<id>/complete    mark a task as completed
+    DELETE /tasks/<id>             delete a task
+    GET    /metrics                operation metrics in Prometheus text format
+                                   (only when started with --metrics)
+
+Task endpoints accept either "Authorization: Bearer <token>" with a token from
+POST /login, which is checked in memory without touching users.txt or hashing the
+password, or HTTP Basic credentials, which are verified against the stored hash on
+every request. Sessions can survive a restart with --session-snapshot.
+
+When started with --profile, a request carrying an "X-Profile: 1" header has its
+storage work run under cProfile and the report is printed on the server console.
+
+Usage:
+    python server.py [--host 127.0.0.1] [--port 8000] [--workers 16] [--kdf-workers 4]
+                     [--session-snapshot sessions.json] [--metrics] [--profile]
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import argparse
+import asyncio
+import base64
+import binascii
+import contextvars
+import cProfile
+import json
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import metrics
+from storage.base import DEFAULT_PAGE_SIZE
+from user_management import authenticate, register_user
+from user_management.passwords import kdf_workers
+from user_management.sessions import SessionManager
+from task_management import (
+    OperationResult, create_task, find_tasks, get_task, list_task_page, list_tasks, mark_completed, remove_task
+)
+from task_management.operations import CONFLICT, INVALID, NOT_FOUND
+
+
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 64 * 1024
+
+# Largest page a client may request from GET /tasks
+MAX_PAGE_SIZE = 1000
+
+# Seconds a client may take to send a request before the connection is dropped
+REQUEST_TIMEOUT = 30.0
+
+# Profiler collecting the storage work of the current request, if it is being profiled
+_request_profiler: contextvars.ContextVar[Optional[cProfile.Profile]] = contextvars.ContextVar(
+    "request_profiler", default=None)
+
+
+class HTTPError(Exception):
+    """An error that maps directly onto an HTTP error response."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# HTTP status reported for each operation error code (anything else is a server error)
+_ERROR_STATUSES = {
+    INVALID: HTTPStatus.BAD_REQUEST,
+    NOT_FOUND: HTTPStatus.NOT_FOUND,
+    CONFLICT: HTTPStatus.CONFLICT,
+}
+
+
+def unwrap(result: OperationResult) -> Any:
+    """
+    Return the value of a successful operation result.
+
+    Raises:
+        HTTPError: Carrying the result's message, with the status for its error code
+    """
+    if not result.success:
+        raise HTTPError(_ERROR_STATUSES.get(result.error, HTTPStatus.INTERNAL_SERVER_ERROR), result.message)
+    return result.value
+
+
+class TaskAPI:
+    """
+    Request router mapping HTTP endpoints onto the task and user functions.
+
+    Attributes:
+        executor (ThreadPoolExecutor): Pool running all blocking storage calls
+        kdf_executor (ThreadPoolExecutor): Bounded pool running the calls that hash
+            passwords (login, signup and Basic authentication)
+        sessions (SessionManager): Live login sessions and their tokens
+        profile (bool): Whether clients may ask for a request to be profiled
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor, kdf_executor: ThreadPoolExecutor,
+                 sessions: SessionManager, profile: bool = False):
+        self.executor = executor
+        self.kdf_executor = kdf_executor
+        self.sessions = sessions
+        self.profile = profile
+
+    async def _run(self, function, *args, executor: Optional[ThreadPoolExecutor] = None):
+        """Run a blocking function in the storage thread pool, or in the given one."""
+        loop = asyncio.get_running_loop()
+        executor = executor or self.executor
+        profiler = _request_profiler.get()
+        if profiler is not None:
+            # The request's calls run one at a time, so they can share one profiler
+            return await loop.run_in_executor(executor, partial(profiler.runcall, function, *args))
+        return await loop.run_in_executor(executor, partial(function, *args))
+
+    async def _authenticate(self, headers: Dict[str, str]) -> str:
+        """Return the username authenticated by a Bearer or Basic Authorization header."""
+        scheme, _, encoded = headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer":
+            # Pure in-memory check, cheap enough to run on the event loop
+            username = self.sessions.validate(encoded.strip())
+            if username is None:
+                raise HTTPError(HTTPStatus.UNAUTHORIZED, "Invalid or expired session token")
+            return username
+        if scheme.lower() != "basic":
+            raise HTTPError(HTTPStatus.UNAUTHORIZED, "Bearer or Basic authentication required")
+        try:
+            username, _, password = base64.b64decode(encoded, validate=True).decode("utf-8").partition(":")
+        except (binascii.Error, UnicodeDecodeError):
+            raise HTTPError(HTTPStatus.UNAUTHORIZED, "Malformed Authorization header")
+        success, message, _ = await self._run(authenticate, username, password, executor=self.kdf_executor)
+        if not success:
+            raise HTTPError(HTTPStatus.UNAUTHORIZED, message)
+        return username
+
+    async def handle(self, method: str, target: str, headers: Dict[str, str],
+                     body: Dict[str, Any]) -> Tuple[HTTPStatus, Any]:
+        """
+        Dispatch a parsed request to its endpoint.
+
+        Returns:
+            Tuple[HTTPStatus, Any]: The response status and JSON-serializable payload
+
+        Raises:
+            HTTPError: For client errors such as bad credentials or unknown routes
+        """
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        query = parse_qs(url.query)
+
+        if parts == ["login"] and method == "POST":
+            success, message, username = await self._run(
+                authenticate, str(body.get("username", "")), str(body.get("password", "")),
+                executor=self.kdf_executor)
+            if not success:
+                return HTTPStatus.UNAUTHORIZED, {"success": False, "message": message, "username": None}
+            token, expires_at = self.sessions.issue(username)
+            return HTTPStatus.OK, {"success": True, "message": message, "username": username,
+                                   "token": token, "expires_at": expires_at}
+
+        if parts == ["logout"] and method == "POST":
+            scheme, _, token = headers.get("authorization", "").partition(" ")
+            if scheme.lower() != "bearer" or not self.sessions.revoke(token.strip()):
+                raise HTTPError(HTTPStatus.UNAUTHORIZED, "Invalid or expired session token")
+            return HTTPStatus.OK, {"success": True, "message": "Logged out"}
+
+        if parts == ["signup"] and method == "POST":
+            username = str(body.get("username", ""))
+            success, message = await self._run(
+                register_user, username, str(body.get("password", "")), executor=self.kdf_executor)
+            status = HTTPStatus.CREATED if success else HTTPStatus.BAD_REQUEST
+            return status, {"success": success, "message": message, "username": username if success else None}
+
+        if parts == ["metrics"] and method == "GET":
+            if not metrics.is_enabled():
+                raise HTTPError(HTTPStatus.NOT_FOUND, "Metrics are disabled")
+            return HTTPStatus.OK, metrics.render_prometheus()
+
+        if not parts or parts[0] != "tasks" or len(parts) > 3:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "Unknown endpoint")
+
+        username = await self._authenticate(headers)
+
+        if len(parts) == 1 and method == "GET":
+            status_filter = query.get("status", [None])[0]
+            if "q" in query:
+                tasks = unwrap(await self._run(
+                    find_tasks, username, query["q"][0], MAX_PAGE_SIZE, status_filter or None))
+                return HTTPStatus.OK, [task.to_dict() for task in tasks]
+            if "limit" in query or "cursor" in query:
+                limit = query.get("limit", [str(DEFAULT_PAGE_SIZE)])[0]
+                if not limit.isdigit() or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, f"limit must be between 1 and {MAX_PAGE_SIZE}")
+                tasks, cursor = unwrap(await self._run(
+                    list_task_page, username, status_filter or None, query.get("cursor", [None])[0], int(limit)))
+                return HTTPStatus.OK, {"tasks": [task.to_dict() for task in tasks], "next_cursor": cursor}
+            tasks = unwrap(await self._run(list_tasks, username, status_filter or None))
+            return HTTPStatus.OK, [task.to_dict() for task in tasks]
+
+        if len(parts) == 1 and method == "POST":
+            title = str(body.get("title", "")).strip()
+            if not title:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Task title cannot be empty")
+            task = unwrap(await self._run(create_task, username, title))
+            return HTTPStatus.CREATED, task.to_dict()
+
+        task_id = parts[1]
+
+        if len(parts) == 2 and method == "GET":
+            return HTTPStatus.OK, unwrap(await self._run(get_task, task_id, username)).to_dict()
+
+        if len(parts) == 2 and method == "DELETE":
+            result = await self._run(remove_task, task_id, username)
+            unwrap(result)
+            return HTTPStatus.OK, {"success": True, "message": result.message}
+
+        if len(parts) == 3 and parts[2] == "complete" and method == "POST":
+            return HTTPStatus.OK, unwrap(await self._run(mark_completed, task_id, username)).to_dict()
+
+        raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Method not allowed")
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+    """
+    Read one HTTP/1.1 request from a client connection.
+
+    Returns:
+        Optional[Tuple[str, str, str, Dict[str, str], bytes]]: (method, target, version,
+        headers, body), or None if the client closed the connection
+
+    Raises:
+        HTTPError: If the request is malformed or too large
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length < 0 or length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, version, headers, body
+
+
+def format_response(status: HTTPStatus, payload: Any, keep_alive: bool) -> bytes:
+    """Serialize a JSON (or plain-text, for str payloads) response, including CORS headers."""
+    if isinstance(payload, str):
+        body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        content_type = "application/json"
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        "Access-Control-Allow-Headers: Authorization, Content-Type, X-Profile\r\n"
+        "Access-Control-Allow-Methods: GET, POST, DELETE, OPTIONS\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def profile_request(api: TaskAPI, method: str, target: str, headers: Dict[str, str],
+                          body: Dict[str, Any]) -> Tuple[HTTPStatus, Any]:
+    """Handle a request with its storage work under cProfile and print the report."""
+    profiler = cProfile.Profile()
+    token = _request_profiler.set(profiler)
+    try:
+        return await api.handle(method, target, headers, body)
+    finally:
+        _request_profiler.reset(token)
+        print(f"Profile of {method} {urlsplit(target).path}:\n{metrics.profile_report(profiler)}")
+
+
+async def handle_connection(api: TaskAPI, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Serve requests on one client connection until it closes."""
+    try:
+        while True:
+            keep_alive = False
+            try:
+                request = await asyncio.wait_for(read_request(reader), REQUEST_TIMEOUT)
+                if request is None:
+                    break
+                method, target, version, headers, raw_body = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+
+                if method == "OPTIONS":
+                    status, payload = HTTPStatus.NO_CONTENT, None
+                else:
+                    try:
+                        body = json.loads(raw_body) if raw_body else {}
+                    except ValueError:
+                        raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body must be JSON")
+                    if not isinstance(body, dict):
+                        raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+                    if api.profile and headers.get("x-profile") == "1":
+                        status, payload = await profile_request(api, method, target, headers, body)
+                    else:
+                        status, payload = await api.handle(method, target, headers, body)
+            except HTTPError as e:
+                status, payload = e.status, {"success": False, "message": e.message}
+            except ValueError as e:
+                # Raised by storage for bad input such as an invalid or expired cursor
+                status, payload = HTTPStatus.BAD_REQUEST, {"success": False, "message": str(e)}
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                break
+            except Exception as e:
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"success": False, "message": str(e)}
+
+            writer.write(format_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8000, workers: int = 16,
+                kdf_worker_count: Optional[int] = None, session_snapshot: Optional[str] = None,
+                profile: bool = False) -> None:
+    """
+    Run the API server until cancelled.
+
+    Args:
+        host (str): Interface to listen on
+        port (int): TCP port to listen on
+        workers (int): Number of threads available for blocking storage calls
+        kdf_worker_count (Optional[int]): Number of threads available for password
+            hashing (defaults to TASK_MANAGER_KDF_WORKERS)
+        session_snapshot (Optional[str]): File sessions are restored from at startup
+            and saved to at shutdown
+        profile (bool): Honour "X-Profile: 1" request headers
+    """
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="task-api")
+    kdf_executor = ThreadPoolExecutor(max_workers=kdf_worker_count or kdf_workers(), thread_name_prefix="task-kdf")
+    sessions = SessionManager(snapshot_path=session_snapshot)
+    try:
+        # Stop cleanly (saving the sessions) when a process manager terminates the server
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass  # No signal handlers on Windows event loops
+    api = TaskAPI(executor, kdf_executor, sessions, profile)
+    server = await asyncio.start_server(partial(handle_connection, api), host, port, backlog=1024)
+    print(f"Task Manager API listening on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        executor.shutdown(wait=False)
+        kdf_executor.shutdown(wait=False)
+        try:
+            sessions.save()
+        except OSError as e:
+            print(f"Warning: Could not save sessions to {session_snapshot}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Task Manager over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="TCP port to listen on")
+    parser.add_argument("--workers", type=int, default=16, help="Threads for blocking storage calls")
+    parser.add_argument("--kdf-workers", type=int, default=None,
+                        help="Threads for password hashing (default: TASK_MANAGER_KDF_WORKERS or 4)")
+    parser.add_argument("--session-snapshot", default=None,
+                        help="Keep login sessions in this file across restarts")
+    parser.add_argument("--metrics", action="store_true", help="Record operation metrics and serve GET /metrics")
+    parser.add_argument("--profile", action="store_true", help="Profile requests sent with an X-Profile: 1 header")
+    args = parser.parse_args()
+
+    if args.metrics:
+        metrics.enable()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.kdf_workers, args.session_snapshot, args.profile))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("Goodbye!")
+
+
+if __name__ == "__main__":
+    main()
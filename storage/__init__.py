@@ -0,0 +1,125 @@
+"""
+Storage System - Core Module
+
+This module provides the pluggable storage layer used by the task_management and
+user_management packages. Every read and write of tasks or user credentials goes
+through the active StorageBackend, so storage engines can be swapped without
+touching the menus or the APIs built on top of them.
+
+The module is organized into the following components:
+- base: The StorageBackend interface
+- flat_file: The default engine, backed by tasks.txt and users.txt
+- sqlite_backend: An SQLite engine with indexed lookups and WAL mode
+- sharded: A flat-file engine splitting tasks into per-user hash shards
+- binary_file: A fixed-width binary tasks file with in-place status updates
+- user_file: The users.txt account store shared by the file-based engines
+- diagnostics: Routing of storage warnings (malformed lines, fallbacks) to a handler
+
+The active backend is chosen by the TASK_MANAGER_STORAGE environment variable:
+- "flat" (default): tasks.txt and users.txt in the working directory
+- "sqlite" or "sqlite:<path>": an SQLite database (default path: tasks.db)
+- "sharded" or "sharded:<dir>": hashed shard files in a data directory (default: tasks.d)
+- "binary" or "binary:<path>": a binary tasks file (default path: tasks.bin)
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import os
+from typing import Optional
+
+from .base import StorageBackend, UserExistsError
+from .diagnostics import collect_warnings, set_warning_handler
+
+
+# Environment variable selecting the storage engine
+STORAGE_ENV_VAR = "TASK_MANAGER_STORAGE"
+
+_backend: Optional[StorageBackend] = None
+
+
+def create_backend(spec: str) -> StorageBackend:
+    """
+    Create a storage backend from a specification string.
+
+    Args:
+        spec (str): "flat", "sqlite[:<path>]", "sharded[:<dir>]" or "binary[:<path>]"
+
+    Returns:
+        StorageBackend: A new backend instance
+
+    Raises:
+        ValueError: If the specification names an unknown engine
+    """
+    engine, _, location = spec.partition(":")
+    # Engines are imported lazily so that importing this package never pulls in
+    # task_management or user_management, which themselves import it
+    if engine == "flat":
+        from .flat_file import FlatFileBackend
+        return FlatFileBackend()
+    if engine == "sqlite":
+        from .sqlite_backend import SQLiteBackend
+        return SQLiteBackend(location or "tasks.db")
+    if engine == "sharded":
+        from .sharded import ShardedFileBackend
+        return ShardedFileBackend(location or "tasks.d")
+    if engine == "binary":
+        from .binary_file import BinaryFileBackend
+        return BinaryFileBackend(location or "tasks.bin")
+    raise ValueError(f"Unknown storage engine: {engine}")
+
+
+def get_backend() -> StorageBackend:
+    """
+    Return the active storage backend, creating it on first use.
+
+    Returns:
+        StorageBackend: The process-wide backend
+    """
+    global _backend
+    if _backend is None:
+        _backend = create_backend(os.environ.get(STORAGE_ENV_VAR, "flat"))
+    return _backend
+
+
+def set_backend(backend: StorageBackend) -> None:
+    """
+    Replace the active storage backend.
+
+    Args:
+        backend (StorageBackend): The backend every subsequent operation should use
+    """
+    global _backend
+    if _backend is not None and _backend is not backend:
+        _backend.close()
+    _backend = backend
+    # Cached query results came from the previous backend (imported here: the
+    # task_management package imports this one)
+    from task_management.query_cache import get_query_cache
+    get_query_cache().clear()
+
+
+def migrate(source: StorageBackend, target: StorageBackend) -> None:
+    """
+    Copy every task and user from one backend into another.
+
+    Args:
+        source (StorageBackend): Backend to read from
+        target (StorageBackend): Backend to write into (normally empty)
+    """
+    target.add_tasks(source.iter_tasks())
+    for username, password_hash in source.iter_users():
+        target.add_user(username, password_hash)
+
+
+__all__ = [
+    'StorageBackend',
+    'UserExistsError',
+    'create_backend',
+    'get_backend',
+    'set_backend',
+    'migrate',
+    'set_warning_handler',
+    'collect_warnings'
+]
@@ -0,0 +1,186 @@
+"""
+Storage System - Backend Interface Module
+
+This module defines the StorageBackend interface that every storage engine implements.
+The task_management and user_management packages only talk to storage through this
+interface, so the same menus and APIs run unchanged on the flat-file store or SQLite.
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from itertools import islice
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+
+# Number of tasks per page when a caller does not ask for a specific page size
+DEFAULT_PAGE_SIZE = 20
+
+
+class UserExistsError(ValueError):
+    """Raised by StorageBackend.add_user when the username is already registered."""
+
+
+class StorageBackend(ABC):
+    """
+    Abstract storage engine for tasks and user credentials.
+
+    Tasks are exchanged as task_management.task.Task records. Query methods return
+    tasks in insertion order. Mutating methods raise an exception (IOError,
+    sqlite3.Error, ...) on failure and leave reporting to the caller.
+    """
+
+    # ---- Task queries ----
+
+    @abstractmethod
+    def load_tasks(self, username: Optional[str] = None) -> List["Task"]:
+        """Return every task, or only the tasks belonging to username."""
+
+    @abstractmethod
+    def get_task(self, task_id: str, username: Optional[str] = None) -> Optional["Task"]:
+        """Return the task with the given ID (and owner, if provided), or None."""
+
+    @abstractmethod
+    def tasks_by_status(self, status: str, username: Optional[str] = None) -> List["Task"]:
+        """Return the tasks with a given status, optionally for one user only."""
+
+    @abstractmethod
+    def iter_tasks(self, username: Optional[str] = None, status: Optional[str] = None,
+                   task_id: Optional[str] = None, limit: Optional[int] = None) -> Iterator["Task"]:
+        """Lazily yield the tasks matching every given filter, stopping at limit."""
+
+    def page_tasks(self, username: Optional[str] = None, status: Optional[str] = None,
+                   cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List["Task"], Optional[str]]:
+        """
+        Return one page of the tasks matching the filters.
+
+        Args:
+            username (Optional[str]): Only list tasks belonging to this user
+            status (Optional[str]): Only list tasks with this status
+            cursor (Optional[str]): Opaque cursor returned with the previous page, or
+                None for the first page
+            limit (int): Maximum number of tasks on the page
+
+        Returns:
+            Tuple[List[Task], Optional[str]]: The page, and the cursor of the next page
+            (None once the listing is exhausted)
+
+        Raises:
+            ValueError: If the cursor is malformed or limit is below 1
+
+        Note:
+            The default implementation's cursor is a count of tasks already listed,
+            so it re-streams the earlier pages; engines override it with a cursor
+            they can seek to directly.
+        """
+        if limit < 1:
+            raise ValueError("Page size must be at least 1")
+        skip = 0
+        if cursor is not None:
+            if not cursor.isdigit():
+                raise ValueError(f"Invalid cursor: {cursor!r}")
+            skip = int(cursor)
+        tasks = list(islice(self.iter_tasks(username, status), skip, skip + limit))
+        return tasks, str(skip + limit) if len(tasks) == limit else None
+
+    def search_tasks(self, username: Optional[str], query: str, limit: Optional[int] = None) -> List["Task"]:
+        """
+        Return the tasks whose titles contain every keyword of a query.
+
+        Note:
+            The default implementation scans the user's tasks; see
+            task_management.search for the query syntax.
+        """
+        # Imported here: task_management imports this package
+        from task_management.search import matches_query, parse_query
+
+        terms = parse_query(query)
+        if not terms:
+            return []
+        return list(islice((task for task in self.iter_tasks(username) if matches_query(task.title, terms)), limit))
+
+    def count_by_status(self, username: Optional[str] = None) -> Dict[str, int]:
+        """
+        Count tasks per status, optionally for one user only.
+
+        Note:
+            The default implementation streams iter_tasks; engines override it
+            with something cheaper where they can.
+        """
+        counts: Dict[str, int] = {}
+        for task in self.iter_tasks(username):
+            counts[task.status] = counts.get(task.status, 0) + 1
+        return counts
+
+    def recent_tasks(self, username: Optional[str] = None, limit: int = 5) -> List["Task"]:
+        """
+        Return the most recently added tasks, oldest first, optionally for one user only.
+
+        Note:
+            The default implementation streams iter_tasks, keeping only the last
+            limit tasks; engines override it to read from the end instead.
+        """
+        if limit <= 0:
+            return []
+        return list(deque(self.iter_tasks(username), maxlen=limit))
+
+    def data_version(self, username: Optional[str] = None) -> Optional[Hashable]:
+        """
+        Describe the current version of the stored tasks, for validating cached queries.
+
+        Args:
+            username (Optional[str]): The user whose tasks are queried (None for all users)
+
+        Returns:
+            Optional[Hashable]: A value that changes whenever those tasks may have been
+            written, by this or any other process; None if the engine cannot tell,
+            which disables caching of its queries
+
+        Note:
+            Must be cheap (a few stat() calls): it is checked on every cached query.
+        """
+        return None
+
+    # ---- Task mutations ----
+
+    @abstractmethod
+    def add_tasks(self, tasks: Iterable["Task"]) -> None:
+        """Append validated tasks in a single write."""
+
+    @abstractmethod
+    def update_statuses(self, updates: Iterable[Tuple[str, str, str]]) -> None:
+        """Apply (task_id, username, new_status) updates in a single write."""
+
+    @abstractmethod
+    def delete_tasks(self, keys: Iterable[Tuple[str, str]]) -> None:
+        """Delete the tasks identified by (task_id, username) pairs in a single write."""
+
+    # ---- Users ----
+
+    @abstractmethod
+    def get_password_hash(self, username: str) -> Optional[str]:
+        """Return the stored password hash for a user, or None if the user is unknown."""
+
+    def user_exists(self, username: str) -> bool:
+        """Return True if a user with this username is registered."""
+        return self.get_password_hash(username) is not None
+
+    @abstractmethod
+    def add_user(self, username: str, password_hash: str) -> None:
+        """Store the credentials of a newly registered user (raises UserExistsError if taken)."""
+
+    @abstractmethod
+    def update_password_hash(self, username: str, password_hash: str) -> None:
+        """Replace the stored password hash of an existing user (raises KeyError if unknown)."""
+
+    @abstractmethod
+    def iter_users(self) -> Iterator[Tuple[str, str]]:
+        """Yield every (username, password_hash) pair."""
+
+    # ---- Lifecycle ----
+
+    def close(self) -> None:
+        """Release any files or connections held by the backend."""
@@ -0,0 +1,580 @@
+"""
+Storage System - Binary Task File Backend Module
+
+This module provides a storage engine that keeps tasks in a compact binary file of
+fixed-width records instead of pipe-delimited lines. Because every record has the same
+size and the status is a single byte at a known position, a status change or deletion
+is one pwrite() of one byte rather than a rewrite of the file, and scans unpack records
+with struct instead of splitting text.
+
+File format:
+    tasks.bin            24-byte header, then one 44-byte record per task
+        header:  magic (8s), version (uint16), record size (uint16), padding (4x),
+                 heap token (8s)
+        record:  task UUID (16s), status code (uint8), padding (3x),
+                 username offset (uint64), username length (uint32),
+                 title offset (uint64), title length (uint32)
+    tasks.bin.<token>.heap   UTF-8 usernames and titles the records point into
+
+Status codes are listed in STATUS_CODES; code 0 is a tombstone for deleted tasks.
+Only canonical UUID task IDs can be stored. Credentials stay in users.txt.
+
+Usage:
+    python -m storage.binary_file to-binary [--tasks tasks.txt] [--binary tasks.bin]
+    python -m storage.binary_file to-text [--binary tasks.bin] [--tasks tasks.txt]
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import argparse
+import mmap
+import os
+import secrets
+import struct
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from task_management.journal import journal_path_for
+from task_management.task import Task, pack_task_id
+
+from .base import DEFAULT_PAGE_SIZE, StorageBackend
+from .diagnostics import warn
+from .flat_file import FlatFileBackend
+from .locking import atomic_replace, file_lock
+from .user_file import UserFileStore
+
+
+# Status byte values; 0 marks a deleted record
+STATUS_CODES = {"pending": 1, "completed": 2, "in_progress": 3, "cancelled": 4}
+DELETED = 0
+_STATUS_NAMES = {code: status for status, code in STATUS_CODES.items()}
+
+_MAGIC = b"TMTASKS1"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHH4x8s")
+_RECORD = struct.Struct("<16sB3xQIQI")
+
+# Byte offset of the status code within a record
+_STATUS_OFFSET = 16
+
+
+def heap_path_for(binary_path: str, token: bytes) -> str:
+    """
+    Return the string heap path belonging to a binary tasks file.
+
+    Args:
+        binary_path (str): Path of the binary tasks file
+        token (bytes): Heap token recorded in the binary file's header
+
+    Returns:
+        str: The binary path with a '.<token>.heap' suffix
+
+    Note:
+        Each conversion writes a heap under a fresh token before the record file that
+        names it is swapped in, so records never point into the wrong heap.
+    """
+    return f"{binary_path}.{token.hex()}.heap"
+
+
+def _encode_record(task: Task, username_ref: Tuple[int, int], title_ref: Tuple[int, int]) -> bytes:
+    """Pack a task into a fixed-width record, given the heap (offset, length) of its strings."""
+    task_id = task.key
+    if not isinstance(task_id, bytes):
+        raise ValueError(f"Task ID {task.id!r} is not a UUID and cannot be stored in a binary task file")
+    if task.status not in STATUS_CODES:
+        raise ValueError(f"Status {task.status!r} cannot be stored in a binary task file")
+    return _RECORD.pack(task_id, STATUS_CODES[task.status], *username_ref, *title_ref)
+
+
+class _HeapWriter:
+    """Appends strings to a heap, storing each distinct username only once."""
+
+    def __init__(self, file, usernames: Dict[str, Tuple[int, int]]):
+        self.file = file
+        self.usernames = usernames
+        self.offset = file.tell()
+
+    def write(self, value: str) -> Tuple[int, int]:
+        data = value.encode("utf-8")
+        reference = (self.offset, len(data))
+        self.file.write(data)
+        self.offset += len(data)
+        return reference
+
+    def username(self, value: str) -> Tuple[int, int]:
+        reference = self.usernames.get(value)
+        if reference is None:
+            reference = self.usernames[value] = self.write(value)
+        return reference
+
+
+def _write_binary(tasks: Iterable[Task], binary_path: str) -> int:
+    """Write tasks to a fresh heap and record file. Returns the number of records written."""
+    token = secrets.token_bytes(8)
+    heap_path = heap_path_for(binary_path, token)
+    written = 0
+    try:
+        # The heap is swapped in (on leaving the inner block) before the record file naming it
+        with atomic_replace(binary_path, "wb") as records, atomic_replace(heap_path, "wb") as heap:
+            writer = _HeapWriter(heap, {})
+            records.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size, token))
+            for task in tasks:
+                username_ref = writer.username(task.username)
+                records.write(_encode_record(task, username_ref, writer.write(task.title)))
+                written += 1
+    except BaseException:
+        # The record file was not replaced, so nothing refers to the new heap
+        if os.path.exists(heap_path):
+            os.remove(heap_path)
+        raise
+    return written
+
+
+class BinaryFileBackend(StorageBackend):
+    """
+    Storage engine backed by a fixed-width binary tasks file.
+
+    New tasks are appended (strings to the heap first, then their records), and
+    status changes and deletions overwrite the status byte in place. Writers hold
+    an exclusive fcntl lock and readers a shared one, as with the flat-file engine.
+
+    Attributes:
+        path (str): Path of the binary tasks file
+        accounts (UserFileStore): Serves the users file
+    """
+
+    def __init__(self, path: str = "tasks.bin", users_path: str = "users.txt"):
+        self.path = path
+        self.accounts = UserFileStore(users_path)
+        self._lock = threading.Lock()
+        # Record number of the newest record for every task ID seen so far, for in-place updates
+        self._index: Dict[bytes, int] = {}
+        self._indexed = 0
+        self._token: Optional[bytes] = None
+        # Heap references of usernames written by this process, to avoid repeating them
+        self._usernames: Dict[str, Tuple[int, int]] = {}
+
+    # ---- File access ----
+
+    @staticmethod
+    def _read_header(file) -> Optional[bytes]:
+        """Validate the header of an open binary tasks file and return its heap token."""
+        header = os.pread(file.fileno(), _HEADER.size, 0)
+        if not header:
+            return None
+        if len(header) != _HEADER.size:
+            raise IOError("Truncated binary task file header")
+        magic, version, record_size, token = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+            raise IOError("Not a binary task file, or an unsupported version")
+        return token
+
+    @staticmethod
+    def _record_count(file) -> int:
+        """Number of complete records; a torn trailing record is ignored."""
+        return max(os.fstat(file.fileno()).st_size - _HEADER.size, 0) // _RECORD.size
+
+    def _map(self) -> Optional[Tuple[mmap.mmap, bytes, int]]:
+        """Map the record file and its heap under a shared lock; None if there is no file."""
+        with file_lock(self.path, exclusive=False):
+            try:
+                file = open(self.path, "rb")
+            except FileNotFoundError:
+                return None
+            with file:
+                token = self._read_header(file)
+                if token is None:
+                    return None
+                count = self._record_count(file)
+                with open(heap_path_for(self.path, token), "rb") as heap_file:
+                    heap_size = os.fstat(heap_file.fileno()).st_size
+                    heap = mmap.mmap(heap_file.fileno(), 0, access=mmap.ACCESS_READ) if heap_size else b""
+                return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ), heap, count
+
+    @contextmanager
+    def _snapshot(self) -> Iterator[Optional[Tuple[mmap.mmap, bytes, int]]]:
+        """
+        Map the record file and its heap as one consistent snapshot.
+
+        Yields:
+            Optional[Tuple[mmap.mmap, bytes, int]]: (records, heap, record count), or
+            None if there is no binary file yet
+
+        Note:
+            The mappings stay valid after the lock is released; later appends are
+            simply not part of the snapshot.
+        """
+        snapshot = self._map()
+        try:
+            yield snapshot
+        finally:
+            if snapshot is not None:
+                records, heap, _ = snapshot
+                records.close()
+                if isinstance(heap, mmap.mmap):
+                    heap.close()
+
+    def _refresh_index(self, file, token: bytes, count: int) -> None:
+        """Add records appended since the last call to the task ID index."""
+        if token != self._token:
+            self._index = {}
+            self._indexed = 0
+            self._usernames = {}
+            self._token = token
+        if self._indexed >= count:
+            return
+        start = _HEADER.size + self._indexed * _RECORD.size
+        data = os.pread(file.fileno(), (count - self._indexed) * _RECORD.size, start)
+        for number, (task_id, *_rest) in enumerate(_RECORD.iter_unpack(data), start=self._indexed):
+            # The newest record wins: an ID only repeats when a deleted task was saved again
+            self._index[task_id] = number
+        self._indexed = count
+
+    # ---- Task queries ----
+
+    def load_tasks(self, username: Optional[str] = None) -> List[Task]:
+        return list(self.iter_tasks(username))
+
+    def get_task(self, task_id: str, username: Optional[str] = None) -> Optional[Task]:
+        """Look the record up through the task ID index and read just that record."""
+        packed_id = pack_task_id(task_id)
+        if not isinstance(packed_id, bytes):
+            return None  # Not storable, so not stored
+        with file_lock(self.path, exclusive=False):
+            try:
+                file = open(self.path, "rb")
+            except FileNotFoundError:
+                return None
+            with file:
+                token = self._read_header(file)
+                if token is None:
+                    return None
+                with self._lock:
+                    self._refresh_index(file, token, self._record_count(file))
+                    number = self._index.get(packed_id)
+                if number is None:
+                    return None
+                _, code, user_offset, user_length, title_offset, title_length = _RECORD.unpack(
+                    os.pread(file.fileno(), _RECORD.size, _HEADER.size + number * _RECORD.size))
+                if code == DELETED:
+                    return None
+                with open(heap_path_for(self.path, token), "rb") as heap:
+                    owner = os.pread(heap.fileno(), user_length, user_offset).decode("utf-8")
+                    if username is not None and owner != username:
+                        return None
+                    title = os.pread(heap.fileno(), title_length, title_offset).decode("utf-8")
+        return Task(task_id, owner, title, _STATUS_NAMES[code])
+
+    def tasks_by_status(self, status: str, username: Optional[str] = None) -> List[Task]:
+        return list(self.iter_tasks(username, status))
+
+    @staticmethod
+    def _scan(records: mmap.mmap, heap: bytes, numbers: Iterable[int], username: Optional[str],
+              wanted_code: Optional[int], wanted_id: Optional[bytes] = None) -> Iterator[Tuple[int, Task]]:
+        """
+        Yield (record number, task) for the live records among numbers that match.
+
+        Note:
+            - Status and ID filters compare the raw record, so no heap access is needed
+            - Usernames are decoded once per distinct heap reference
+        """
+        names: Dict[Tuple[int, int], str] = {}
+        for number in numbers:
+            raw_id, code, user_offset, user_length, title_offset, title_length = \
+                _RECORD.unpack_from(records, _HEADER.size + number * _RECORD.size)
+            if code == DELETED or (wanted_code is not None and code != wanted_code):
+                continue
+            if wanted_id is not None and raw_id != wanted_id:
+                continue
+            owner = names.get((user_offset, user_length))
+            if owner is None:
+                owner = bytes(heap[user_offset:user_offset + user_length]).decode("utf-8")
+                names[(user_offset, user_length)] = owner
+            if username is not None and owner != username:
+                continue
+
+            title = bytes(heap[title_offset:title_offset + title_length]).decode("utf-8")
+            task = Task.__new__(Task)
+            object.__setattr__(task, "_id", raw_id)
+            object.__setattr__(task, "username", owner)
+            object.__setattr__(task, "title", title)
+            object.__setattr__(task, "status", _STATUS_NAMES[code])
+            yield number, task
+
+    def iter_tasks(self, username: Optional[str] = None, status: Optional[str] = None,
+                   task_id: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Task]:
+        """Scan the record file, decoding strings only for records that match."""
+        if limit is not None and limit <= 0:
+            return
+        wanted_code = STATUS_CODES.get(status, -1) if status is not None else None
+        wanted_id = pack_task_id(task_id) if task_id is not None else None
+        if wanted_code == -1 or (wanted_id is not None and not isinstance(wanted_id, bytes)):
+            return  # Not storable, so not stored
+
+        with self._snapshot() as snapshot:
+            if snapshot is None:
+                return
+            records, heap, count = snapshot
+            yielded = 0
+            for _, task in self._scan(records, heap, range(count), username, wanted_code, wanted_id):
+                yield task
+                yielded += 1
+                if wanted_id is not None or (limit is not None and yielded >= limit):
+                    return
+
+    def page_tasks(self, username: Optional[str] = None, status: Optional[str] = None,
+                   cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Task], Optional[str]]:
+        """
+        Return one page of tasks, resuming at a record number.
+
+        Note:
+            The cursor is "<heap token>:<record number>"; records never move, so the
+            next page starts at a computed offset. A conversion issues a new token,
+            which expires older cursors.
+        """
+        if limit < 1:
+            raise ValueError("Page size must be at least 1")
+        token, start = None, 0
+        if cursor is not None:
+            token_hex, _, number = cursor.partition(":")
+            if not number.isdigit():
+                raise ValueError(f"Invalid cursor: {cursor!r}")
+            token, start = token_hex, int(number)
+        wanted_code = STATUS_CODES.get(status, -1) if status is not None else None
+        if wanted_code == -1:
+            return [], None
+
+        tasks: List[Task] = []
+        with self._snapshot() as snapshot:
+            if snapshot is None:
+                return tasks, None
+            records, heap, count = snapshot
+            current_token = records[_HEADER.size - 8:_HEADER.size].hex()
+            if token is not None and token != current_token:
+                raise ValueError("Cursor expired: the binary task file was rewritten")
+            for number, task in self._scan(records, heap, range(start, count), username, wanted_code):
+                tasks.append(task)
+                if len(tasks) == limit:
+                    return tasks, f"{current_token}:{number + 1}"
+        return tasks, None
+
+    def count_by_status(self, username: Optional[str] = None) -> Dict[str, int]:
+        if username is not None:
+            return super().count_by_status(username)
+        with self._snapshot() as snapshot:
+            if snapshot is None:
+                return {}
+            records, _, count = snapshot
+            # Every status byte in one strided slice of the mapping
+            start = _HEADER.size + _STATUS_OFFSET
+            codes = Counter(records[start:start + count * _RECORD.size:_RECORD.size])
+        return {_STATUS_NAMES[code]: total for code, total in codes.items() if code != DELETED}
+
+    def recent_tasks(self, username: Optional[str] = None, limit: int = 5) -> List[Task]:
+        if limit <= 0:
+            return []
+        tasks: List[Task] = []
+        with self._snapshot() as snapshot:
+            if snapshot is None:
+                return []
+            records, heap, count = snapshot
+            # Walk the records backwards from the end of the file
+            for _, task in self._scan(records, heap, range(count - 1, -1, -1), username, None):
+                tasks.append(task)
+                if len(tasks) == limit:
+                    break
+        tasks.reverse()
+        return tasks
+
+    def data_version(self, username: Optional[str] = None) -> Optional[Hashable]:
+        # Appends grow the record file, in-place updates touch its mtime and
+        # compaction replaces it
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None, None, None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    # ---- Task mutations ----
+
+    def add_tasks(self, tasks: Iterable[Task]) -> None:
+        tasks = list(tasks)
+        if not tasks:
+            return
+        with file_lock(self.path), self._lock:
+            try:
+                file = open(self.path, "r+b")
+            except FileNotFoundError:
+                file = open(self.path, "w+b")
+            with file:
+                token = self._read_header(file)
+                if token is None:
+                    token = secrets.token_bytes(8)
+                    os.pwrite(file.fileno(), _HEADER.pack(_MAGIC, _VERSION, _RECORD.size, token), 0)
+                count = self._record_count(file)
+                self._refresh_index(file, token, count)
+
+                # Strings go to the heap first, so a crash never leaves a record
+                # pointing past the end of the heap
+                with open(heap_path_for(self.path, token), "ab") as heap:
+                    writer = _HeapWriter(heap, self._usernames)
+                    payload = b"".join(
+                        _encode_record(task, writer.username(task.username), writer.write(task.title))
+                        for task in tasks)
+                    heap.flush()
+                    os.fsync(heap.fileno())
+
+                # Drop any torn record left by a crashed writer before appending
+                end = _HEADER.size + count * _RECORD.size
+                file.truncate(end)
+                os.pwrite(file.fileno(), payload, end)
+                os.fsync(file.fileno())
+                self._refresh_index(file, token, count + len(tasks))
+
+    def _set_status_codes(self, changes: List[Tuple[str, str, int]]) -> None:
+        """Overwrite the status byte of each (task_id, username, code) in place."""
+        if not changes:
+            return
+        with file_lock(self.path), self._lock:
+            try:
+                file = open(self.path, "r+b")
+            except FileNotFoundError:
+                return
+            with file:
+                token = self._read_header(file)
+                if token is None:
+                    return
+                self._refresh_index(file, token, self._record_count(file))
+                fd = file.fileno()
+                with open(heap_path_for(self.path, token), "rb") as heap:
+                    for task_id, username, code in changes:
+                        number = self._index.get(pack_task_id(task_id))
+                        if number is None:
+                            continue
+                        offset = _HEADER.size + number * _RECORD.size
+                        _, current, user_offset, user_length, _, _ = _RECORD.unpack(os.pread(fd, _RECORD.size, offset))
+                        if current == DELETED:
+                            continue
+                        if os.pread(heap.fileno(), user_length, user_offset).decode("utf-8") != username:
+                            continue
+                        os.pwrite(fd, bytes((code,)), offset + _STATUS_OFFSET)
+                os.fsync(fd)
+
+    def update_statuses(self, updates: Iterable[Tuple[str, str, str]]) -> None:
+        changes = []
+        for task_id, username, new_status in updates:
+            if new_status not in STATUS_CODES:
+                raise ValueError(f"Status {new_status!r} cannot be stored in a binary task file")
+            changes.append((task_id, username, STATUS_CODES[new_status]))
+        self._set_status_codes(changes)
+
+    def delete_tasks(self, keys: Iterable[Tuple[str, str]]) -> None:
+        self._set_status_codes([(task_id, username, DELETED) for task_id, username in keys])
+
+    # ---- Users ----
+
+    def iter_users(self) -> Iterator[Tuple[str, str]]:
+        return self.accounts.iter_users()
+
+    def get_password_hash(self, username: str) -> Optional[str]:
+        return self.accounts.get_password_hash(username)
+
+    def user_exists(self, username: str) -> bool:
+        return self.accounts.user_exists(username)
+
+    def add_user(self, username: str, password_hash: str) -> None:
+        self.accounts.add_user(username, password_hash)
+
+    def update_password_hash(self, username: str, password_hash: str) -> None:
+        self.accounts.update_password_hash(username, password_hash)
+
+
+def text_to_binary(tasks_path: str = "tasks.txt", binary_path: str = "tasks.bin") -> int:
+    """
+    Convert a pipe-delimited tasks file into a binary tasks file.
+
+    Args:
+        tasks_path (str): Path of the text tasks file (default: tasks.txt)
+        binary_path (str): Path of the binary file to create or replace (default: tasks.bin)
+
+    Returns:
+        int: Number of tasks converted
+
+    Note:
+        - Pending journal records of the text file are applied
+        - Tasks with non-UUID IDs or unknown statuses cannot be represented and are
+          skipped with a warning
+        - Deleted records are not carried over, so this also compacts the file
+    """
+    def storable(tasks: Iterable[Task]) -> Iterator[Task]:
+        for task in tasks:
+            if not isinstance(task.key, bytes):
+                warn("Warning: Skipping task {task_id}: ID is not a UUID", task_id=task.id)
+            elif task.status not in STATUS_CODES:
+                warn("Warning: Skipping task {task_id}: unknown status {status!r}", task_id=task.id, status=task.status)
+            else:
+                yield task
+
+    with file_lock(binary_path):
+        old_token = None
+        try:
+            with open(binary_path, "rb") as file:
+                old_token = BinaryFileBackend._read_header(file)
+        except (FileNotFoundError, IOError):
+            pass
+        converted = _write_binary(storable(FlatFileBackend(tasks_path).iter_tasks()), binary_path)
+        if old_token is not None and os.path.exists(heap_path_for(binary_path, old_token)):
+            os.remove(heap_path_for(binary_path, old_token))
+    return converted
+
+
+def binary_to_text(binary_path: str = "tasks.bin", tasks_path: str = "tasks.txt") -> int:
+    """
+    Convert a binary tasks file back into the pipe-delimited text format.
+
+    Args:
+        binary_path (str): Path of the binary tasks file (default: tasks.bin)
+        tasks_path (str): Path of the text file to create or replace (default: tasks.txt)
+
+    Returns:
+        int: Number of tasks written (deleted records are dropped)
+
+    Note:
+        Any journal left next to the text file belongs to its old contents and is removed.
+    """
+    converted = 0
+    with file_lock(tasks_path):
+        with atomic_replace(tasks_path) as target:
+            for task in BinaryFileBackend(binary_path).iter_tasks():
+                target.write(task.to_line())
+                converted += 1
+        journal_path = journal_path_for(tasks_path)
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+    return converted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert between the text and binary task file formats.")
+    parser.add_argument("command", choices=["to-binary", "to-text"], help="Direction of the conversion")
+    parser.add_argument("--tasks", default="tasks.txt", help="Path of the text tasks file")
+    parser.add_argument("--binary", default="tasks.bin", help="Path of the binary tasks file")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "to-binary":
+            converted = text_to_binary(args.tasks, args.binary)
+            print(f"Converted {converted} tasks from {args.tasks} into {args.binary}")
+        else:
+            converted = binary_to_text(args.binary, args.tasks)
+            print(f"Converted {converted} tasks from {args.binary} into {args.tasks}")
+    except IOError as e:
+        print(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Storage System - Diagnostics Module
+
+This module routes the warnings raised by library code (malformed lines, missing files
+and fallbacks while reading and writing data files, failed journal compactions and
+password-hash upgrades, invalid settings, unreadable session snapshots) to a
+replaceable handler instead of printing them directly. The interactive CLI keeps the
+default handler, which prints; batch jobs and servers can collect the warnings,
+forward them elsewhere, or switch them off.
+
+Warnings are passed as a template plus values and are only formatted when a handler
+is installed, so silenced warnings cost a single check each.
+
+Setting TASK_MANAGER_STORAGE_WARNINGS=0 silences the warnings from process start.
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional
+
+
+STORAGE_WARNINGS_ENV_VAR = "TASK_MANAGER_STORAGE_WARNINGS"
+
+# Receives each formatted warning message
+WarningHandler = Callable[[str], None]
+
+_handler: Optional[WarningHandler] = None if os.environ.get(STORAGE_WARNINGS_ENV_VAR, "") == "0" else print
+_handler_lock = threading.Lock()
+
+
+def warn(template: str, **values: Any) -> None:
+    """
+    Report a warning to the installed handler.
+
+    Args:
+        template (str): The message, with str.format placeholders if values are given
+        **values: Values for the placeholders (never treated as templates themselves)
+    """
+    handler = _handler
+    if handler is None:
+        return
+    handler(template.format(**values) if values else template)
+
+
+def set_warning_handler(handler: Optional[WarningHandler]) -> Optional[WarningHandler]:
+    """
+    Install the handler that receives storage warnings.
+
+    Args:
+        handler (Optional[WarningHandler]): Called with each message; None silences them
+
+    Returns:
+        Optional[WarningHandler]: The previously installed handler
+    """
+    global _handler
+    with _handler_lock:
+        previous, _handler = _handler, handler
+    return previous
+
+
+@contextmanager
+def collect_warnings() -> Iterator[List[str]]:
+    """
+    Collect the storage warnings raised inside a with-block instead of printing them.
+
+    Yields:
+        List[str]: The messages, appended to as they are raised
+
+    Note:
+        The handler is process-wide, so warnings raised by other threads during the
+        block are collected too.
+    """
+    messages: List[str] = []
+    previous = set_warning_handler(messages.append)
+    try:
+        yield messages
+    finally:
+        set_warning_handler(previous)
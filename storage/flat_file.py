@@ -0,0 +1,269 @@
+"""
+Storage System - Flat File Backend Module
+
+This module provides the default storage engine, which keeps tasks in the
+pipe-delimited tasks.txt file (plus its journal) and credentials in users.txt.
+
+File formats:
+    tasks.txt: task_id|username|task_title|task_status (one task per line)
+    users.txt: username:hashed_password (one user per line)
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import os
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+import metrics
+from task_management.counters import StatusCounters, journal_deltas, tasks_state
+from task_management.journal import (append_records, fold_journal, journal_overlay, journal_path_for, maybe_compact,
+                                     pending_deletions, read_journal)
+from task_management.search import SearchIndex
+from task_management.task import Task
+from task_management.task_store import TaskStore, split_task_line
+
+from .base import DEFAULT_PAGE_SIZE, StorageBackend
+from .locking import file_lock
+from .user_file import UserFileStore
+
+
+class FlatFileBackend(StorageBackend):
+    """
+    Storage engine backed by tasks.txt and users.txt.
+
+    Queries are served from an indexed TaskStore, status changes and deletions go
+    to the append-only task journal, new tasks are appended and user accounts are
+    kept by a UserFileStore. Writers hold an exclusive fcntl lock and readers a shared
+    one, so several processes can safely share the same files.
+
+    Attributes:
+        tasks_path (str): Path of the tasks file
+        users_path (str): Path of the users file
+        store (TaskStore): Indexed in-memory view of the tasks file
+        accounts (UserFileStore): Serves the users file; may be shared with other backends
+        counters (StatusCounters): Per-user status counts, kept next to the tasks file
+        search_index (SearchIndex): Inverted index over task titles, built on first search
+    """
+
+    def __init__(self, tasks_path: str = "tasks.txt", users_path: str = "users.txt",
+                 accounts: Optional[UserFileStore] = None):
+        self.tasks_path = tasks_path
+        self.users_path = users_path if accounts is None else accounts.users_path
+        self.store = TaskStore(tasks_path)
+        self.accounts = accounts if accounts is not None else UserFileStore(users_path)
+        self.counters = StatusCounters(tasks_path)
+        self.search_index = SearchIndex(tasks_path)
+
+    # ---- Task queries ----
+
+    def load_tasks(self, username: Optional[str] = None) -> List[Task]:
+        if username is None:
+            return self.store.all()
+        return self.store.for_user(username)
+
+    def get_task(self, task_id: str, username: Optional[str] = None) -> Optional[Task]:
+        return self.store.by_id(task_id, username)
+
+    def tasks_by_status(self, status: str, username: Optional[str] = None) -> List[Task]:
+        return self.store.by_status(status, username)
+
+    def iter_tasks(self, username: Optional[str] = None, status: Optional[str] = None,
+                   task_id: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Task]:
+        """
+        Stream tasks straight from the file, bypassing the in-memory store.
+
+        Note:
+            - Filters are checked on the raw split fields before any record is built
+            - Pending journal records are applied, so results match load_tasks
+            - Stops reading as soon as the ID is found or the limit is reached
+        """
+        if limit is not None and limit <= 0:
+            return
+
+        # Open the base file and read the journal as one consistent snapshot; the
+        # open handle keeps reading the same file even if compaction replaces it.
+        # The journal is bounded by compaction, so its net effect fits in memory.
+        with file_lock(self.tasks_path, exclusive=False):
+            records, _ = read_journal(journal_path_for(self.tasks_path))
+            try:
+                file = open(self.tasks_path, "r", encoding="utf-8")
+            except FileNotFoundError:
+                return
+        overlay = journal_overlay(records)
+        yielded = 0
+
+        with file:
+            for line_number, line in enumerate(file, start=1):
+                fields = split_task_line(line, line_number)
+                if fields is None:
+                    continue
+                line_id, line_username, line_title, line_status = fields
+
+                if task_id is not None and line_id != task_id:
+                    continue
+                if username is not None and line_username != username:
+                    continue
+                if overlay:
+                    key = (line_id, line_username)
+                    if key in overlay:
+                        if overlay[key] is None:
+                            continue  # Deleted in the journal
+                        line_status = overlay[key]
+                if status is not None and line_status != status:
+                    continue
+
+                yield Task(line_id, line_username, line_title, line_status)
+
+                yielded += 1
+                if task_id is not None or (limit is not None and yielded >= limit):
+                    return
+
+    def page_tasks(self, username: Optional[str] = None, status: Optional[str] = None,
+                   cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Task], Optional[str]]:
+        """
+        Return one page of tasks, resuming at a byte offset in the tasks file.
+
+        Note:
+            - The cursor is "<inode>:<byte offset>:<line number>:<last task ID>", so
+              the next page starts with a seek instead of re-reading earlier pages
+            - If compaction replaced the file since the cursor was issued, the new
+              file is scanned for the last task ID once and listing resumes after it;
+              if that task was deleted in the meantime, the cursor has expired
+        """
+        if limit < 1:
+            raise ValueError("Page size must be at least 1")
+        inode = offset = line_number = 0
+        last_id = None
+        if cursor is not None:
+            parts = cursor.split(":", 3)
+            if len(parts) != 4 or not all(part.isdigit() for part in parts[:3]):
+                raise ValueError(f"Invalid cursor: {cursor!r}")
+            inode, offset, line_number = (int(part) for part in parts[:3])
+            last_id = parts[3]
+
+        with file_lock(self.tasks_path, exclusive=False):
+            records, _ = read_journal(journal_path_for(self.tasks_path))
+            try:
+                file = open(self.tasks_path, "rb")
+            except FileNotFoundError:
+                return [], None
+        overlay = journal_overlay(records)
+
+        tasks: List[Task] = []
+        with file:
+            current_inode = os.fstat(file.fileno()).st_ino
+            seeking = last_id is not None and current_inode != inode
+            if seeking:
+                # The file was rewritten: its offsets are meaningless, so find our place by ID
+                offset = line_number = 0
+            file.seek(offset)
+
+            for raw_line in file:
+                offset += len(raw_line)
+                line_number += 1
+                line = raw_line.decode("utf-8")
+                if seeking:
+                    seeking = line.split("|", 1)[0] != last_id
+                    continue
+                fields = split_task_line(line, line_number)
+                if fields is None:
+                    continue
+                line_id, line_username, line_title, line_status = fields
+
+                if username is not None and line_username != username:
+                    continue
+                if overlay:
+                    key = (line_id, line_username)
+                    if key in overlay:
+                        if overlay[key] is None:
+                            continue  # Deleted in the journal
+                        line_status = overlay[key]
+                if status is not None and line_status != status:
+                    continue
+
+                tasks.append(Task(line_id, line_username, line_title, line_status))
+                if len(tasks) == limit:
+                    return tasks, f"{current_inode}:{offset}:{line_number}:{line_id}"
+        if seeking:
+            raise ValueError("Cursor expired: its last task was deleted when the tasks file was compacted")
+        return tasks, None
+
+    def search_tasks(self, username: Optional[str], query: str, limit: Optional[int] = None) -> List[Task]:
+        tasks = []
+        for task_id, owner in self.search_index.search(username, query, limit):
+            task = self.store.by_id(task_id, owner)
+            if task is not None:  # Deleted between the two lookups
+                tasks.append(task)
+        return tasks
+
+    def count_by_status(self, username: Optional[str] = None) -> Dict[str, int]:
+        return self.counters.get(username)
+
+    def recent_tasks(self, username: Optional[str] = None, limit: int = 5) -> List[Task]:
+        return self.store.recent(username, limit)
+
+    def data_version(self, username: Optional[str] = None) -> Optional[Hashable]:
+        # Any append, journal record or rewrite changes the tasks file or journal stat
+        return tasks_state(self.tasks_path)
+
+    # ---- Task mutations ----
+
+    def add_tasks(self, tasks: Iterable[Task]) -> None:
+        tasks = list(tasks)
+        if not tasks:
+            return
+        deltas: Dict[Tuple[str, str], int] = {}
+        for task in tasks:
+            deltas[(task.username, task.status)] = deltas.get((task.username, task.status), 0) + 1
+        keys = [(task.id, task.username) for task in tasks]
+        with file_lock(self.tasks_path):
+            # Journal records apply to every line with their key, so a deleted task
+            # saved again would stay hidden behind its tombstone until compaction
+            if pending_deletions(self.tasks_path, keys) and not fold_journal(self.tasks_path):
+                raise IOError("Could not compact the task journal before saving a deleted task again")
+            before = self.counters.state()
+            payload = "".join(task.to_line() for task in tasks)
+            with open(self.tasks_path, "a", encoding="utf-8") as file:
+                file.write(payload)
+            if metrics.is_enabled():
+                metrics.count("tasks_file.append", "bytes_written", len(payload.encode("utf-8")))
+            self.counters.apply(deltas, before)
+
+    def update_statuses(self, updates: Iterable[Tuple[str, str, str]]) -> None:
+        self._journal([("S", task_id, username, new_status) for task_id, username, new_status in updates])
+
+    def delete_tasks(self, keys: Iterable[Tuple[str, str]]) -> None:
+        self._journal([("D", task_id, username, None) for task_id, username in keys])
+
+    def _journal(self, records: List[Tuple[str, str, str, Optional[str]]]) -> None:
+        """Append journal records, adjust the counters and compact the journal if it has grown too large."""
+        if not records:
+            return
+        # The counters need each task's status before the change; if another writer
+        # gets in before the lock is taken, apply() notices and leaves them stale
+        view, statuses = self.store.statuses((task_id, username) for _, task_id, username, _ in records)
+        with file_lock(self.tasks_path):
+            before = self.counters.state()
+            journal_size = append_records(self.tasks_path, records)
+            self.counters.apply(journal_deltas(records, statuses), before, view)
+        # Compaction takes the lock itself
+        maybe_compact(self.tasks_path, journal_size)
+
+    # ---- Users ----
+
+    def iter_users(self) -> Iterator[Tuple[str, str]]:
+        return self.accounts.iter_users()
+
+    def get_password_hash(self, username: str) -> Optional[str]:
+        return self.accounts.get_password_hash(username)
+
+    def user_exists(self, username: str) -> bool:
+        return self.accounts.user_exists(username)
+
+    def add_user(self, username: str, password_hash: str) -> None:
+        self.accounts.add_user(username, password_hash)
+
+    def update_password_hash(self, username: str, password_hash: str) -> None:
+        self.accounts.update_password_hash(username, password_hash)
@@ -0,0 +1,121 @@
+"""
+Storage System - Locking Module
+
+This module provides the concurrency primitives used by the file-based storage engines:
+advisory fcntl locks (shared for readers, exclusive for writers) held on a '.lock'
+sidecar next to each data file, and an atomic write-to-temp-then-os.replace helper for
+rewrites. Together they let many worker processes share one data directory without
+lost updates or interleaved partial lines.
+
+On platforms without fcntl the locks are no-ops and only the atomic replace applies.
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+def lock_path_for(path: str) -> str:
+    """
+    Return the lock file path guarding a data file.
+
+    Args:
+        path (str): Path of the data file
+
+    Returns:
+        str: The data file path with a '.lock' suffix
+
+    Note:
+        A separate lock file is used because rewrites replace the data file itself,
+        which would silently drop a lock held on the old inode.
+    """
+    return path + ".lock"
+
+
+@contextmanager
+def file_lock(path: str, exclusive: bool = True) -> Iterator[None]:
+    """
+    Hold an advisory lock on a data file for the duration of a with-block.
+
+    Args:
+        path (str): Path of the data file to lock
+        exclusive (bool): True for a writer (exclusive) lock, False for a reader (shared) lock
+
+    Note:
+        Locks are not re-entrant: a thread must not acquire a lock on a file it
+        already holds one on.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    fd = os.open(lock_path_for(path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+def _fsync_directory(directory: str) -> None:
+    """Flush a directory entry change (such as a rename) to disk where supported."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_replace(path: str, mode: str = "w") -> Iterator[IO]:
+    """
+    Write a new version of a file and atomically swap it into place.
+
+    The with-block writes to a temporary file in the same directory. On success the
+    temporary file is fsync'd and renamed over the target with os.replace; on error
+    it is removed and the original file is left untouched.
+
+    Args:
+        path (str): Path of the file to replace
+        mode (str): "w" for text (UTF-8) or "wb" for binary output
+
+    Yields:
+        IO: The temporary file to write the new contents to
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    encoding = None if "b" in mode else "utf-8"
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as file:
+            # Keep the permissions of the file being replaced
+            try:
+                os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+            except FileNotFoundError:
+                os.chmod(temp_path, 0o644)
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+        _fsync_directory(directory)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
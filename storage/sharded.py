@@ -0,0 +1,342 @@
+"""
+Storage System - Sharded Flat File Backend Module
+
+This module provides a storage engine that splits tasks across many small flat files
+instead of one global tasks.txt. Each username is hashed to one of N shard files under
+a data directory, so reading, journaling and compacting one user's tasks only touches
+that user's shard, and their cost scales with the shard rather than the whole population.
+
+Directory layout:
+    <data_dir>/layout.json         {"version": 1, "shard_count": N}
+    <data_dir>/shard-0000.txt      task_id|username|task_title|task_status (as tasks.txt)
+    <data_dir>/shard-0000.txt.journal, .lock
+
+Every shard is an ordinary tasks file, served by its own FlatFileBackend with its own
+journal and lock. Credentials stay in users.txt.
+
+Usage:
+    python -m storage.sharded migrate [--tasks tasks.txt] [--data-dir tasks.d] [--shards 256]
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from itertools import islice
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from task_management.task import Task
+
+from .base import DEFAULT_PAGE_SIZE, StorageBackend
+from .flat_file import FlatFileBackend
+from .locking import atomic_replace, file_lock
+from .user_file import UserFileStore
+
+
+# Shard count used when a new data directory is created
+DEFAULT_SHARD_COUNT = 256
+
+LAYOUT_FILE = "layout.json"
+_LAYOUT_VERSION = 1
+
+# Tasks buffered per shard write while migrating
+_MIGRATE_BATCH = 10000
+
+
+def shard_for(username: str, shard_count: int) -> int:
+    """
+    Return the shard a username's tasks live in.
+
+    Args:
+        username (str): The task owner
+        shard_count (int): Number of shards in the data directory
+
+    Returns:
+        int: Shard number in [0, shard_count)
+
+    Note:
+        A fixed hash is used (not the built-in hash()), so every process maps a
+        username to the same shard.
+    """
+    digest = hashlib.blake2b(username.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % shard_count
+
+
+def load_layout(data_dir: str, shard_count: Optional[int] = None) -> int:
+    """
+    Read the shard count of a data directory, creating the directory if needed.
+
+    Args:
+        data_dir (str): Path of the sharded data directory
+        shard_count (Optional[int]): Shard count for a new directory (default:
+            DEFAULT_SHARD_COUNT); must match the recorded count for an existing one
+
+    Returns:
+        int: The shard count recorded in the directory's layout file
+
+    Raises:
+        ValueError: If the layout is invalid or disagrees with shard_count
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    layout_path = os.path.join(data_dir, LAYOUT_FILE)
+    with file_lock(layout_path):
+        try:
+            with open(layout_path, "r", encoding="utf-8") as file:
+                layout = json.load(file)
+        except FileNotFoundError:
+            layout = {"version": _LAYOUT_VERSION, "shard_count": shard_count or DEFAULT_SHARD_COUNT}
+            if layout["shard_count"] < 1:
+                raise ValueError("Shard count must be at least 1")
+            with atomic_replace(layout_path) as file:
+                json.dump(layout, file)
+                file.write("\n")
+
+    recorded = layout.get("shard_count")
+    if layout.get("version") != _LAYOUT_VERSION or not isinstance(recorded, int) or recorded < 1:
+        raise ValueError(f"Invalid shard layout in {layout_path}")
+    if shard_count is not None and shard_count != recorded:
+        raise ValueError(f"{data_dir} has {recorded} shards, not {shard_count}")
+    return recorded
+
+
+class ShardedFileBackend(StorageBackend):
+    """
+    Storage engine keeping each user's tasks in a hashed shard file.
+
+    Queries for one user are answered from that user's shard alone; unfiltered
+    queries visit every shard in turn, so they return tasks grouped by shard
+    (insertion order is kept within each user).
+
+    Attributes:
+        data_dir (str): Directory holding the shard files
+        shard_count (int): Number of shards
+        accounts (UserFileStore): Serves the users file, shared by every shard
+    """
+
+    def __init__(self, data_dir: str = "tasks.d", users_path: str = "users.txt",
+                 shard_count: Optional[int] = None):
+        self.data_dir = data_dir
+        self.shard_count = load_layout(data_dir, shard_count)
+        self.accounts = UserFileStore(users_path)
+        self._shards: Dict[int, FlatFileBackend] = {}
+        self._lock = threading.Lock()
+
+    def shard_path(self, shard: int) -> str:
+        """Return the path of a shard file."""
+        return os.path.join(self.data_dir, f"shard-{shard:04d}.txt")
+
+    def _shard(self, shard: int) -> FlatFileBackend:
+        """Return the backend serving a shard, creating it on first use."""
+        with self._lock:
+            backend = self._shards.get(shard)
+            if backend is None:
+                backend = FlatFileBackend(self.shard_path(shard), accounts=self.accounts)
+                self._shards[shard] = backend
+            return backend
+
+    def _for_user(self, username: str) -> FlatFileBackend:
+        return self._shard(shard_for(username, self.shard_count))
+
+    def _targets(self, username: Optional[str]) -> Iterator[FlatFileBackend]:
+        """Yield the shards that can hold tasks for username (all shards if None)."""
+        if username is not None:
+            yield self._for_user(username)
+            return
+        for shard in range(self.shard_count):
+            if os.path.exists(self.shard_path(shard)):
+                yield self._shard(shard)
+
+    # ---- Task queries ----
+
+    def load_tasks(self, username: Optional[str] = None) -> List[Task]:
+        tasks: List[Task] = []
+        for backend in self._targets(username):
+            tasks.extend(backend.load_tasks(username))
+        return tasks
+
+    def get_task(self, task_id: str, username: Optional[str] = None) -> Optional[Task]:
+        for backend in self._targets(username):
+            task = backend.get_task(task_id, username)
+            if task is not None:
+                return task
+        return None
+
+    def tasks_by_status(self, status: str, username: Optional[str] = None) -> List[Task]:
+        tasks: List[Task] = []
+        for backend in self._targets(username):
+            tasks.extend(backend.tasks_by_status(status, username))
+        return tasks
+
+    def iter_tasks(self, username: Optional[str] = None, status: Optional[str] = None,
+                   task_id: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Task]:
+        if limit is not None and limit <= 0:
+            return
+        yielded = 0
+        for backend in self._targets(username):
+            remaining = None if limit is None else limit - yielded
+            for task in backend.iter_tasks(username, status, task_id, remaining):
+                yield task
+                yielded += 1
+                if task_id is not None:
+                    return
+            if limit is not None and yielded >= limit:
+                return
+
+    def page_tasks(self, username: Optional[str] = None, status: Optional[str] = None,
+                   cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Task], Optional[str]]:
+        """
+        Return one page of tasks; the cursor is "<shard>/<cursor within the shard>".
+
+        Note:
+            Pages of unfiltered listings may span shards; each shard resumes from
+            its own byte-offset cursor.
+        """
+        if limit < 1:
+            raise ValueError("Page size must be at least 1")
+        first, inner = 0, None
+        if cursor is not None:
+            shard_text, _, inner = cursor.partition("/")
+            if not shard_text.isdigit() or not inner:
+                raise ValueError(f"Invalid cursor: {cursor!r}")
+            first = int(shard_text)
+
+        shards = [shard_for(username, self.shard_count)] if username is not None else range(first, self.shard_count)
+        tasks: List[Task] = []
+        for shard in shards:
+            if username is None and not os.path.exists(self.shard_path(shard)):
+                inner = None
+                continue
+            page, inner = self._shard(shard).page_tasks(username, status, inner, limit - len(tasks))
+            tasks.extend(page)
+            if inner is not None:
+                return tasks, f"{shard}/{inner}"
+        return tasks, None
+
+    def search_tasks(self, username: Optional[str], query: str, limit: Optional[int] = None) -> List[Task]:
+        tasks: List[Task] = []
+        for backend in self._targets(username):
+            tasks.extend(backend.search_tasks(username, query, None if limit is None else limit - len(tasks)))
+            if limit is not None and len(tasks) >= limit:
+                break
+        return tasks
+
+    def count_by_status(self, username: Optional[str] = None) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for backend in self._targets(username):
+            for status, count in backend.count_by_status(username).items():
+                counts[status] = counts.get(status, 0) + count
+        return counts
+
+    def recent_tasks(self, username: Optional[str] = None, limit: int = 5) -> List[Task]:
+        # Unfiltered listings visit the shards in turn, so the newest tasks in that
+        # order come from the last non-empty shards
+        tasks: List[Task] = []
+        for backend in reversed(list(self._targets(username))):
+            if len(tasks) >= limit:
+                break
+            tasks[:0] = backend.recent_tasks(username, limit - len(tasks))
+        return tasks
+
+    def data_version(self, username: Optional[str] = None) -> Optional[Hashable]:
+        return tuple(backend.data_version(username) for backend in self._targets(username))
+
+    # ---- Task mutations ----
+
+    def _group(self, items: Iterable, owner: Callable[[Any], str]) -> Dict[int, list]:
+        """Split items into per-shard lists by the username owner(item) returns."""
+        groups: Dict[int, list] = {}
+        for item in items:
+            groups.setdefault(shard_for(owner(item), self.shard_count), []).append(item)
+        return groups
+
+    def add_tasks(self, tasks: Iterable[Task]) -> None:
+        for shard, group in self._group(tasks, lambda task: task.username).items():
+            self._shard(shard).add_tasks(group)
+
+    def update_statuses(self, updates: Iterable[Tuple[str, str, str]]) -> None:
+        for shard, group in self._group(updates, lambda update: update[1]).items():
+            self._shard(shard).update_statuses(group)
+
+    def delete_tasks(self, keys: Iterable[Tuple[str, str]]) -> None:
+        for shard, group in self._group(keys, lambda key: key[1]).items():
+            self._shard(shard).delete_tasks(group)
+
+    # ---- Users ----
+
+    def iter_users(self) -> Iterator[Tuple[str, str]]:
+        return self.accounts.iter_users()
+
+    def get_password_hash(self, username: str) -> Optional[str]:
+        return self.accounts.get_password_hash(username)
+
+    def user_exists(self, username: str) -> bool:
+        return self.accounts.user_exists(username)
+
+    def add_user(self, username: str, password_hash: str) -> None:
+        self.accounts.add_user(username, password_hash)
+
+    def update_password_hash(self, username: str, password_hash: str) -> None:
+        self.accounts.update_password_hash(username, password_hash)
+
+
+def migrate_flat_tasks(tasks_path: str = "tasks.txt", data_dir: str = "tasks.d",
+                       shard_count: Optional[int] = None) -> int:
+    """
+    Copy the tasks of a flat tasks file into a sharded data directory.
+
+    Args:
+        tasks_path (str): Path of the flat tasks file (default: tasks.txt)
+        data_dir (str): Sharded data directory to write into (default: tasks.d)
+        shard_count (Optional[int]): Shard count for a new data directory
+
+    Returns:
+        int: Number of tasks copied
+
+    Raises:
+        ValueError: If the data directory already holds tasks
+
+    Note:
+        - Pending journal records of the flat file are applied while copying
+        - Users are not copied: both layouts share the same users file
+        - The flat file is left in place, so switching back is just a config change
+    """
+    source = FlatFileBackend(tasks_path)
+    target = ShardedFileBackend(data_dir, shard_count=shard_count)
+    if next(target.iter_tasks(limit=1), None) is not None:
+        raise ValueError(f"{data_dir} already contains tasks")
+
+    tasks = source.iter_tasks()
+    copied = 0
+    while True:
+        batch = list(islice(tasks, _MIGRATE_BATCH))
+        if not batch:
+            return copied
+        target.add_tasks(batch)
+        copied += len(batch)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the sharded task storage layout.")
+    parser.add_argument("command", choices=["migrate"], help="Action to perform")
+    parser.add_argument("--tasks", default="tasks.txt", help="Path of the flat tasks file")
+    parser.add_argument("--data-dir", default="tasks.d", help="Sharded data directory")
+    parser.add_argument("--shards", type=int, default=None,
+                        help=f"Shard count for a new data directory (default: {DEFAULT_SHARD_COUNT})")
+    args = parser.parse_args()
+
+    try:
+        copied = migrate_flat_tasks(args.tasks, args.data_dir, args.shards)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    print(f"Migrated {copied} tasks from {args.tasks} into {args.data_dir}")
+    print(f"Set TASK_MANAGER_STORAGE=sharded:{args.data_dir} to use the sharded layout.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Storage System - SQLite Backend Module
+
+This module provides a storage engine backed by a single SQLite database. Tasks are
+indexed by ID and by (username, status), the database runs in WAL mode so readers
+never block the writer, and every query uses a fixed SQL string so the sqlite3
+statement cache keeps it prepared.
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from task_management.task import Task
+
+from .base import DEFAULT_PAGE_SIZE, StorageBackend, UserExistsError
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    username TEXT NOT NULL,
+    title TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_by_id ON tasks (id);
+CREATE INDEX IF NOT EXISTS tasks_by_username_status ON tasks (username, status);
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+_TASK_COLUMNS = "SELECT id, username, title, status FROM tasks"
+
+# Rows fetched per round trip when streaming
+_FETCH_SIZE = 500
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Storage engine backed by an SQLite database.
+
+    Each thread gets its own connection, so the backend can be shared by a thread
+    pool; SQLite's WAL mode and busy timeout handle concurrent writers, including
+    writers in other processes.
+
+    Attributes:
+        path (str): Path of the database file
+    """
+
+    def __init__(self, path: str = "tasks.db", timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    # ---- Task queries ----
+
+    def load_tasks(self, username: Optional[str] = None) -> List[Task]:
+        return list(self.iter_tasks(username))
+
+    def get_task(self, task_id: str, username: Optional[str] = None) -> Optional[Task]:
+        return next(self.iter_tasks(username, task_id=task_id), None)
+
+    def tasks_by_status(self, status: str, username: Optional[str] = None) -> List[Task]:
+        return list(self.iter_tasks(username, status))
+
+    def iter_tasks(self, username: Optional[str] = None, status: Optional[str] = None,
+                   task_id: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Task]:
+        if limit is not None and limit <= 0:
+            return
+
+        conditions = []
+        parameters: list = []
+        for column, value in (("id", task_id), ("username", username), ("status", status)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        if task_id is not None:
+            limit = 1  # IDs are unique; stop at the first match
+
+        query = _TASK_COLUMNS
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY seq"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+
+        cursor = self._connection().execute(query, parameters)
+        try:
+            while True:
+                rows = cursor.fetchmany(_FETCH_SIZE)
+                if not rows:
+                    return
+                for row in rows:
+                    yield Task(*row)
+        finally:
+            cursor.close()
+
+    def page_tasks(self, username: Optional[str] = None, status: Optional[str] = None,
+                   cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Task], Optional[str]]:
+        """Return one page of tasks; the cursor is the last row's seq, so pages are index seeks."""
+        if limit < 1:
+            raise ValueError("Page size must be at least 1")
+        if cursor is not None and not cursor.isdigit():
+            raise ValueError(f"Invalid cursor: {cursor!r}")
+
+        conditions = ["seq > ?"]
+        parameters: list = [int(cursor) if cursor is not None else 0]
+        for column, value in (("username", username), ("status", status)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        parameters.append(limit)
+
+        rows = self._connection().execute(
+            "SELECT seq, id, username, title, status FROM tasks WHERE " + " AND ".join(conditions) +
+            " ORDER BY seq LIMIT ?", parameters).fetchall()
+        tasks = [Task(*row[1:]) for row in rows]
+        return tasks, str(rows[-1][0]) if len(rows) == limit else None
+
+    def count_by_status(self, username: Optional[str] = None) -> Dict[str, int]:
+        if username is None:
+            rows = self._connection().execute("SELECT status, COUNT(*) FROM tasks GROUP BY status")
+        else:
+            rows = self._connection().execute(
+                "SELECT status, COUNT(*) FROM tasks WHERE username = ? GROUP BY status", (username,))
+        return dict(rows.fetchall())
+
+    def recent_tasks(self, username: Optional[str] = None, limit: int = 5) -> List[Task]:
+        if username is None:
+            rows = self._connection().execute(f"{_TASK_COLUMNS} ORDER BY seq DESC LIMIT ?", (limit,))
+        else:
+            rows = self._connection().execute(
+                f"{_TASK_COLUMNS} WHERE username = ? ORDER BY seq DESC LIMIT ?", (username, limit))
+        return [Task(*row) for row in reversed(rows.fetchall())]
+
+    def data_version(self, username: Optional[str] = None) -> Optional[Hashable]:
+        # In WAL mode every commit appends to the -wal file and checkpoints rewrite
+        # the database file, so their stats change with every write from any process
+        version = []
+        for path in (self.path, self.path + "-wal"):
+            try:
+                stat = os.stat(path)
+                version.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+            except FileNotFoundError:
+                version.append(None)
+        return tuple(version)
+
+    # ---- Task mutations ----
+
+    def add_tasks(self, tasks: Iterable[Task]) -> None:
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT INTO tasks (id, username, title, status) VALUES (?, ?, ?, ?)",
+                (tuple(task.values()) for task in tasks))
+
+    def update_statuses(self, updates: Iterable[Tuple[str, str, str]]) -> None:
+        with self._connection() as connection:
+            connection.executemany(
+                "UPDATE tasks SET status = ? WHERE id = ? AND username = ?",
+                ((new_status, task_id, username) for task_id, username, new_status in updates))
+
+    def delete_tasks(self, keys: Iterable[Tuple[str, str]]) -> None:
+        with self._connection() as connection:
+            connection.executemany("DELETE FROM tasks WHERE id = ? AND username = ?", keys)
+
+    # ---- Users ----
+
+    def get_password_hash(self, username: str) -> Optional[str]:
+        row = self._connection().execute(
+            "SELECT password FROM users WHERE username = ?", (username,)).fetchone()
+        return row[0] if row else None
+
+    def add_user(self, username: str, password_hash: str) -> None:
+        try:
+            with self._connection() as connection:
+                connection.execute("INSERT INTO users (username, password) VALUES (?, ?)", (username, password_hash))
+        except sqlite3.IntegrityError:
+            raise UserExistsError(username) from None
+
+    def update_password_hash(self, username: str, password_hash: str) -> None:
+        with self._connection() as connection:
+            cursor = connection.execute("UPDATE users SET password = ? WHERE username = ?", (password_hash, username))
+        if cursor.rowcount == 0:
+            raise KeyError(username)
+
+    def iter_users(self) -> Iterator[Tuple[str, str]]:
+        cursor = self._connection().execute("SELECT username, password FROM users")
+        try:
+            while True:
+                rows = cursor.fetchmany(_FETCH_SIZE)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            cursor.close()
+
+    # ---- Lifecycle ----
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
@@ -0,0 +1,113 @@
+"""
+Storage System - User File Module
+
+This module provides the user-account half of the file-based storage engines: the
+credentials in users.txt, served from a cached UserStore and an optional username
+Bloom filter. The flat-file, sharded and binary engines keep their tasks in different
+layouts but share this one users file format.
+
+File format:
+    users.txt: username:hashed_password (one user per line)
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import os
+from typing import Iterator, Optional, Tuple
+
+from user_management.bloom import UsernameBloomSidecar
+from user_management.user_store import UserStore
+
+from .base import UserExistsError
+from .locking import atomic_replace, file_lock
+
+
+class UserFileStore:
+    """
+    User accounts kept in a users file.
+
+    New users are appended under an exclusive lock and lookups are served from a
+    cached UserStore, so several processes can safely share the same file.
+
+    Attributes:
+        users_path (str): Path of the users file
+        users (UserStore): Cached username -> password hash view of the users file
+        bloom (UsernameBloomSidecar): Optional username Bloom filter; only used once
+            its sidecar has been built with `python -m user_management.bloom rebuild`
+    """
+
+    def __init__(self, users_path: str = "users.txt"):
+        self.users_path = users_path
+        self.users = UserStore(users_path)
+        self.bloom = UsernameBloomSidecar(users_path)
+
+    def iter_users(self) -> Iterator[Tuple[str, str]]:
+        """Yield every (username, password_hash) pair in file order."""
+        try:
+            with open(self.users_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    stored_username, separator, stored_password = line.strip().partition(":")
+                    if separator:
+                        yield stored_username, stored_password
+        except FileNotFoundError:
+            return
+
+    def get_password_hash(self, username: str) -> Optional[str]:
+        """Return the stored password hash for a user, or None if the user is unknown."""
+        return self.users.get(username)
+
+    def user_exists(self, username: str) -> bool:
+        """Return True if a user with this username is registered."""
+        # Definite negatives from the Bloom filter never touch users.txt
+        if self.bloom.definitely_absent(username):
+            return False
+        return username in self.users
+
+    def add_user(self, username: str, password_hash: str) -> None:
+        """
+        Append the credentials of a newly registered user.
+
+        Raises:
+            UserExistsError: If the username is already registered
+        """
+        with file_lock(self.users_path):
+            # Checked again under the lock, so concurrent sign-ups cannot both succeed
+            if username in self.users:
+                raise UserExistsError(username)
+            with open(self.users_path, "a+", encoding="utf-8") as file:
+                size_before = file.tell()
+                # A hand-edited file may lack a final newline; keep that user on its own line
+                separator = ""
+                if size_before and os.pread(file.fileno(), 1, size_before - 1) != b"\n":
+                    separator = "\n"
+                file.write(f"{separator}{username}:{password_hash}\n")
+            self.bloom.record(username, size_before)
+
+    def update_password_hash(self, username: str, password_hash: str) -> None:
+        """
+        Replace the stored password hash of an existing user.
+
+        Raises:
+            KeyError: If the user is unknown
+        """
+        # Rare (one rewrite per upgraded account), so a full atomic rewrite is fine
+        with file_lock(self.users_path):
+            try:
+                size_before = os.path.getsize(self.users_path)
+            except FileNotFoundError:
+                raise KeyError(username) from None
+            replaced = False
+            with open(self.users_path, "r", encoding="utf-8") as source, atomic_replace(self.users_path) as target:
+                for line in source:
+                    stored_username, separator, _ = line.strip().partition(":")
+                    if separator and stored_username == username and not replaced:
+                        target.write(f"{username}:{password_hash}\n")
+                        replaced = True
+                    else:
+                        target.write(line)
+                if not replaced:
+                    # Aborts the rewrite, leaving users.txt untouched
+                    raise KeyError(username)
+            self.bloom.record_rewrite(size_before)
@@ -4,9 +4,24 @@ Task Management System - Core Module
 This module provides the core functionality for managing tasks in the task management system.
 It includes functions for adding, loading, viewing, and manipulating tasks.
 
+The operations module is the print-free core: each operation returns an
+OperationResult (or, for batches, one (task_id, success, message) entry per item)
+instead of printing or prompting. The add_task, load_task, complete_task and
+delete_task modules are the interactive layer on top of it, used by the menus.
+
 The module is organized into the following components:
+- operations: Print-free task operations returning structured results
 - add_task: Functions for creating and saving new tasks
 - load_task: Functions for retrieving and querying existing tasks
+- task: Compact Task record type
+- task_store: Indexed in-memory cache of the tasks file
+- parallel_parse: Multi-process parser for large tasks files
+- journal: Append-only journal for status changes and deletions
+- mmap_reader: Zero-copy memory-mapped reader for large task files
+- counters: Materialized per-user status counts kept in a sidecar file
+- search: Inverted index for keyword search over task titles
+- query_cache: LRU/TTL cache of per-user task views, invalidated by writes
+- vacuum: One-pass cleanup of the tasks file (legacy rows, malformed and orphaned rows)
 - view_task: Functions for displaying tasks in various formats
 - complete_task: Functions for completing tasks
 - delete_task: Functions for deleting tasks
@@ -17,29 +32,65 @@ Date: July 2nd, 2025
 Version: 1.0.0
 """
 
-from .add_task import add_task, generate_task_id, save_task
-from .load_task import load_tasks, get_task_by_id, get_tasks_by_status
-from .view_task import display_task, display_tasks, display_task_summary, display_detailed_task, display_main_task_menu
-from .complete_task import complete_task, update_task_status, display_task_with_id, select_task_by_id
-from .delete_task import delete_task
+from .operations import (OperationResult, create_task, get_task, list_tasks, list_task_page, list_recent_tasks,
+                         count_statuses, find_tasks, set_task_status, mark_completed, remove_task)
+from .add_task import add_task, generate_task_id, save_task, save_tasks
+from .load_task import load_tasks, get_task_by_id, get_tasks_by_status, get_status_counts, get_recent_tasks, iter_tasks, page_tasks
+from .task import Task
+from .task_store import TaskStore
+from .journal import compact_journal
+from .mmap_reader import MappedTaskReader, count_tasks_by_status
+from .search import search_tasks
+from .query_cache import QueryCache, get_query_cache, query_cache_stats
+from .view_task import display_task, display_tasks, display_task_pages, display_task_summary, display_detailed_task, display_main_task_menu
+from .complete_task import complete_task, update_task_status, update_task_statuses, display_task_with_id, select_task_by_id
+from .delete_task import delete_task, delete_tasks
 
 __all__ = [
+    'OperationResult',
+    'create_task',
+    'get_task',
+    'list_tasks',
+    'list_task_page',
+    'list_recent_tasks',
+    'count_statuses',
+    'find_tasks',
+    'set_task_status',
+    'mark_completed',
+    'remove_task',
     'add_task',
     'generate_task_id',
     'save_task',
+    'save_tasks',
     'load_tasks',
     'get_task_by_id',
     'get_tasks_by_status',
+    'get_status_counts',
+    'get_recent_tasks',
+    'iter_tasks',
+    'page_tasks',
+    'Task',
+    'TaskStore',
+    'compact_journal',
+    'MappedTaskReader',
+    'count_tasks_by_status',
+    'search_tasks',
+    'QueryCache',
+    'get_query_cache',
+    'query_cache_stats',
     'display_task',
     'display_tasks',
+    'display_task_pages',
     'display_task_summary',
     'display_detailed_task',
     'display_main_task_menu',
     'complete_task',
     'update_task_status',
+    'update_task_statuses',
     'display_task_with_id',
     'select_task_by_id',
-    'delete_task'
+    'delete_task',
+    'delete_tasks'
 ]
 
 __version__ = "1.0.0"
@@ -1,36 +1,29 @@
 """
 Task Management System - Add Task Module
 
-This module provides functionality to add new tasks to the task management system.
-It includes functions for generating unique task IDs and saving tasks to persistent storage.
+This module provides the interactive flow for adding new tasks to the task management
+system. Validation and storage live in the operations module; generate_task_id,
+validate_task_fields and save_tasks are re-exported from there.
 
 Author: Alex Clark
 Date: July 2nd, 2025
 Version: 1.0.0
 """
 
-import uuid
 import os
-from typing import Optional
+import sys
 
+from .operations import INVALID, create_task, generate_task_id, save_tasks, validate_task_fields
 
-def generate_task_id() -> str:
-    """
-    Generate a unique identifier for a task.
-    
-    Returns:
-        str: A unique UUID string for the task
-        
-    Note:
-        Uses UUID4 for generating cryptographically secure random identifiers
-        to ensure uniqueness across the entire system.
-    """
-    return str(uuid.uuid4())
+# Add parent directory to path for metrics import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import metrics
 
 
+@metrics.instrument()
 def save_task(task_id: str, username: str, task_title: str, task_status: str) -> bool:
     """
-    Save a task to the persistent storage file.
+    Save a task to persistent storage, printing the outcome.
     
     Args:
         task_id (str): Unique identifier for the task
@@ -41,35 +34,16 @@ def save_task(task_id: str, username: str, task_title: str, task_status: str) ->
     Returns:
         bool: True if task was saved successfully, False otherwise
         
-    Raises:
-        IOError: If there are issues with file operations
-        Exception: For any other unexpected errors during save operation
+    Note:
+        Interactive wrapper around operations.create_task, which validates and
+        stores the task without printing.
     """
-    # Validate input parameters
-    if not all([task_id, username, task_title, task_status]):
-        print("Error: All task parameters must be provided")
-        return False
-    
-    # Sanitize input to prevent injection attacks
-    if "|" in task_title or "|" in username:
-        print("Error: Task title and username cannot contain the '|' character")
-        return False
-    
-    try:
-        # Use 'with' statement for proper file handling and automatic cleanup
-        with open("tasks.txt", "a", encoding="utf-8") as file:
-            # Format: task_id|username|task_title|task_status
-            task_line = f"{task_id}|{username}|{task_title}|{task_status}\n"
-            file.write(task_line)
-            print("Task added successfully!")
-            return True
-            
-    except IOError as e:
-        print(f"IO Error saving task: {e}")
-        return False
-    except Exception as e:
-        print(f"Unexpected error saving task: {e}")
-        return False
+    result = create_task(username, task_title, task_status, task_id)
+    if result.success:
+        print(f"{result.message}!")
+    else:
+        print(f"Error: {result.message}" if result.error == INVALID else result.message)
+    return result.success
 
 
 def add_task(username: str) -> bool:
@@ -1,14 +1,18 @@
 """
 Task Management System - Complete Task Module
 
-This module provides the complete_task operation and helpers.
+This module provides the interactive complete_task operation and helpers. The
+print-free operations behind them (and update_task_statuses) live in the operations
+module.
 
 Author: Alex Clark
 Date: July 2nd, 2025
 Version: 1.0.0
 """
 
-from .load_task import load_tasks, get_task_by_id
+from .load_task import get_task_by_id
+from .operations import VALID_STATUSES, mark_completed, set_task_status, update_task_statuses
+import metrics
 from typing import Dict, Optional
 
 
@@ -21,46 +25,29 @@ def complete_task(task_id: str, username: str) -> bool:
     Returns:
         bool: True if task was completed successfully, False otherwise
     """
-    task = get_task_by_id(task_id, username)
-    if not task:
-        print("Task not found or you don't have permission to modify it.")
-        return False
-    if task["status"] == "completed":
-        print("Task is already completed.")
-        return False
-    return update_task_status(task_id, username, "completed")
+    result = mark_completed(task_id, username)
+    print(f"{result.message}!" if result.success else result.message)
+    return result.success
 
 
+@metrics.instrument()
 def update_task_status(task_id: str, username: str, new_status: str) -> bool:
-    valid_statuses = ["pending", "completed", "in_progress", "cancelled"]
-    if new_status not in valid_statuses:
-        print(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
-        return False
-    all_tasks = load_tasks()  # Load all tasks to rewrite the file
-    user_tasks = load_tasks(username)
-    task_found = False
-    for task in user_tasks:
-        if task["id"] == task_id:
-            task_found = True
-            break
-    if not task_found:
-        print("Task not found or you don't have permission to modify it.")
-        return False
-    for task in all_tasks:
-        if task["id"] == task_id and task["username"] == username:
-            task["status"] = new_status
-            break
-    try:
-        with open("tasks.txt", "w", encoding="utf-8") as file:
-            for task in all_tasks:
-                task_line = f"{task['id']}|{task['username']}|{task['title']}|{task['status']}\n"
-                file.write(task_line)
-        status_display = "completed" if new_status == "completed" else new_status
-        print(f"Task marked as {status_display} successfully!")
-        return True
-    except Exception as e:
-        print(f"Error updating task: {e}")
-        return False
+    """
+    Change the status of a task owned by a user.
+    Args:
+        task_id (str): The unique identifier of the task
+        username (str): Username of the task owner
+        new_status (str): One of 'pending', 'completed', 'in_progress', 'cancelled'
+    Returns:
+        bool: True if the status was updated successfully, False otherwise
+    Note:
+        Prints the outcome of operations.set_task_status. With the flat-file backend
+        the change is appended to the task journal instead of rewriting tasks.txt;
+        the journal is folded back into the file once it passes a size threshold.
+    """
+    result = set_task_status(task_id, username, new_status)
+    print(f"{result.message}!" if result.success else result.message)
+    return result.success
 
 
 def display_task_with_id(task: Dict[str, str], index: int = None) -> None:
@@ -0,0 +1,387 @@
+"""
+Task Management System - Status Counters Module
+
+This module provides materialized task counts per (username, status) and in total,
+persisted in small sidecar files next to the tasks file. Writers adjust the counts
+as they add, update and delete tasks, so summaries and dashboards read a handful of
+numbers instead of scanning every task.
+
+The counts are stored as a checkpoint plus a log of changes made since it:
+
+    tasks.txt.counts      {"version": 1, "state": [...], "totals": {status: n},
+                           "users": {username: {status: n}}}
+    tasks.txt.counts.log  one [before, after, [[username, status, delta], ...]] per write
+
+A write appends a single short line to the log, so its cost does not grow with the
+number of users. The log is folded into a fresh checkpoint when the task journal is
+compacted, or once it passes COUNTS_LOG_CHECKPOINT_BYTES.
+
+"state" records the tasks file and journal (inode, size, mtime) the counts describe,
+and each log entry moves the counts from its "before" state to its "after" state.
+If either file changes without the counts being adjusted (a hand edit, a format
+conversion, a crashed writer), the chain of states no longer reaches the files on
+disk and the counts are rebuilt with a memory-mapped scan on next use.
+
+Usage:
+    python -m task_management.counters verify|rebuild [--tasks tasks.txt]
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from storage.locking import atomic_replace
+
+from .journal import JournalRecord, journal_path_for
+from .mmap_reader import MappedTaskReader
+
+
+_VERSION = 1
+
+# Size (in bytes) above which writers fold the counts log into a new checkpoint
+COUNTS_LOG_CHECKPOINT_BYTES = 1024 * 1024
+
+# (tasks inode, size, mtime_ns, journal inode, journal size); None/0 for missing files
+TasksState = Tuple[Optional[int], Optional[int], Optional[int], Optional[int], int]
+
+# Net change to apply per (username, status)
+CountDeltas = Dict[Tuple[str, str], int]
+
+
+def counts_path_for(tasks_path: str) -> str:
+    """
+    Return the counters sidecar path belonging to a tasks file.
+
+    Args:
+        tasks_path (str): Path of the tasks file
+
+    Returns:
+        str: The tasks path with a '.counts' suffix
+    """
+    return tasks_path + ".counts"
+
+
+def counts_log_path_for(tasks_path: str) -> str:
+    """
+    Return the counts log path belonging to a tasks file.
+
+    Args:
+        tasks_path (str): Path of the tasks file
+
+    Returns:
+        str: The tasks path with a '.counts.log' suffix
+    """
+    return counts_path_for(tasks_path) + ".log"
+
+
+def tasks_state(tasks_path: str) -> TasksState:
+    """
+    Describe the current on-disk state of a tasks file and its journal.
+
+    Args:
+        tasks_path (str): Path of the tasks file
+
+    Returns:
+        TasksState: Changes whenever either file is appended to, rewritten or replaced
+    """
+    try:
+        stat = os.stat(tasks_path)
+        base = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    except FileNotFoundError:
+        base = (None, None, None)
+    try:
+        journal_stat = os.stat(journal_path_for(tasks_path))
+        journal = (journal_stat.st_ino, journal_stat.st_size)
+    except FileNotFoundError:
+        journal = (None, 0)
+    return base + journal
+
+
+def journal_deltas(records: Iterable[JournalRecord], statuses: Dict[Tuple[str, str], Optional[str]]) -> CountDeltas:
+    """
+    Work out how journal records change the counts.
+
+    Args:
+        records (Iterable[JournalRecord]): Records about to be appended, in order
+        statuses (Dict[Tuple[str, str], Optional[str]]): Current status of every
+            (task_id, username) the records touch, or None if there is no such task
+
+    Returns:
+        CountDeltas: Net change per (username, status)
+    """
+    current = dict(statuses)
+    deltas: CountDeltas = {}
+    for operation, task_id, username, new_status in records:
+        old_status = current.get((task_id, username))
+        if old_status is None:
+            continue  # Updates and deletes of missing (or deleted) tasks are no-ops
+        deltas[(username, old_status)] = deltas.get((username, old_status), 0) - 1
+        if operation == "S":
+            deltas[(username, new_status)] = deltas.get((username, new_status), 0) + 1
+        current[(task_id, username)] = new_status if operation == "S" else None
+    return deltas
+
+
+class StatusCounters:
+    """
+    Materialized per-user and total status counts for one tasks file.
+
+    Attributes:
+        tasks_path (str): Path of the tasks file being counted
+        path (str): Path of the checkpoint file
+        log_path (str): Path of the log of changes made since the checkpoint
+    """
+
+    def __init__(self, tasks_path: str = "tasks.txt"):
+        self.tasks_path = tasks_path
+        self.path = counts_path_for(tasks_path)
+        self.log_path = counts_log_path_for(tasks_path)
+        self._lock = threading.Lock()
+        self._state: Optional[TasksState] = None
+        self._totals: Dict[str, int] = {}
+        self._users: Dict[str, Dict[str, int]] = {}
+        # Inode of the log and how far it has been applied to the in-memory counts
+        self._log_inode: Optional[int] = None
+        self._log_offset = 0
+
+    def state(self) -> TasksState:
+        """Return the current state of the tasks file and its journal."""
+        return tasks_state(self.tasks_path)
+
+    def _add(self, username: str, status: str, delta: int) -> None:
+        user_counts = self._users.setdefault(username, {})
+        user_counts[status] = user_counts.get(status, 0) + delta
+        self._totals[status] = self._totals.get(status, 0) + delta
+
+    def _read(self) -> bool:
+        """Load the checkpoint and replay the whole log. Returns False if the checkpoint is missing or invalid."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            if data.get("version") != _VERSION:
+                self._state = None
+                return False
+            self._state = tuple(data["state"])
+            self._totals = dict(data["totals"])
+            self._users = {username: dict(counts) for username, counts in data["users"].items()}
+        except (FileNotFoundError, ValueError, KeyError, TypeError, AttributeError):
+            self._state = None
+            return False
+        self._log_inode, self._log_offset = None, 0
+        self._replay_log()
+        return True
+
+    def _replay_log(self) -> bool:
+        """
+        Apply the log entries appended since the last call to the in-memory counts.
+
+        Entries that do not continue from the current state (written before the
+        checkpoint, or after a change the counts missed) are skipped; if the chain is
+        broken, the state simply never reaches the files on disk and the counts are
+        rebuilt. Returns False if the log was replaced and must be read from the start.
+        """
+        try:
+            with open(self.log_path, "rb") as file:
+                inode = os.fstat(file.fileno()).st_ino
+                if self._log_inode is not None and inode != self._log_inode:
+                    return False
+                file.seek(self._log_offset)
+                data = file.read()
+        except FileNotFoundError:
+            return self._log_offset == 0
+        self._log_inode = inode
+        # Only whole lines: a writer in another process may be part way through one
+        consumed = data.rfind(b"\n") + 1
+        for line in data[:consumed].splitlines():
+            try:
+                before, after, deltas = json.loads(line)
+                before, after = tuple(before), tuple(after)
+                if before != self._state:
+                    continue
+                for username, status, delta in deltas:
+                    self._add(username, status, delta)
+            except (ValueError, TypeError):
+                continue  # Torn by a crash; the chain breaks here
+            self._state = after
+        self._log_offset += consumed
+        return True
+
+    def _write(self, state: TasksState) -> None:
+        """Persist the in-memory counts as a checkpoint describing the given state."""
+        with atomic_replace(self.path) as file:
+            json.dump({"version": _VERSION, "state": list(state), "totals": self._totals, "users": self._users}, file)
+        self._state = state
+
+    def _checkpoint(self, state: TasksState) -> None:
+        """
+        Write a checkpoint and start a new, empty log.
+
+        Must be called while holding the exclusive tasks-file lock, so that no
+        writer appends to the log between the two steps.
+        """
+        self._write(state)
+        try:
+            os.remove(self.log_path)
+        except FileNotFoundError:
+            pass
+        self._log_inode, self._log_offset = None, 0
+
+    def _current(self, state: TasksState) -> bool:
+        """Make sure the in-memory counts describe state, reading the sidecar files if needed."""
+        if self._state == state:
+            return True
+        if self._state is not None and self._replay_log() and self._state == state:
+            return True
+        return self._read() and self._state == state
+
+    def get(self, username: Optional[str] = None) -> Dict[str, int]:
+        """
+        Return the status counts for one user, or in total.
+
+        Args:
+            username (Optional[str]): If provided, only count this user's tasks
+
+        Returns:
+            Dict[str, int]: Maps each status to its number of tasks
+
+        Note:
+            Costs two stat() calls while the in-memory counts are current, plus a read
+            of the new log entries after writes by other processes; otherwise the
+            counts are rebuilt first.
+        """
+        with self._lock:
+            if not self._current(self.state()):
+                self._rebuild()
+            counts = self._totals if username is None else self._users.get(username, {})
+            return {status: count for status, count in counts.items() if count}
+
+    def _rebuild(self) -> None:
+        before = self.state()
+        with MappedTaskReader(self.tasks_path) as reader:
+            users = reader.count_by_user_status()
+        totals: Dict[str, int] = {}
+        for counts in users.values():
+            for status, count in counts.items():
+                totals[status] = totals.get(status, 0) + count
+        self._users, self._totals = users, totals
+        # Only persist counts that provably describe an unchanged file; if a writer
+        # got in during the scan they are still right for this call, but not stored.
+        # The log is left alone (no lock is held): its older entries no longer chain
+        # from the new checkpoint, and are dropped at the next checkpoint.
+        if self.state() == before:
+            self._write(before)
+            self._log_inode, self._log_offset = None, 0
+            self._replay_log()
+        else:
+            self._state = None
+
+    def rebuild(self) -> None:
+        """Recount every task with a memory-mapped scan and rewrite the checkpoint."""
+        with self._lock:
+            self._rebuild()
+
+    def verify(self) -> List[str]:
+        """
+        Compare the stored counts with a fresh count of the tasks file.
+
+        Returns:
+            List[str]: Human-readable discrepancies; empty if the counts are correct
+        """
+        with self._lock:
+            if not self._read():
+                return [f"{self.path} is missing or unreadable"]
+            problems = []
+            if self._state != self.state():
+                problems.append("Counts describe an older version of the tasks file")
+            with MappedTaskReader(self.tasks_path) as reader:
+                actual = reader.count_by_user_status()
+            for username in sorted(set(actual) | set(self._users)):
+                stored = {status: count for status, count in self._users.get(username, {}).items() if count}
+                if stored != actual.get(username, {}):
+                    problems.append(f"{username}: stored {stored}, actual {actual.get(username, {})}")
+            self._state = None
+            return problems
+
+    def apply(self, deltas: CountDeltas, before: TasksState, view: Optional[TasksState] = None) -> None:
+        """
+        Adjust the counts after a write to the tasks file or its journal.
+
+        Must be called while holding the exclusive tasks-file lock, right after the write.
+
+        Args:
+            deltas (CountDeltas): Net change per (username, status) made by the write
+            before (TasksState): State of the files just before the write
+            view (Optional[TasksState]): State the deltas were computed against, if
+                they depended on the previous statuses of tasks
+
+        Note:
+            - Appends one line to the counts log; the checkpoint is only rewritten
+              once the log passes COUNTS_LOG_CHECKPOINT_BYTES
+            - The log is not fsync'd: an entry lost in a crash breaks the chain of
+              states, which makes the next reader rebuild the counts
+            - If the counts did not describe the state before the write, they are
+              left stale for the next reader to rebuild rather than adjusted
+        """
+        with self._lock:
+            if (view is not None and view != before) or not self._current(before):
+                self._state = None
+                return
+            after = self.state()
+            changes = [[username, status, delta] for (username, status), delta in deltas.items() if delta]
+            for username, status, delta in changes:
+                self._add(username, status, delta)
+            line = (json.dumps([list(before), list(after), changes], separators=(",", ":")) + "\n").encode("utf-8")
+            with open(self.log_path, "ab") as file:
+                file.write(line)
+                self._log_inode = os.fstat(file.fileno()).st_ino
+                log_size = file.tell()
+            self._state = after
+            self._log_offset = log_size
+            if log_size >= COUNTS_LOG_CHECKPOINT_BYTES:
+                self._checkpoint(after)
+
+    def carry_forward(self, before: TasksState) -> None:
+        """
+        Re-stamp the counts after a rewrite that leaves every count unchanged.
+
+        Must be called while holding the exclusive tasks-file lock. The counts log is
+        folded into the new checkpoint.
+
+        Args:
+            before (TasksState): State of the files just before the rewrite
+        """
+        with self._lock:
+            if self._current(before):
+                self._checkpoint(self.state())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check or rebuild the task status counters sidecar.")
+    parser.add_argument("command", choices=["verify", "rebuild"], help="Action to perform")
+    parser.add_argument("--tasks", default="tasks.txt", help="Path of the tasks file")
+    args = parser.parse_args()
+
+    counters = StatusCounters(args.tasks)
+    if args.command == "rebuild":
+        counters.rebuild()
+        print(f"Rebuilt {counters.path}: {counters.get()}")
+        return
+
+    problems = counters.verify()
+    if problems:
+        print(f"{counters.path} is out of date:")
+        for problem in problems:
+            print(f"  - {problem}")
+        sys.exit(1)
+    print(f"{counters.path} is up to date: {counters.get()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,31 @@
 """
 Task Management System - Delete Task Module
 
-This module provides the delete_task operation for tasks.
+This module provides the interactive delete_task operation for tasks. The print-free
+remove_task and delete_tasks operations live in the operations module.
 
 Author: Alex Clark
 Date: July 2nd, 2025
 Version: 1.0.0
 """
 
-from .load_task import load_tasks, get_task_by_id
+from .load_task import get_task_by_id
+from .operations import delete_tasks, remove_task
+import metrics
 
+@metrics.instrument()
 def delete_task(task_id: str, username: str) -> bool:
     """
-    Delete a task.
+    Delete a task after asking the user to confirm.
     Args:
         task_id (str): The unique identifier of the task
         username (str): Username of the task owner
     Returns:
         bool: True if task was deleted successfully, False otherwise
+    Note:
+        The deletion itself is operations.remove_task. With the flat-file backend it
+        is recorded as a tombstone in the task journal rather than by rewriting
+        tasks.txt.
     """
     task = get_task_by_id(task_id, username)
     if not task:
@@ -27,15 +35,6 @@ def delete_task(task_id: str, username: str) -> bool:
     if confirm not in ['y', 'yes']:
         print("Deletion cancelled.")
         return False
-    all_tasks = load_tasks()
-    all_tasks = [task_item for task_item in all_tasks if not (task_item["id"] == task_id and task_item["username"] == username)]
-    try:
-        with open("tasks.txt", "w", encoding="utf-8") as file:
-            for task_item in all_tasks:
-                task_line = f"{task_item['id']}|{task_item['username']}|{task_item['title']}|{task_item['status']}\n"
-                file.write(task_line)
-        print("Task deleted successfully!")
-        return True
-    except Exception as e:
-        print(f"Error deleting task: {e}")
-        return False 
\ No newline at end of file
+    result = remove_task(task_id, username)
+    print(f"{result.message}!" if result.success else result.message)
+    return result.success
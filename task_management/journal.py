@@ -0,0 +1,295 @@
+"""
+Task Management System - Journal Module
+
+This module provides an append-only write-ahead journal for task mutations. Instead of
+rewriting the whole tasks file for every status change or deletion, small update and
+tombstone records are appended to a journal file next to it. Readers apply the journal
+on top of the base file, and compaction folds it back into the base file once it grows
+past a size threshold.
+
+Journal format (one record per line):
+    S|task_id|username|new_status   - status update
+    D|task_id|username              - deletion (tombstone)
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from storage.diagnostics import warn
+from storage.locking import atomic_replace, file_lock
+import metrics
+
+
+# Journal size (in bytes) above which writers fold the journal back into the base file
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+# A journal record: (operation, task_id, username, new_status or None)
+JournalRecord = Tuple[str, str, str, Optional[str]]
+
+
+def journal_path_for(tasks_path: str) -> str:
+    """
+    Return the journal file path belonging to a tasks file.
+
+    Args:
+        tasks_path (str): Path of the base tasks file
+
+    Returns:
+        str: Path of the journal file (the tasks path with a '.journal' suffix)
+    """
+    return tasks_path + ".journal"
+
+
+def format_record(record: JournalRecord) -> str:
+    """Serialize a journal record to a single newline-terminated line."""
+    operation, task_id, username, new_status = record
+    if operation == "S":
+        return f"S|{task_id}|{username}|{new_status}\n"
+    return f"D|{task_id}|{username}\n"
+
+
+def parse_record(line: str) -> Optional[JournalRecord]:
+    """
+    Parse a single journal line.
+
+    Args:
+        line (str): A complete journal line
+
+    Returns:
+        Optional[JournalRecord]: The parsed record, or None if the line is not a valid record
+    """
+    parts = line.rstrip("\n").split("|")
+    if parts[0] == "S" and len(parts) == 4 and all(parts[1:]):
+        return ("S", parts[1], parts[2], parts[3])
+    if parts[0] == "D" and len(parts) == 3 and all(parts[1:]):
+        return ("D", parts[1], parts[2], None)
+    return None
+
+
+@metrics.instrument("journal.append")
+def append_records(tasks_path: str, records: Iterable[JournalRecord]) -> int:
+    """
+    Durably append journal records for a tasks file.
+
+    Callers are expected to hold the exclusive tasks-file lock (see storage.locking).
+
+    Args:
+        tasks_path (str): Path of the base tasks file
+        records (Iterable[JournalRecord]): Records to append
+
+    Returns:
+        int: Size of the journal file after the append, in bytes
+
+    Raises:
+        IOError: If the journal cannot be written
+
+    Note:
+        - All records are written with a single write() call and fsync'd
+        - If a previous writer crashed mid-record, a newline is written first so the
+          torn record cannot swallow the new ones
+    """
+    payload = "".join(format_record(record) for record in records).encode("utf-8")
+    with open(journal_path_for(tasks_path), "a+b") as file:
+        file.seek(0, os.SEEK_END)
+        if file.tell() > 0:
+            file.seek(-1, os.SEEK_END)
+            if file.read(1) != b"\n":
+                payload = b"\n" + payload
+        file.write(payload)
+        metrics.count("journal.append", "bytes_written", len(payload))
+        file.flush()
+        os.fsync(file.fileno())
+        return file.tell()
+
+
+def read_journal(journal_path: str, offset: int = 0) -> Tuple[List[JournalRecord], int]:
+    """
+    Read complete journal records starting at a byte offset.
+
+    Args:
+        journal_path (str): Path of the journal file
+        offset (int): Byte offset to start reading from (default: 0)
+
+    Returns:
+        Tuple[List[JournalRecord], int]: The parsed records and the offset just past
+        the last complete line, to be passed back in on the next read
+
+    Note:
+        A trailing line without a newline is a record still being written (or torn
+        by a crash) and is left for the next read.
+    """
+    try:
+        with open(journal_path, "rb") as file:
+            file.seek(offset)
+            data = file.read()
+    except FileNotFoundError:
+        return [], 0
+
+    end = data.rfind(b"\n") + 1
+    records = []
+    for line in data[:end].decode("utf-8").splitlines():
+        record = parse_record(line)
+        if record is not None:
+            records.append(record)
+    return records, offset + end
+
+
+def journal_overlay(records: Iterable[JournalRecord]) -> Dict[Tuple[str, str], Optional[str]]:
+    """
+    Collapse journal records into their net effect.
+
+    Args:
+        records (Iterable[JournalRecord]): Records in journal order
+
+    Returns:
+        Dict[Tuple[str, str], Optional[str]]: Maps (task_id, username) to the final
+        status, or to None if the task was deleted
+    """
+    overlay: Dict[Tuple[str, str], Optional[str]] = {}
+    for operation, task_id, username, new_status in records:
+        key = (task_id, username)
+        if overlay.get(key, "") is None:
+            continue  # Deleted tasks stay deleted
+        overlay[key] = new_status if operation == "S" else None
+    return overlay
+
+
+def pending_deletions(tasks_path: str, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+    """
+    Find the tasks that have a tombstone in the journal.
+
+    Callers are expected to hold the exclusive tasks-file lock (see storage.locking).
+
+    Args:
+        tasks_path (str): Path of the base tasks file
+        keys (Iterable[Tuple[str, str]]): (task_id, username) pairs to look for
+
+    Returns:
+        Set[Tuple[str, str]]: The keys with a deletion record that is not yet compacted
+
+    Note:
+        Journal records apply to every line with their (task_id, username), so a
+        task saved again after being deleted is hidden until the journal is folded.
+    """
+    try:
+        with open(journal_path_for(tasks_path), "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return set()
+    if b"D|" not in data:
+        return set()
+    wanted = {format_record(("D", task_id, username, None)).encode("utf-8"): (task_id, username)
+              for task_id, username in keys}
+    if len(wanted) <= 16:
+        # A few substring searches beat splitting the whole journal
+        return {key for record, key in wanted.items() if data.startswith(record) or b"\n" + record in data}
+    lines = set(data.splitlines(keepends=True))
+    return {key for record, key in wanted.items() if record in lines}
+
+
+def compact_journal(tasks_path: str) -> bool:
+    """
+    Fold the journal back into the base tasks file.
+
+    Args:
+        tasks_path (str): Path of the base tasks file
+
+    Returns:
+        bool: True if the journal was compacted (or was empty), False on error
+
+    Note:
+        Runs under the exclusive tasks-file lock, so concurrent writers wait; see
+        fold_journal for the details.
+    """
+    with file_lock(tasks_path):
+        return fold_journal(tasks_path)
+
+
+@metrics.instrument("journal.compact")
+def fold_journal(tasks_path: str) -> bool:
+    """
+    Fold the journal back into the base tasks file while holding its lock.
+
+    The base file is streamed once into a temporary file with the journal applied,
+    which then atomically replaces the base file before the journal is removed.
+    Callers are expected to hold the exclusive tasks-file lock (see storage.locking).
+
+    Args:
+        tasks_path (str): Path of the base tasks file
+
+    Returns:
+        bool: True if the journal was compacted (or was empty), False on error
+
+    Note:
+        - Each record applies to every line with its (task_id, username), the same
+          rule the task store and iter_tasks use when reading
+        - Lines not touched by the journal are copied verbatim
+        - The status counters sidecar, if current, stays current
+        - A crash at any point leaves either the old base file plus the journal, or the
+          new base file plus a journal whose records are idempotent on it
+    """
+    # Imported here: the counters module reads tasks through modules that import this one
+    from .counters import StatusCounters, tasks_state
+
+    journal_path = journal_path_for(tasks_path)
+    before = tasks_state(tasks_path)
+    records, _ = read_journal(journal_path)
+    if not records:
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+            StatusCounters(tasks_path).carry_forward(before)
+        return True
+
+    overlay = journal_overlay(records)
+    touched_ids = {task_id for task_id, _ in overlay}
+
+    try:
+        with open(tasks_path, "r", encoding="utf-8") as source, atomic_replace(tasks_path) as target:
+            for line in source:
+                # Cheap prefix check before parsing the full line
+                if line.split("|", 1)[0] not in touched_ids:
+                    target.write(line)
+                    continue
+                parts = line.strip().split("|")
+                if len(parts) == 3:
+                    task_id, task_title, task_status = parts
+                    task_username = "unknown"
+                elif len(parts) == 4:
+                    task_id, task_username, task_title, task_status = parts
+                else:
+                    target.write(line)
+                    continue
+                key = (task_id, task_username)
+                if key not in overlay:
+                    target.write(line)
+                    continue
+                if overlay[key] is None:
+                    continue  # Tombstoned
+                target.write(f"{task_id}|{task_username}|{task_title}|{overlay[key]}\n")
+    except FileNotFoundError:
+        # No base file: nothing the journal could apply to
+        pass
+    except Exception as e:
+        warn("Error compacting task journal: {error}", error=e)
+        return False
+
+    os.remove(journal_path)
+    # Compaction moves statuses between files without changing any counts
+    StatusCounters(tasks_path).carry_forward(before)
+    return True
+
+
+def maybe_compact(tasks_path: str, journal_size: int) -> None:
+    """
+    Compact the journal if it has grown past JOURNAL_COMPACT_BYTES.
+
+    Args:
+        tasks_path (str): Path of the base tasks file
+        journal_size (int): Current journal size, as returned by append_records
+    """
+    if journal_size >= JOURNAL_COMPACT_BYTES:
+        compact_journal(tasks_path)
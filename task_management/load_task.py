@@ -2,8 +2,9 @@
 Task Management System - Load Task Module
 
 This module provides functionality to load and retrieve tasks from the persistent storage.
-It includes functions for reading tasks from the storage file and converting them to
-structured data for use in the application.
+Its functions print any errors and return plain task lists, for the interactive menus;
+the print-free queries they wrap (list_tasks, get_task, ...) live in the operations
+module.
 
 Author: Alex Clark
 Date: July 2nd, 2025
@@ -11,106 +12,57 @@ Version: 1.0.0
 """
 
 import os
-from typing import List, Dict, Optional
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from .operations import (INVALID, STORAGE_ERROR, count_statuses, get_task, list_recent_tasks, list_task_page,
+                         list_tasks)
+from .task import Task
 
-def load_tasks(username: str = None) -> List[Dict[str, str]]:
+# Add parent directory to path for storage import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage import get_backend
+from storage.base import DEFAULT_PAGE_SIZE
+import metrics
+
+
+@metrics.instrument()
+def load_tasks(username: str = None) -> List[Task]:
     """
-    Load tasks from the persistent storage file, optionally filtered by username.
+    Load tasks from persistent storage, optionally filtered by username.
     
-    Reads the tasks.txt file and parses each line to extract task information.
-    Each task is represented as a dictionary with 'id', 'username', 'title', and 'status' keys.
+    Tasks are served by the active storage backend; the default flat-file backend
+    parses tasks.txt once and reloads it only when the file changes on disk. Results
+    are also kept in the query cache until the user's tasks are next written.
+    Each task is represented as a Task record with 'id', 'username', 'title', and 'status' keys.
     
     Args:
         username (str, optional): If provided, only return tasks for this user.
                                  If None, return all tasks (for admin purposes).
     
     Returns:
-        List[Dict[str, str]]: List of task dictionaries, each containing:
+        List[Task]: List of task records, each containing:
             - 'id': Unique task identifier
             - 'username': Username of the task owner
             - 'title': Task title/description
             - 'status': Current task status
-            
-    Raises:
-        FileNotFoundError: If the tasks.txt file doesn't exist
-        IOError: If there are issues reading the file
-        ValueError: If the file format is invalid
         
     Note:
         - Returns an empty list if the file doesn't exist or is empty
-        - Assumes file format: task_id|username|task_title|task_status (one per line)
+        - The flat-file format is task_id|username|task_title|task_status (one per line)
         - Handles malformed lines gracefully by skipping them
         - If username is provided, only returns tasks belonging to that user
+        - Task records are read-only and may be shared with the backend's cache
     """
-    tasks = []
-    
-    # Check if the tasks file exists
-    if not os.path.exists("tasks.txt"):
-        print("No tasks file found. Starting with empty task list.")
-        return tasks
-    
-    try:
-        # Use 'with' statement for proper file handling and automatic cleanup
-        with open("tasks.txt", "r", encoding="utf-8") as file:
-            for line_number, line in enumerate(file, start=1):
-                # Skip empty lines
-                if not line.strip():
-                    continue
-                
-                try:
-                    # Parse the line: task_id|username|task_title|task_status
-                    parts = line.strip().split("|")
-                    
-                    # Handle both old format (3 parts) and new format (4 parts)
-                    if len(parts) == 3:
-                        # Old format: task_id|task_title|task_status
-                        task_id, task_title, task_status = parts
-                        task_username = "unknown"  # Default for old format
-                    elif len(parts) == 4:
-                        # New format: task_id|username|task_title|task_status
-                        task_id, task_username, task_title, task_status = parts
-                    else:
-                        print(f"Warning: Skipping malformed line {line_number}: {line.strip()}")
-                        continue
-                    
-                    # Validate that all parts are non-empty
-                    if not all([task_id, task_title, task_status]):
-                        print(f"Warning: Skipping line {line_number} with empty fields")
-                        continue
-                    
-                    # Filter by username if specified
-                    if username is not None and task_username != username:
-                        continue
-                    
-                    # Create task dictionary with structured data
-                    task = {
-                        "id": task_id,
-                        "username": task_username,
-                        "title": task_title,
-                        "status": task_status
-                    }
-                    
-                    tasks.append(task)
-                    
-                except Exception as e:
-                    print(f"Warning: Error parsing line {line_number}: {e}")
-                    continue
-                    
-    except FileNotFoundError:
-        print("Tasks file not found. Starting with empty task list.")
-        return tasks
-    except IOError as e:
-        print(f"IO Error reading tasks file: {e}")
-        return tasks
-    except Exception as e:
-        print(f"Unexpected error loading tasks: {e}")
-        return tasks
-    
-    return tasks
-
-
-def get_task_by_id(task_id: str, username: str = None) -> Optional[Dict[str, str]]:
+    result = list_tasks(username)
+    if not result.success:
+        print(result.message)
+        return []
+    return result.value
+
+
+@metrics.instrument()
+def get_task_by_id(task_id: str, username: str = None) -> Optional[Task]:
     """
     Retrieve a specific task by its unique identifier.
     
@@ -119,26 +71,23 @@ def get_task_by_id(task_id: str, username: str = None) -> Optional[Dict[str, str
         username (str, optional): If provided, only return the task if it belongs to this user
         
     Returns:
-        Optional[Dict[str, str]]: Task dictionary if found, None otherwise
+        Optional[Task]: Task record if found, None otherwise
         
     Note:
-        This function loads all tasks and searches for the specified ID.
-        For large task lists, consider implementing a more efficient search mechanism.
+        Uses the backend's ID index, so the lookup does not scan every task.
     """
     if not task_id:
         print("Error: Task ID cannot be empty")
         return None
     
-    tasks = load_tasks(username)
-    
-    for task in tasks:
-        if task["id"] == task_id:
-            return task
-    
-    return None
+    result = get_task(task_id, username)
+    if result.error == STORAGE_ERROR:
+        print(result.message)
+    return result.value
 
 
-def get_tasks_by_status(status: str, username: str = None) -> List[Dict[str, str]]:
+@metrics.instrument()
+def get_tasks_by_status(status: str, username: str = None) -> List[Task]:
     """
     Retrieve all tasks with a specific status, optionally filtered by username.
     
@@ -147,18 +96,121 @@ def get_tasks_by_status(status: str, username: str = None) -> List[Dict[str, str
         username (str, optional): If provided, only return tasks for this user
         
     Returns:
-        List[Dict[str, str]]: List of tasks matching the specified status
+        List[Task]: List of tasks matching the specified status
         
     Note:
-        Case-sensitive matching. Consider using case-insensitive comparison
-        if needed for your use case.
+        Case-sensitive matching. Served from the query cache, or else from the
+        backend's (username, status) index, so the cost is proportional to the
+        number of matching tasks.
     """
     if not status:
         print("Error: Status cannot be empty")
         return []
     
-    tasks = load_tasks(username)
-    return [task for task in tasks if task["status"] == status]
+    result = list_tasks(username, status)
+    if not result.success:
+        print(result.message)
+        return []
+    return result.value
+
+
+def iter_tasks(username: str = None, status: str = None, id: str = None,
+               limit: int = None) -> Iterator[Task]:
+    """
+    Lazily stream tasks from persistent storage.
+    
+    Unlike load_tasks, this generator never holds more than a small batch of tasks
+    in memory, so it can run over data sets larger than available RAM.
+    
+    Args:
+        username (str, optional): Only yield tasks belonging to this user
+        status (str, optional): Only yield tasks with this status
+        id (str, optional): Only yield the task with this ID; stops at the first match
+        limit (int, optional): Stop after yielding this many tasks
+        
+    Yields:
+        Task: Task records in insertion order
+        
+    Note:
+        - Filters are pushed down to the backend, which checks them before building records
+        - Stops reading as soon as the ID is found or the limit is reached
+    """
+    return get_backend().iter_tasks(username, status, id, limit)
+
+
+@metrics.instrument()
+def page_tasks(username: str = None, status: str = None, cursor: str = None,
+               limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Task], Optional[str]]:
+    """
+    Retrieve one page of tasks, optionally filtered by username and status.
+    
+    Args:
+        username (str, optional): Only list tasks belonging to this user
+        status (str, optional): Only list tasks with this status
+        cursor (str, optional): Cursor returned with the previous page; None for the first page
+        limit (int): Maximum number of tasks on the page (default: DEFAULT_PAGE_SIZE)
+        
+    Returns:
+        Tuple[List[Task], Optional[str]]: The tasks on the page and the cursor for the
+        next page, or None when there are no more pages
+        
+    Note:
+        - Cursors are opaque; the flat-file backend encodes a byte offset, so fetching
+          page k does not re-read the k-1 pages before it
+        - Only one page is held in memory at a time
+        - An invalid or expired cursor prints an error and returns an empty page
+        - Pages are kept in the query cache until the user's tasks are next written
+    """
+    result = list_task_page(username, status, cursor, limit)
+    if not result.success:
+        print(f"Error: {result.message}" if result.error == INVALID else result.message)
+        return [], None
+    return result.value
+
+
+def get_recent_tasks(username: str = None, limit: int = 5) -> List[Task]:
+    """
+    Retrieve the most recently added tasks, optionally filtered by username.
+    
+    Args:
+        username (str, optional): If provided, only return tasks for this user
+        limit (int): Maximum number of tasks to return (default: 5)
+        
+    Returns:
+        List[Task]: The newest tasks, oldest first
+        
+    Note:
+        Read from the end of the data, so the cost does not grow with the number
+        of older tasks.
+    """
+    result = list_recent_tasks(username, limit)
+    if not result.success:
+        print(result.message)
+        return []
+    return result.value
+
+
+@metrics.instrument()
+def get_status_counts(username: str = None) -> Dict[str, int]:
+    """
+    Count tasks per status, optionally for a single user.
+    
+    Args:
+        username (str, optional): If provided, only count tasks for this user
+        
+    Returns:
+        Dict[str, int]: Maps each status to its number of tasks (statuses with no
+        tasks are omitted)
+        
+    Note:
+        The flat-file backend answers from materialized counters kept next to the
+        tasks file, so this does not scan the tasks.
+    """
+    result = count_statuses(username)
+    if not result.success:
+        print(result.message)
+        return {}
+    return result.value
 
 
 # Example usage and testing (when run as main module)
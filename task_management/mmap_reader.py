@@ -0,0 +1,264 @@
+"""
+Task Management System - Memory-Mapped Reader Module
+
+This module provides a zero-copy reader for the tasks file. Instead of reading the file
+line by line through Python text I/O and splitting every line, the file is mapped into
+memory and scanned for newline and '|' offsets on the raw bytes. Fields are compared in
+place and only decoded when a caller actually needs them, so per-user scans and status
+counts over very large files cost a byte scan rather than millions of string objects.
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import mmap
+import os
+from typing import Dict, Iterator, Optional, Tuple
+
+from storage.diagnostics import warn
+from storage.locking import file_lock
+
+from .journal import journal_overlay, journal_path_for, read_journal
+from .task import Task
+
+
+# Byte values stripped from both ends of a line, matching str.strip() for ASCII
+_WHITESPACE = frozenset(b" \t\r\n\x0b\x0c")
+
+# (id_start, id_end, user_start, user_end, title_start, title_end, status_start, status_end);
+# user_start is -1 for old-format lines, whose owner is 'unknown'
+FieldOffsets = Tuple[int, int, int, int, int, int, int, int]
+
+
+class MappedTaskReader:
+    """
+    Read-only, memory-mapped view of the tasks file.
+
+    Use as a context manager so the mapping is released promptly:
+
+        with MappedTaskReader("tasks.txt") as reader:
+            counts = reader.count_by_status("alex")
+
+    Attributes:
+        path (str): Path of the tasks file being read
+
+    Note:
+        - Pending journal records are applied, so results match load_tasks
+        - Malformed lines produce the same warnings as load_tasks
+    """
+
+    def __init__(self, path: str = "tasks.txt"):
+        self.path = path
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._journal: Dict[Tuple[bytes, bytes], Optional[bytes]] = {}
+
+    def open(self) -> None:
+        """
+        Map the tasks file into memory. A missing or empty file maps to nothing.
+
+        Note:
+            The file is mapped and the journal read under a shared lock, so the two
+            form a consistent snapshot even if compaction runs while scanning.
+        """
+        with file_lock(self.path, exclusive=False):
+            self._journal = self._read_overlay()
+            try:
+                self._file = open(self.path, "rb")
+            except FileNotFoundError:
+                return
+            if os.fstat(self._file.fileno()).st_size > 0:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        """Release the mapping and the underlying file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "MappedTaskReader":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _decode(self, start: int, end: int) -> str:
+        return self._map[start:end].decode("utf-8")
+
+    def _equals(self, start: int, end: int, value: bytes) -> bool:
+        """Compare a field to a byte string without copying it out of the map."""
+        return end - start == len(value) and self._map.find(value, start, end) == start
+
+    def _scan(self) -> Iterator[FieldOffsets]:
+        """Yield the field offsets of every well-formed line in the file."""
+        data = self._map
+        if data is None:
+            return
+
+        size = len(data)
+        position = 0
+        line_number = 0
+        while position < size:
+            line_number += 1
+            end = data.find(b"\n", position)
+            if end == -1:
+                end = size
+            start, next_position = position, end + 1
+            position = next_position
+
+            # Trim surrounding whitespace, as str.strip() would
+            while start < end and data[start] in _WHITESPACE:
+                start += 1
+            while end > start and data[end - 1] in _WHITESPACE:
+                end -= 1
+            if start == end:
+                continue
+
+            first = data.find(b"|", start, end)
+            second = data.find(b"|", first + 1, end) if first != -1 else -1
+            third = data.find(b"|", second + 1, end) if second != -1 else -1
+            fourth = data.find(b"|", third + 1, end) if third != -1 else -1
+
+            if second == -1 or fourth != -1:
+                warn("Warning: Skipping malformed line {line_number}: {line}",
+                     line_number=line_number, line=self._decode(start, end))
+                continue
+            if third == -1:
+                # Old format: task_id|task_title|task_status
+                fields = (start, first, -1, -1, first + 1, second, second + 1, end)
+            else:
+                fields = (start, first, first + 1, second, second + 1, third, third + 1, end)
+
+            # Validate that the ID, title and status are non-empty
+            if fields[0] == fields[1] or fields[4] == fields[5] or fields[6] == fields[7]:
+                warn("Warning: Skipping line {line_number} with empty fields", line_number=line_number)
+                continue
+            yield fields
+
+    def _read_overlay(self) -> Dict[Tuple[bytes, bytes], Optional[bytes]]:
+        """Return the net journal effect keyed by raw (task_id, username) bytes."""
+        records, _ = read_journal(journal_path_for(self.path))
+        return {
+            (task_id.encode("utf-8"), username.encode("utf-8")):
+                status.encode("utf-8") if status is not None else None
+            for (task_id, username), status in journal_overlay(records).items()
+        }
+
+    def _matches(self, username: Optional[bytes]) -> Iterator[Tuple[FieldOffsets, Optional[bytes]]]:
+        """
+        Yield offsets of lines owned by a user, with any journal status override.
+
+        The override is None when the journal does not touch the line; lines deleted
+        in the journal are skipped entirely.
+        """
+        overlay = self._journal
+        for fields in self._scan():
+            id_start, id_end, user_start, user_end = fields[:4]
+            if username is not None:
+                if user_start == -1:
+                    if username != b"unknown":
+                        continue
+                elif not self._equals(user_start, user_end, username):
+                    continue
+            if not overlay:
+                yield fields, None
+                continue
+            owner = b"unknown" if user_start == -1 else self._map[user_start:user_end]
+            key = (self._map[id_start:id_end], owner)
+            if key not in overlay:
+                yield fields, None
+            elif overlay[key] is not None:
+                yield fields, overlay[key]
+
+    def iter_tasks(self, username: Optional[str] = None, status: Optional[str] = None,
+                   limit: Optional[int] = None) -> Iterator[Task]:
+        """
+        Yield tasks from the mapped file, decoding only the rows that match.
+
+        Args:
+            username (Optional[str]): Only yield tasks belonging to this user
+            status (Optional[str]): Only yield tasks with this status
+            limit (Optional[int]): Stop after yielding this many tasks
+
+        Yields:
+            Task: Matching task records in file order
+        """
+        if limit is not None and limit <= 0:
+            return
+        wanted_user = username.encode("utf-8") if username is not None else None
+        wanted_status = status.encode("utf-8") if status is not None else None
+
+        yielded = 0
+        for fields, new_status in self._matches(wanted_user):
+            id_start, id_end, user_start, user_end, title_start, title_end, status_start, status_end = fields
+            if wanted_status is not None:
+                if new_status is not None:
+                    if new_status != wanted_status:
+                        continue
+                elif not self._equals(status_start, status_end, wanted_status):
+                    continue
+
+            yield Task(
+                self._decode(id_start, id_end),
+                "unknown" if user_start == -1 else self._decode(user_start, user_end),
+                self._decode(title_start, title_end),
+                new_status.decode("utf-8") if new_status is not None else self._decode(status_start, status_end)
+            )
+            yielded += 1
+            if limit is not None and yielded >= limit:
+                return
+
+    def count_by_status(self, username: Optional[str] = None) -> Dict[str, int]:
+        """
+        Count tasks per status without decoding titles or IDs.
+
+        Args:
+            username (Optional[str]): If provided, only count tasks for this user
+
+        Returns:
+            Dict[str, int]: Maps each status to its number of tasks
+        """
+        wanted_user = username.encode("utf-8") if username is not None else None
+        counts: Dict[bytes, int] = {}
+        for fields, new_status in self._matches(wanted_user):
+            key = new_status if new_status is not None else self._map[fields[6]:fields[7]]
+            counts[key] = counts.get(key, 0) + 1
+        return {status.decode("utf-8"): count for status, count in counts.items()}
+
+    def count_by_user_status(self) -> Dict[str, Dict[str, int]]:
+        """
+        Count tasks per (username, status) in a single pass.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Maps each username to its per-status counts
+        """
+        counts: Dict[Tuple[bytes, bytes], int] = {}
+        for fields, new_status in self._matches(None):
+            owner = b"unknown" if fields[2] == -1 else self._map[fields[2]:fields[3]]
+            key = (owner, new_status if new_status is not None else self._map[fields[6]:fields[7]])
+            counts[key] = counts.get(key, 0) + 1
+
+        by_user: Dict[str, Dict[str, int]] = {}
+        for (owner, status), count in counts.items():
+            by_user.setdefault(owner.decode("utf-8"), {})[status.decode("utf-8")] = count
+        return by_user
+
+
+def count_tasks_by_status(username: Optional[str] = None, path: str = "tasks.txt") -> Dict[str, int]:
+    """
+    Count tasks per status with a memory-mapped scan of the tasks file.
+
+    Args:
+        username (Optional[str]): If provided, only count tasks for this user
+        path (str): Path of the tasks file (default: tasks.txt)
+
+    Returns:
+        Dict[str, int]: Maps each status to its number of tasks
+    """
+    with MappedTaskReader(path) as reader:
+        return reader.count_by_status(username)
@@ -0,0 +1,473 @@
+"""
+Task Management System - Operations Module
+
+This module holds the core task operations. They never print, prompt or read from the
+terminal: every operation returns its outcome as a value, so the same code serves the
+interactive menus, the API server and batch jobs.
+
+Single-task operations return an OperationResult carrying a success flag, a message
+suitable for showing to a user, the operation's value and, on failure, an error code
+(INVALID, NOT_FOUND, CONFLICT or STORAGE_ERROR) that callers can map onto their own
+conventions, such as HTTP status codes. Batch operations return one
+(task_id, success, message) entry per input.
+
+The interactive functions in add_task, load_task, complete_task and delete_task are
+thin adapters over these operations that add the prompts and printed feedback.
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import os
+import sys
+import uuid
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Mapping, Optional, Tuple, Union
+
+from .query_cache import get_query_cache, invalidate_users
+from .task import Task
+
+# Add parent directory to path for storage import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage import get_backend
+from storage.base import DEFAULT_PAGE_SIZE
+import metrics
+
+
+# Statuses a task may be moved to
+VALID_STATUSES = ["pending", "completed", "in_progress", "cancelled"]
+
+# Error codes of failed operations
+INVALID = "invalid"
+NOT_FOUND = "not_found"
+CONFLICT = "conflict"
+STORAGE_ERROR = "storage_error"
+
+# Message of save_tasks entries rejected because the owner already has the task ID
+DUPLICATE_TASK_MESSAGE = "A task with this ID already exists"
+
+
+@dataclass(frozen=True)
+class OperationResult:
+    """
+    Outcome of a single task operation.
+
+    Attributes:
+        success (bool): Whether the operation succeeded
+        message (str): Human-readable description of the outcome
+        value (Any): The operation's result (a Task, a list of tasks, ...), if any
+        error (Optional[str]): INVALID, NOT_FOUND, CONFLICT or STORAGE_ERROR on failure
+    """
+    success: bool
+    message: str
+    value: Any = None
+    error: Optional[str] = None
+
+
+def _failure(error: str, message: str) -> OperationResult:
+    return OperationResult(False, message, None, error)
+
+
+def generate_task_id() -> str:
+    """
+    Generate a unique identifier for a new task.
+
+    Returns:
+        str: A unique UUID string for the task
+    """
+    return str(uuid.uuid4())
+
+
+def validate_task_fields(task_id: str, username: str, task_title: str, task_status: str) -> Optional[str]:
+    """
+    Check that a task's fields can be stored.
+
+    Args:
+        task_id (str): Unique identifier for the task
+        username (str): Username of the task owner
+        task_title (str): Title/description of the task
+        task_status (str): Current status of the task
+
+    Returns:
+        Optional[str]: An error message if the task is invalid, None otherwise
+    """
+    if not all([task_id, username, task_title, task_status]):
+        return "All task parameters must be provided"
+    if "|" in task_title or "|" in username:
+        return "Task title and username cannot contain the '|' character"
+    if any(character in field for field in (task_id, username, task_title, task_status) for character in "\r\n"):
+        return "Task fields cannot contain line breaks"
+    return None
+
+
+# ---- Queries ----
+
+@metrics.instrument()
+def list_tasks(username: Optional[str] = None, status: Optional[str] = None) -> OperationResult:
+    """
+    List tasks, optionally only those of one user and/or with one status.
+
+    Args:
+        username (Optional[str]): Only list this user's tasks (None lists every user's)
+        status (Optional[str]): Only list tasks with this status
+
+    Returns:
+        OperationResult: value is the list of Task records in insertion order
+
+    Note:
+        Results are served from the query cache until the user's tasks are next
+        written, by this or any other process. The list is the caller's own; the Task records are shared and read-only.
+    """
+    backend = get_backend()
+    if status is None:
+        compute = lambda: backend.load_tasks(username)
+    else:
+        compute = lambda: backend.tasks_by_status(status, username)
+    try:
+        tasks = get_query_cache().get_or_compute((username, status, None), compute, backend.data_version(username))
+    except Exception as e:
+        return _failure(STORAGE_ERROR, f"Unexpected error loading tasks: {e}")
+    return OperationResult(True, f"Found {len(tasks)} tasks", list(tasks))
+
+
+@metrics.instrument()
+def list_task_page(username: Optional[str] = None, status: Optional[str] = None, cursor: Optional[str] = None,
+                   limit: int = DEFAULT_PAGE_SIZE) -> OperationResult:
+    """
+    Fetch one page of tasks, optionally only those of one user and/or with one status.
+
+    Args:
+        username (Optional[str]): Only list this user's tasks
+        status (Optional[str]): Only list tasks with this status
+        cursor (Optional[str]): Cursor returned with the previous page; None for the first page
+        limit (int): Maximum number of tasks on the page
+
+    Returns:
+        OperationResult: value is (tasks, next_cursor), next_cursor being None on the
+        last page; an invalid or expired cursor fails with INVALID
+    """
+    backend = get_backend()
+    try:
+        tasks, next_cursor = get_query_cache().get_or_compute(
+            (username, status, (cursor, limit)), lambda: backend.page_tasks(username, status, cursor, limit),
+            backend.data_version(username))
+    except ValueError as e:
+        return _failure(INVALID, str(e))
+    except Exception as e:
+        return _failure(STORAGE_ERROR, f"Unexpected error loading tasks: {e}")
+    return OperationResult(True, f"Found {len(tasks)} tasks", (list(tasks), next_cursor))
+
+
+@metrics.instrument()
+def list_recent_tasks(username: Optional[str] = None, limit: int = 5) -> OperationResult:
+    """
+    List the most recently added tasks, optionally only those of one user.
+
+    Args:
+        username (Optional[str]): Only list this user's tasks (None lists every user's)
+        limit (int): Most tasks to list
+
+    Returns:
+        OperationResult: value is the list of tasks, oldest first
+    """
+    try:
+        tasks = get_backend().recent_tasks(username, limit)
+    except Exception as e:
+        return _failure(STORAGE_ERROR, f"Unexpected error loading tasks: {e}")
+    return OperationResult(True, f"Found {len(tasks)} tasks", tasks)
+
+
+@metrics.instrument()
+def get_task(task_id: str, username: Optional[str] = None) -> OperationResult:
+    """
+    Fetch a single task.
+
+    Args:
+        task_id (str): The task's unique identifier
+        username (Optional[str]): If provided, the task must belong to this user
+
+    Returns:
+        OperationResult: value is the Task; fails with NOT_FOUND if there is no such
+        task or it belongs to someone else
+    """
+    if not task_id:
+        return _failure(INVALID, "Task ID cannot be empty")
+    try:
+        task = get_backend().get_task(task_id, username)
+    except Exception as e:
+        return _failure(STORAGE_ERROR, f"Unexpected error loading task: {e}")
+    if task is None:
+        return _failure(NOT_FOUND, "Task not found or you don't have permission to access it.")
+    return OperationResult(True, "Task found", task)
+
+
+@metrics.instrument()
+def count_statuses(username: Optional[str] = None) -> OperationResult:
+    """
+    Count tasks per status, optionally for a single user.
+
+    Returns:
+        OperationResult: value maps each status to its number of tasks
+    """
+    try:
+        counts = get_backend().count_by_status(username)
+    except Exception as e:
+        return _failure(STORAGE_ERROR, f"Unexpected error counting tasks: {e}")
+    return OperationResult(True, f"Counted {sum(counts.values())} tasks", counts)
+
+
+@metrics.instrument()
+def find_tasks(username: Optional[str], query: str, limit: Optional[int] = None,
+               status: Optional[str] = None) -> OperationResult:
+    """
+    Search tasks by keywords in their titles.
+
+    Args:
+        username (Optional[str]): Only search this user's tasks (None searches every user's)
+        query (str): Space-separated keywords that must all appear (see search.parse_query)
+        limit (Optional[int]): Return at most this many tasks
+        status (Optional[str]): Only return tasks with this status
+
+    Returns:
+        OperationResult: value is the list of matching tasks in insertion order
+    """
+    if not query or not query.strip():
+        return _failure(INVALID, "Search query cannot be empty")
+    try:
+        # The limit applies to the filtered matches, so it cannot be pushed down
+        tasks = get_backend().search_tasks(username, query, limit if status is None else None)
+    except Exception as e:
+        return _failure(STORAGE_ERROR, f"Unexpected error searching tasks: {e}")
+    if status is not None:
+        tasks = [task for task in tasks if task.status == status][:limit]
+    return OperationResult(True, f"Found {len(tasks)} matching tasks", tasks)
+
+
+# ---- Single-task writes ----
+
+@metrics.instrument()
+def create_task(username: str, title: str, status: str = "pending", task_id: Optional[str] = None) -> OperationResult:
+    """
+    Create a task.
+
+    Args:
+        username (str): Owner of the new task
+        title (str): Task title
+        status (str): Initial status (default: 'pending')
+        task_id (Optional[str]): Identifier to use (default: a new UUID)
+
+    Returns:
+        OperationResult: value is the new Task; invalid fields fail with INVALID and
+        an ID the user already has fails with CONFLICT
+    """
+    if task_id is None:
+        task_id = generate_task_id()
+    error = validate_task_fields(task_id, username, title, status)
+    if error:
+        return _failure(INVALID, error)
+    [(_, success, message)] = save_tasks([(task_id, username, title, status)])
+    if not success:
+        return _failure(CONFLICT if message == DUPLICATE_TASK_MESSAGE else STORAGE_ERROR, message)
+    return OperationResult(True, message, Task(task_id, username, title, status))
+
+
+@metrics.instrument()
+def set_task_status(task_id: str, username: str, new_status: str) -> OperationResult:
+    """
+    Change the status of a task owned by a user.
+
+    Args:
+        task_id (str): The task's unique identifier
+        username (str): Owner of the task
+        new_status (str): One of VALID_STATUSES
+
+    Returns:
+        OperationResult: value is the updated Task
+    """
+    found = get_task(task_id, username)
+    if not found.success:
+        if found.error == NOT_FOUND:
+            return _failure(NOT_FOUND, "Task not found or you don't have permission to modify it.")
+        return found
+    [(_, success, message)] = update_task_statuses({task_id: new_status}, username)
+    if not success:
+        return _failure(INVALID if new_status not in VALID_STATUSES else STORAGE_ERROR, message)
+    return OperationResult(True, message, found.value.with_status(new_status))
+
+
+def mark_completed(task_id: str, username: str) -> OperationResult:
+    """
+    Mark a task as completed.
+
+    Returns:
+        OperationResult: value is the updated Task; fails with CONFLICT if the task
+        is already completed
+    """
+    found = get_task(task_id, username)
+    if found.success and found.value["status"] == "completed":
+        return _failure(CONFLICT, "Task is already completed.")
+    return set_task_status(task_id, username, "completed")
+
+
+@metrics.instrument()
+def remove_task(task_id: str, username: str) -> OperationResult:
+    """
+    Delete a task owned by a user, without asking for confirmation.
+
+    Returns:
+        OperationResult: value is the deleted Task
+    """
+    found = get_task(task_id, username)
+    if not found.success:
+        if found.error == NOT_FOUND:
+            return _failure(NOT_FOUND, "Task not found or you don't have permission to delete it.")
+        return found
+    [(_, success, message)] = delete_tasks([task_id], username)
+    if not success:
+        return _failure(STORAGE_ERROR, message)
+    return OperationResult(True, message, found.value)
+
+
+# ---- Batch writes ----
+
+@metrics.instrument()
+def save_tasks(tasks: Iterable[Union[Tuple[str, str, str, str], Mapping[str, str]]]) -> List[Tuple[str, bool, str]]:
+    """
+    Save many tasks to persistent storage in a single write pass.
+
+    Args:
+        tasks (Iterable): Tasks to save, each either a (task_id, username, task_title,
+                          task_status) tuple, a Task, or a dict with 'id', 'username',
+                          'title' and 'status' keys
+
+    Returns:
+        List[Tuple[str, bool, str]]: One (task_id, success, message) entry per input
+        task, in input order
+
+    Note:
+        - Every task is validated before anything is written; invalid tasks are
+          reported and skipped without affecting the rest of the batch
+        - A task whose owner already has a task with its ID (in storage or earlier
+          in the batch) is rejected, so IDs are never duplicated
+        - All valid tasks are handed to the storage backend as one batch, which the
+          flat-file backend writes with a single open and one buffered write
+    """
+    backend = get_backend()
+    results = []
+    valid_tasks = []
+    seen = set()
+    for task in tasks:
+        if isinstance(task, (Mapping, Task)):
+            fields = (task.get("id"), task.get("username"), task.get("title"), task.get("status"))
+        else:
+            fields = tuple(task)
+        error = validate_task_fields(*fields) if len(fields) == 4 else "Task must have exactly four fields"
+        if not error and ((fields[0], fields[1]) in seen or backend.get_task(fields[0], fields[1]) is not None):
+            error = DUPLICATE_TASK_MESSAGE
+        if error:
+            results.append((fields[0] if fields else "", False, error))
+            continue
+        seen.add((fields[0], fields[1]))
+        valid_tasks.append(Task(*fields))
+        results.append((fields[0], True, "Task added successfully"))
+
+    if not valid_tasks:
+        return results
+
+    try:
+        backend.add_tasks(valid_tasks)
+    except Exception as e:
+        # The batch may be partially written; report every valid task as failed
+        return [(task_id, False, f"Error saving task: {e}") if success else (task_id, success, message)
+                for task_id, success, message in results]
+    finally:
+        invalidate_users(task.username for task in valid_tasks)
+
+    return results
+
+
+@metrics.instrument()
+def update_task_statuses(updates: Mapping[str, str], username: str) -> List[Tuple[str, bool, str]]:
+    """
+    Change the status of many tasks owned by a user in a single write.
+
+    Args:
+        updates (Mapping[str, str]): Maps task IDs to their new status
+        username (str): Username of the task owner
+
+    Returns:
+        List[Tuple[str, bool, str]]: One (task_id, success, message) entry per update
+
+    Note:
+        All valid updates are applied with one backend write (for the flat-file
+        backend, one journal append and one fsync).
+    """
+    backend = get_backend()
+    results = []
+    records = []
+    for task_id, new_status in updates.items():
+        if new_status not in VALID_STATUSES:
+            results.append((task_id, False, f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}"))
+        elif backend.get_task(task_id, username) is None:
+            results.append((task_id, False, "Task not found or you don't have permission to modify it."))
+        else:
+            records.append((task_id, username, new_status))
+            results.append((task_id, True, f"Task marked as {new_status} successfully"))
+
+    if not records:
+        return results
+
+    try:
+        backend.update_statuses(records)
+    except Exception as e:
+        return [(task_id, False, f"Error updating task: {e}") if success else (task_id, success, message)
+                for task_id, success, message in results]
+    finally:
+        invalidate_users([username])
+
+    return results
+
+
+@metrics.instrument()
+def delete_tasks(task_ids: Iterable[str], username: str) -> List[Tuple[str, bool, str]]:
+    """
+    Delete many tasks owned by a user in a single write, without confirmation.
+
+    Args:
+        task_ids (Iterable[str]): The unique identifiers of the tasks to delete
+        username (str): Username of the task owner
+
+    Returns:
+        List[Tuple[str, bool, str]]: One (task_id, success, message) entry per ID
+
+    Note:
+        All deletions are applied with one backend write (for the flat-file backend,
+        one journal append and one fsync).
+    """
+    backend = get_backend()
+    results = []
+    records = []
+    seen = set()
+    for task_id in task_ids:
+        if task_id in seen:
+            results.append((task_id, False, "Duplicate task ID in batch."))
+        elif backend.get_task(task_id, username) is None:
+            results.append((task_id, False, "Task not found or you don't have permission to delete it."))
+        else:
+            records.append((task_id, username))
+            results.append((task_id, True, "Task deleted successfully"))
+        seen.add(task_id)
+
+    if not records:
+        return results
+
+    try:
+        backend.delete_tasks(records)
+    except Exception as e:
+        return [(task_id, False, f"Error deleting task: {e}") if success else (task_id, success, message)
+                for task_id, success, message in results]
+    finally:
+        invalidate_users([username])
+
+    return results
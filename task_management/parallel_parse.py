@@ -0,0 +1,182 @@
+"""
+Task Management System - Parallel Parse Module
+
+This module parses large tasks files on several cores. The file is cut into byte
+ranges that end on line boundaries, each range is parsed in a worker process, and the
+results are merged back in file order, so the tasks, their row numbers and any
+malformed-line warnings come out exactly as a single-threaded parse would produce them.
+
+Workers do the expensive per-line work (splitting, validation and task ID packing)
+and send back plain tuples; the parent only builds the Task records and indexes them.
+
+The number of workers is controlled by the TASK_MANAGER_PARSE_WORKERS environment
+variable:
+    auto (default)  one worker per core, for files of at least PARALLEL_MIN_BYTES
+    0 or 1          always parse in the calling process
+    N               always use N workers, whatever the file size
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Tuple, Union
+
+from storage.diagnostics import warn
+from utils import get_env_int
+
+from .task import Task, pack_task_id
+
+
+PARSE_WORKERS_ENV_VAR = "TASK_MANAGER_PARSE_WORKERS"
+
+# Smallest file parsed in parallel in "auto" mode; below this, starting the
+# worker processes costs more than it saves
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+# Ranges handed out per worker, so that a slow range does not hold up the others
+RANGES_PER_WORKER = 4
+
+# Smallest byte range worth sending to a worker
+MIN_RANGE_BYTES = 1024 * 1024
+
+# (line number within the range, packed task ID, username, title, status)
+ParsedRow = Tuple[int, Union[bytes, str], str, str, str]
+
+# (line number within the range, warning template, value for its {line} placeholder)
+RangeWarning = Tuple[int, str, str]
+
+
+def parse_workers(file_size: int) -> int:
+    """
+    Decide how many worker processes should parse a tasks file.
+
+    Args:
+        file_size (int): Size of the tasks file in bytes
+
+    Returns:
+        int: Number of workers; 1 means parse in the calling process
+    """
+    setting = os.environ.get(PARSE_WORKERS_ENV_VAR, "auto").strip().lower()
+    if setting == "auto":
+        if file_size < PARALLEL_MIN_BYTES:
+            return 1
+        return os.cpu_count() or 1
+    # 0 and 1 both mean parsing in the calling process
+    return max(1, get_env_int(PARSE_WORKERS_ENV_VAR, 1, minimum=0))
+
+
+def split_ranges(path: str, file_size: int, count: int) -> List[Tuple[int, int]]:
+    """
+    Cut a file into at most count byte ranges that each end just after a newline.
+
+    Args:
+        path (str): Path of the file
+        file_size (int): Size of the file in bytes
+        count (int): Desired number of ranges
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) offsets covering the whole file, in order
+    """
+    boundaries = [0]
+    with open(path, "rb") as file:
+        for index in range(1, count):
+            target = file_size * index // count
+            if target <= boundaries[-1]:
+                continue
+            file.seek(target - 1)
+            # Finish the line containing the target, so the range ends on a line boundary
+            file.readline()
+            position = min(file.tell(), file_size)
+            if boundaries[-1] < position < file_size:
+                boundaries.append(position)
+    boundaries.append(file_size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def parse_range(path: str, inode: int, start: int, end: int) -> Tuple[List[ParsedRow], List[RangeWarning], int]:
+    """
+    Parse the lines in one byte range of a tasks file (runs in a worker process).
+
+    Args:
+        path (str): Path of the tasks file
+        inode (int): Inode the caller split; guards against the file being replaced
+        start (int): Offset of the first byte of the range
+        end (int): Offset just past the last byte of the range
+
+    Returns:
+        Tuple[List[ParsedRow], List[RangeWarning], int]: The valid rows, the warnings
+        for invalid ones, and the number of lines in the range
+
+    Raises:
+        IOError: If the file at path is no longer the one that was split
+    """
+    # Imported here: the task store imports this module
+    from .task_store import check_task_line
+
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_ino != inode:
+            raise IOError(f"{path} was replaced while it was being parsed")
+        file.seek(start)
+        data = file.read(end - start)
+
+    rows: List[ParsedRow] = []
+    warnings: List[RangeWarning] = []
+    line_number = 0
+    # Same newline handling as iterating over the file in text mode
+    for line_number, line in enumerate(io.TextIOWrapper(io.BytesIO(data), encoding="utf-8"), start=1):
+        try:
+            fields, warning = check_task_line(line)
+            if warning is not None:
+                warnings.append((line_number, warning, line.strip()))
+                continue
+            if fields is None:
+                continue
+            task_id, username, title, status = fields
+            rows.append((line_number, pack_task_id(task_id), username, title, status))
+        except Exception as e:
+            warnings.append((line_number, "Warning: Error parsing line {line_number}: {line}", str(e)))
+    return rows, warnings, line_number
+
+
+def parse_parallel(path: str, inode: int, file_size: int, workers: int,
+                   receive: Callable[[int, Task], None]) -> int:
+    """
+    Parse a tasks file in worker processes.
+
+    Must be called while holding at least a shared lock on the tasks file, so it cannot
+    change while the workers read it.
+
+    Args:
+        path (str): Path of the tasks file
+        inode (int): Inode of the tasks file, as seen by the caller
+        file_size (int): Size of the tasks file in bytes
+        workers (int): Number of worker processes
+        receive (Callable[[int, Task], None]): Called with (line number, task) for
+            every valid line, in file order
+
+    Returns:
+        int: Number of lines in the file
+
+    Note:
+        - Warnings for malformed lines are reported in file order with their real line
+          numbers, exactly as the single-process parser reports them
+        - Workers are started with the "spawn" method, which is safe in processes that
+          also run threads (such as the API server)
+    """
+    count = max(1, min(workers * RANGES_PER_WORKER, file_size // MIN_RANGE_BYTES))
+    ranges = split_ranges(path, file_size, count)
+    line_offset = 0
+    with ProcessPoolExecutor(min(workers, len(ranges)), mp_context=multiprocessing.get_context("spawn")) as executor:
+        results = executor.map(parse_range, *zip(*((path, inode, start, end) for start, end in ranges)))
+        for rows, warnings, line_count in results:
+            for warning_line, template, line in warnings:
+                warn(template, line_number=line_offset + warning_line, line=line)
+            for row_line, packed_id, username, title, status in rows:
+                receive(line_offset + row_line, Task.from_packed(packed_id, username, title, status))
+            line_offset += line_count
+    return line_offset
@@ -0,0 +1,189 @@
+"""
+Task Management System - Query Cache Module
+
+This module caches the results of the per-user task views ("View All Tasks", "View
+Tasks by Status" and paged listings), which users tend to open again and again between
+rare writes. Entries are keyed by (username, status, page), kept in LRU order under a
+size bound, and expire after a TTL.
+
+Writes made through save_task(s), update_task_status(es) and delete_task(s) invalidate
+exactly the views of the affected users (plus the all-users views), so a process always
+sees its own writes immediately. Each entry is also stamped with the storage backend's
+data version (StorageBackend.data_version: a few stat() results describing the data
+files) taken before the query ran, and is only served while that version is unchanged,
+so writes made by other processes sharing the same files are seen immediately too.
+Backends that cannot describe their version are not cached.
+
+Settings (environment variables):
+    TASK_MANAGER_QUERY_CACHE_SIZE   Most cached views; 0 disables the cache (default 1024)
+    TASK_MANAGER_QUERY_CACHE_TTL    Seconds a cached view may be served (default 5)
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+# Add parent directory to path for utils import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import get_env_int
+
+
+QUERY_CACHE_SIZE_ENV_VAR = "TASK_MANAGER_QUERY_CACHE_SIZE"
+QUERY_CACHE_TTL_ENV_VAR = "TASK_MANAGER_QUERY_CACHE_TTL"
+
+DEFAULT_QUERY_CACHE_SIZE = 1024
+DEFAULT_QUERY_CACHE_TTL = 5
+
+# (username, status, page): username None means all users, status None means every
+# status, page None means the whole list, otherwise (cursor, limit)
+QueryKey = Tuple[Optional[str], Optional[str], Optional[Hashable]]
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of task query results with a TTL and per-user invalidation.
+
+    Attributes:
+        max_entries (int): Most entries kept; the least recently used are evicted
+        ttl (float): Seconds an entry may be served after it was stored
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_QUERY_CACHE_SIZE, ttl: float = DEFAULT_QUERY_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (expiry on the monotonic clock, data version, value), least recently used first
+        self._entries: "OrderedDict[QueryKey, Tuple[float, Hashable, Any]]" = OrderedDict()
+        self._keys_by_user: Dict[Optional[str], Set[QueryKey]] = {}
+        # Bumped by every invalidation, so results computed across a write are not stored
+        self._generation = 0
+        self._stats = dict.fromkeys(("hits", "misses", "evictions", "expirations", "stale", "invalidations"), 0)
+        self._lock = threading.Lock()
+
+    def _remove(self, key: QueryKey) -> None:
+        # Callers hold _lock
+        del self._entries[key]
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+
+    def get_or_compute(self, key: QueryKey, compute: Callable[[], Any], version: Optional[Hashable]) -> Any:
+        """
+        Return the cached result for a query, computing and storing it on a miss.
+
+        Args:
+            key (QueryKey): The query's (username, status, page) key
+            compute (Callable[[], Any]): Runs the query against the storage backend
+            version (Optional[Hashable]): The backend's current data version for the
+                query's user (see StorageBackend.data_version); None bypasses the cache
+
+        Returns:
+            Any: The query result (shared with the cache, so callers must not modify it)
+        """
+        if self.max_entries <= 0 or version is None:
+            return compute()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic() and entry[1] == version:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry[2]
+                self._remove(key)
+                self._stats["expirations" if entry[1] == version else "stale"] += 1
+            self._stats["misses"] += 1
+            generation = self._generation
+
+        value = compute()
+
+        with self._lock:
+            if generation != self._generation:
+                # A write happened while the query ran; its result may predate it
+                return value
+            # Stamped with the version read before the query, so a write by another
+            # process while it ran makes the entry stale rather than wrong
+            self._entries[key] = (time.monotonic() + self.ttl, version, value)
+            self._entries.move_to_end(key)
+            self._keys_by_user.setdefault(key[0], set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+        return value
+
+    def invalidate_users(self, usernames: Iterable[str]) -> None:
+        """
+        Drop the cached views of users whose tasks changed.
+
+        Args:
+            usernames (Iterable[str]): Owners of the tasks that were written
+
+        Note:
+            Views across all users (username None) are dropped as well, since they
+            include every user's tasks.
+        """
+        with self._lock:
+            self._generation += 1
+            for username in set(usernames) | {None}:
+                for key in list(self._keys_by_user.get(username, ())):
+                    self._remove(key)
+                    self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        """Drop every cached view."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the cache's counters.
+
+        Returns:
+            Dict[str, int]: "hits", "misses", "evictions" (LRU), "expirations" (TTL),
+            "stale" (changed by another process), "invalidations" (writes) and the
+            current number of "entries"
+        """
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+
+_query_cache: Optional[QueryCache] = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryCache:
+    """Return the process-wide query cache, configured from the environment on first use."""
+    global _query_cache
+    if _query_cache is None:
+        with _query_cache_lock:
+            if _query_cache is None:
+                _query_cache = QueryCache(
+                    get_env_int(QUERY_CACHE_SIZE_ENV_VAR, DEFAULT_QUERY_CACHE_SIZE, minimum=0),
+                    get_env_int(QUERY_CACHE_TTL_ENV_VAR, DEFAULT_QUERY_CACHE_TTL))
+    return _query_cache
+
+
+def set_query_cache(cache: QueryCache) -> None:
+    """Replace the process-wide query cache (e.g. to resize it or to start empty)."""
+    global _query_cache
+    with _query_cache_lock:
+        _query_cache = cache
+
+
+def invalidate_users(usernames: Iterable[str]) -> None:
+    """Drop the cached views of the given users; called after every task write."""
+    get_query_cache().invalidate_users(usernames)
+
+
+def query_cache_stats() -> Dict[str, int]:
+    """Return the process-wide query cache's counters (see QueryCache.stats)."""
+    return get_query_cache().stats()
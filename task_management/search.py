@@ -0,0 +1,272 @@
+"""
+Task Management System - Search Module
+
+This module provides keyword search over task titles. Titles are split into lowercase
+word tokens and kept in a per-user inverted index (token -> task rows), with a sorted
+vocabulary per user so that prefix terms resolve with a binary search. A query's terms
+are ANDed together, so a search touches only the posting lists of its terms instead of
+scanning every title.
+
+The index follows the tasks file the same way the in-memory stores do: lines appended
+to the tasks file are indexed as they appear, deletions are read from the task journal,
+and only a rewritten file (e.g. after compaction) triggers a full rebuild.
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import io
+import os
+import re
+import sys
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+# Add parent directory to path for storage import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.locking import file_lock
+import metrics
+
+from .journal import journal_path_for, read_journal
+from .operations import INVALID, find_tasks
+from .task import Task
+
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens.
+
+    Args:
+        text (str): Title or query text
+
+    Returns:
+        List[str]: The word tokens, in order (punctuation and '*' are dropped)
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_query(query: str) -> List[Tuple[str, bool]]:
+    """
+    Split a search query into (token, is_prefix) terms.
+
+    A term ending in '*' matches any token starting with it; other terms must match
+    a whole token.
+
+    Args:
+        query (str): Search query such as "buy milk*"
+
+    Returns:
+        List[Tuple[str, bool]]: The query terms
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        for token in tokenize(word):
+            terms.append((token, False))
+        if prefix and terms:
+            terms[-1] = (terms[-1][0], True)
+    return terms
+
+
+def matches_query(title: str, terms: List[Tuple[str, bool]]) -> bool:
+    """Check whether a title contains every query term (used by scanning fallbacks)."""
+    tokens = set(tokenize(title))
+    return all(
+        any(token.startswith(term) for token in tokens) if prefix else term in tokens
+        for term, prefix in terms
+    )
+
+
+class SearchIndex:
+    """
+    Per-user inverted index over the titles in a tasks file.
+
+    Attributes:
+        path (str): Path of the tasks file being indexed
+        journal_path (str): Path of its journal
+    """
+
+    def __init__(self, path: str = "tasks.txt"):
+        self.path = path
+        self.journal_path = journal_path_for(path)
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, inode: Optional[int]) -> None:
+        self._inode = inode
+        self._offset = 0
+        self._line_number = 0
+        # The last line read had no newline, so it may still grow
+        self._partial = False
+        self._journal_inode: Optional[int] = None
+        self._journal_offset = 0
+        # username -> token -> rows containing it
+        self._postings: Dict[str, Dict[str, Set[int]]] = {}
+        # username -> sorted tokens, or None when tokens were added since the last sort
+        self._vocabulary: Dict[str, Optional[List[str]]] = {}
+        # row -> (task_id, username), and the reverse, for deletions
+        self._rows: Dict[int, Tuple[str, str]] = {}
+        self._row_of: Dict[Tuple[str, str], int] = {}
+
+    def _add(self, row: int, task_id: str, username: str, title: str) -> None:
+        key = (task_id, username)
+        if key in self._row_of:
+            return  # Keep the first occurrence of an ID, as the task store does
+        self._rows[row] = key
+        self._row_of[key] = row
+        postings = self._postings.setdefault(username, {})
+        for token in set(tokenize(title)):
+            rows = postings.get(token)
+            if rows is None:
+                postings[token] = rows = set()
+                self._vocabulary[username] = None
+            rows.add(row)
+
+    def _remove(self, task_id: str, username: str) -> None:
+        row = self._row_of.pop((task_id, username), None)
+        if row is None:
+            return
+        del self._rows[row]
+        # Emptied posting lists are left in place; they simply match nothing
+        for rows in self._postings.get(username, {}).values():
+            rows.discard(row)
+
+    def _read_lines(self, data: bytes) -> None:
+        """Index a block of lines from the tasks file."""
+        # Same newline handling as iterating over the file in text mode, so rows
+        # are numbered exactly as the task store numbers them
+        for line in io.TextIOWrapper(io.BytesIO(data), encoding="utf-8"):
+            self._line_number += 1
+            parts = line.strip().split("|")
+            if len(parts) == 3:
+                task_id, title, status = parts
+                username = "unknown"
+            elif len(parts) == 4:
+                task_id, username, title, status = parts
+            else:
+                continue  # Reported by the task store; not searchable
+            if task_id and title and status:
+                self._add(self._line_number, task_id, username, title)
+
+    def refresh(self) -> None:
+        """
+        Bring the index up to date with the tasks file and its journal.
+
+        Note:
+            - Appended task lines are tokenized incrementally
+            - New journal deletions are removed from the posting lists; status
+              updates do not affect titles and are skipped
+            - A replaced or truncated tasks file triggers a full rebuild
+            - A last line without a newline is indexed as it stands; if the file
+              grows after it, the index is rebuilt, as the task store does
+        """
+        with file_lock(self.path, exclusive=False):
+            try:
+                file = open(self.path, "rb")
+            except FileNotFoundError:
+                self._reset(None)
+                return
+            with file:
+                stat = os.fstat(file.fileno())
+                if stat.st_ino != self._inode or stat.st_size < self._offset or \
+                        (self._partial and stat.st_size != self._offset):
+                    self._reset(stat.st_ino)
+                if stat.st_size > self._offset:
+                    file.seek(self._offset)
+                    data = file.read(stat.st_size - self._offset)
+                    self._read_lines(data)
+                    self._offset += len(data)
+                    self._partial = not data.endswith(b"\n")
+
+            try:
+                journal_stat = os.stat(self.journal_path)
+            except FileNotFoundError:
+                self._journal_inode = None
+                self._journal_offset = 0
+                return
+            if journal_stat.st_ino != self._journal_inode or journal_stat.st_size < self._journal_offset:
+                self._journal_inode = journal_stat.st_ino
+                self._journal_offset = 0
+            records, self._journal_offset = read_journal(self.journal_path, self._journal_offset)
+        for operation, task_id, username, _ in records:
+            if operation == "D":
+                self._remove(task_id, username)
+
+    def _term_rows(self, username: str, term: str, prefix: bool) -> Set[int]:
+        """Return the rows of a user's tasks containing a term."""
+        postings = self._postings.get(username, {})
+        if not prefix:
+            return postings.get(term, set())
+        vocabulary = self._vocabulary.get(username)
+        if vocabulary is None:
+            vocabulary = self._vocabulary[username] = sorted(postings)
+        rows: Set[int] = set()
+        for position in range(bisect_left(vocabulary, term), len(vocabulary)):
+            if not vocabulary[position].startswith(term):
+                break
+            rows |= postings[vocabulary[position]]
+        return rows
+
+    def search(self, username: Optional[str], query: str, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """
+        Find the tasks whose titles contain every term of a query.
+
+        Args:
+            username (Optional[str]): Only search this user's tasks (None for all users)
+            query (str): Space-separated terms; a trailing '*' makes a term a prefix
+            limit (Optional[int]): Return at most this many matches
+
+        Returns:
+            List[Tuple[str, str]]: (task_id, username) of the matching tasks, in file order
+        """
+        terms = parse_query(query)
+        if not terms:
+            return []
+        with self._lock:
+            self.refresh()
+            usernames = [username] if username is not None else list(self._postings)
+            matches: List[int] = []
+            for owner in usernames:
+                rows: Optional[Set[int]] = None
+                # Intersect the smallest posting lists first
+                for term_rows in sorted((self._term_rows(owner, term, prefix) for term, prefix in terms), key=len):
+                    rows = set(term_rows) if rows is None else rows & term_rows
+                    if not rows:
+                        break
+                matches.extend(rows or ())
+            matches.sort()
+            if limit is not None:
+                matches = matches[:limit]
+            return [self._rows[row] for row in matches]
+
+
+@metrics.instrument()
+def search_tasks(username: str, query: str, limit: Optional[int] = None) -> List[Task]:
+    """
+    Search a user's tasks by keywords in their titles.
+
+    Args:
+        username (str): Username whose tasks to search (None searches every user)
+        query (str): Space-separated keywords, all of which must appear in the title
+            (case-insensitive); end a keyword with '*' to match it as a prefix,
+            e.g. "home*" finds "homework"
+        limit (Optional[int]): Return at most this many tasks
+
+    Returns:
+        List[Task]: Matching tasks in insertion order
+
+    Note:
+        Prints errors; operations.find_tasks is the print-free equivalent. The
+        flat-file backend answers from an inverted index that is kept up to date
+        incrementally; other backends fall back to scanning the user's tasks.
+    """
+    result = find_tasks(username, query, limit)
+    if not result.success:
+        print(f"Error: {result.message}" if result.error == INVALID else result.message)
+        return []
+    return result.value
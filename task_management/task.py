@@ -0,0 +1,160 @@
+"""
+Task Management System - Task Record Module
+
+This module provides the compact Task record used to hold tasks in memory. Tasks are
+stored in __slots__ objects rather than per-row dictionaries: usernames and statuses
+are interned so repeated values share one string, and canonical UUID task IDs are
+held as 16 raw bytes instead of a 36-character string.
+
+Task records stay compatible with dictionary-style access (task["status"],
+task.get("title"), dict(task)) so existing display and update code keeps working.
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import sys
+import uuid
+from typing import Dict, Iterator, Tuple, Union
+
+
+# Keys exposed through dictionary-style access, in display order
+TASK_FIELDS = ("id", "username", "title", "status")
+
+
+def pack_task_id(task_id: str) -> Union[bytes, str]:
+    """
+    Convert a task ID to its compact in-memory form.
+
+    Args:
+        task_id (str): Task ID as stored in the tasks file
+
+    Returns:
+        Union[bytes, str]: 16 raw bytes for canonical UUID strings, otherwise the
+        original string (for legacy or hand-written IDs)
+
+    Note:
+        Only IDs that round-trip exactly through uuid.UUID are packed, so the
+        string returned by unpack_task_id always matches the file.
+    """
+    if len(task_id) == 36:
+        try:
+            parsed = uuid.UUID(task_id)
+        except ValueError:
+            return task_id
+        if str(parsed) == task_id:
+            return parsed.bytes
+    return task_id
+
+
+def unpack_task_id(packed_id: Union[bytes, str]) -> str:
+    """Convert a task ID from its compact in-memory form back to a string."""
+    if isinstance(packed_id, bytes):
+        return str(uuid.UUID(bytes=packed_id))
+    return packed_id
+
+
+class Task:
+    """
+    Immutable, memory-compact record for a single task.
+
+    Attributes:
+        id (str): Unique task identifier
+        username (str): Username of the task owner (interned)
+        title (str): Task title/description
+        status (str): Current task status (interned)
+
+    Note:
+        - Supports task["id"]-style reads, get(), keys(), items() and dict(task)
+        - Records are shared between callers, so they are read-only; use
+          with_status() to derive an updated copy
+    """
+
+    __slots__ = ("_id", "username", "title", "status")
+
+    def __init__(self, task_id: str, username: str, title: str, status: str):
+        object.__setattr__(self, "_id", pack_task_id(task_id))
+        object.__setattr__(self, "username", sys.intern(username))
+        object.__setattr__(self, "title", title)
+        object.__setattr__(self, "status", sys.intern(status))
+
+    @classmethod
+    def from_packed(cls, packed_id: Union[bytes, str], username: str, title: str, status: str) -> "Task":
+        """Build a task from an ID already in compact form (see pack_task_id)."""
+        task = cls.__new__(cls)
+        object.__setattr__(task, "_id", packed_id)
+        object.__setattr__(task, "username", sys.intern(username))
+        object.__setattr__(task, "title", title)
+        object.__setattr__(task, "status", sys.intern(status))
+        return task
+
+    @property
+    def id(self) -> str:
+        return unpack_task_id(self._id)
+
+    @property
+    def key(self) -> Union[bytes, str]:
+        """The compact ID, suitable as a dictionary key."""
+        return self._id
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Task records are read-only; use with_status() instead")
+
+    def __getitem__(self, field: str) -> str:
+        if field not in TASK_FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __contains__(self, field: object) -> bool:
+        return field in TASK_FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(TASK_FIELDS)
+
+    def __len__(self) -> int:
+        return len(TASK_FIELDS)
+
+    def get(self, field: str, default=None):
+        return getattr(self, field) if field in TASK_FIELDS else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return TASK_FIELDS
+
+    def values(self) -> Tuple[str, str, str, str]:
+        return (self.id, self.username, self.title, self.status)
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        return zip(TASK_FIELDS, self.values())
+
+    def to_dict(self) -> Dict[str, str]:
+        """Return the task as a plain dictionary."""
+        return dict(self.items())
+
+    def to_line(self) -> str:
+        """Return the task in tasks file format: task_id|username|task_title|task_status."""
+        return f"{self.id}|{self.username}|{self.title}|{self.status}\n"
+
+    def with_status(self, status: str) -> "Task":
+        """Return a copy of this task with a different status."""
+        task = Task.__new__(Task)
+        object.__setattr__(task, "_id", self._id)
+        object.__setattr__(task, "username", self.username)
+        object.__setattr__(task, "title", self.title)
+        object.__setattr__(task, "status", sys.intern(status))
+        return task
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Task):
+            return (self._id, self.username, self.title, self.status) == \
+                (other._id, other.username, other.title, other.status)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self._id, self.username, self.title, self.status))
+
+    def __repr__(self) -> str:
+        return (f"Task(id={self.id!r}, username={self.username!r}, "
+                f"title={self.title!r}, status={self.status!r})")
@@ -0,0 +1,486 @@
+"""
+Task Management System - Task Store Module
+
+This module provides an in-memory, indexed view of the tasks file. The file is parsed
+once into compact Task records and kept in hash indexes keyed by task ID, by username
+and by (username, status), so that lookups no longer require re-reading the whole file
+on every query.
+
+The store watches the file's inode, size and modification time and reloads itself
+whenever the file changes on disk. Records appended to the task journal are applied
+on top of the parsed base file incrementally, and lines appended to the base file
+(every new task is an append) are parsed on their own, so a long-running process pays
+for new writes rather than for the size of the file. Large files are parsed on several
+cores (see parallel_parse).
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import io
+import os
+import threading
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from storage.diagnostics import warn
+from storage.locking import file_lock
+import metrics
+
+from .journal import journal_path_for, read_journal
+from .parallel_parse import parse_parallel, parse_workers
+from .task import Task, pack_task_id
+
+
+# Sentinel signature used to force a reload on the next access
+_UNLOADED = object()
+
+# Bytes just before the parsed offset that are compared to detect in-place rewrites
+FINGERPRINT_BYTES = 64
+
+
+# Warnings for lines that cannot be parsed, formatted with line_number and line
+MALFORMED_LINE_WARNING = "Warning: Skipping malformed line {line_number}: {line}"
+EMPTY_FIELDS_WARNING = "Warning: Skipping line {line_number} with empty fields"
+
+
+def check_task_line(line: str) -> Tuple[Optional[Tuple[str, str, str, str]], Optional[str]]:
+    """
+    Split a single line of the tasks file into its raw fields without printing.
+
+    Args:
+        line (str): Raw line read from the tasks file
+
+    Returns:
+        Tuple[Optional[Tuple[str, str, str, str]], Optional[str]]: The fields
+        (task_id, username, task_title, task_status), or None together with the
+        warning template for a malformed line (None for an empty line)
+    """
+    line = line.strip()
+    if not line:
+        return None, None
+
+    parts = line.split("|")
+
+    # Handle both old format (3 parts) and new format (4 parts)
+    if len(parts) == 3:
+        task_id, task_title, task_status = parts
+        task_username = "unknown"  # Default for old format
+    elif len(parts) == 4:
+        task_id, task_username, task_title, task_status = parts
+    else:
+        return None, MALFORMED_LINE_WARNING
+
+    # Validate that all parts are non-empty
+    if not all([task_id, task_title, task_status]):
+        return None, EMPTY_FIELDS_WARNING
+
+    return (task_id, task_username, task_title, task_status), None
+
+
+def split_task_line(line: str, line_number: int) -> Optional[Tuple[str, str, str, str]]:
+    """
+    Split a single line of the tasks file into its raw fields.
+
+    Args:
+        line (str): Raw line read from the tasks file
+        line_number (int): 1-based line number, used for warning messages
+
+    Returns:
+        Optional[Tuple[str, str, str, str]]: (task_id, username, task_title, task_status),
+        or None if the line is empty or malformed
+
+    Note:
+        - Supports the current format: task_id|username|task_title|task_status
+        - Supports the old format: task_id|task_title|task_status (username 'unknown')
+        - Reports a storage warning for malformed lines and lines with empty fields
+    """
+    fields, warning = check_task_line(line)
+    if warning is not None:
+        warn(warning, line_number=line_number, line=line.strip())
+    return fields
+
+
+def parse_task_line(line: str, line_number: int) -> Optional[Task]:
+    """
+    Parse a single line of the tasks file into a Task record.
+
+    Args:
+        line (str): Raw line read from the tasks file
+        line_number (int): 1-based line number, used for warning messages
+
+    Returns:
+        Optional[Task]: Task record, or None if the line is empty or malformed
+    """
+    fields = split_task_line(line, line_number)
+    if fields is None:
+        return None
+    return Task(*fields)
+
+
+class TaskStore:
+    """
+    Indexed in-memory cache of the tasks file and its journal.
+
+    The store keeps every task in file order together with hash indexes by task ID,
+    by username, by status and by (username, status). Lines appended to the base file
+    and records appended to the journal are applied incrementally; the base file is
+    re-parsed only when it was replaced, truncated or rewritten in place (detected by
+    its inode, its size and the bytes just before the last parsed offset). Repeated
+    queries therefore cost O(1) for ID lookups and O(k) for filtered lists.
+
+    Attributes:
+        path (str): Path of the tasks file backing this store
+    """
+
+    def __init__(self, path: str = "tasks.txt"):
+        self.path = path
+        self.journal_path = journal_path_for(path)
+        self._signature = _UNLOADED
+        # How far the base file has been parsed: byte offset, line count, the bytes
+        # just before the offset, and whether the last parsed line lacked a newline
+        self._offset = 0
+        self._line_count = 0
+        self._fingerprint = b""
+        self._partial = False
+        self._journal_inode: Optional[int] = None
+        self._journal_offset = 0
+        # Serializes refreshes against reads when the store is shared by threads
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # Every index maps a row number (file order) to the task, so deletions are O(1)
+        self._tasks: Dict[int, Task] = {}
+        # Keyed by the compact task ID (16 raw bytes for UUIDs)
+        self._by_id: Dict[Union[bytes, str], int] = {}
+        # Later rows repeating an ID (only in hand-edited files), in file order
+        self._duplicates: Dict[Union[bytes, str], List[int]] = {}
+        self._by_user: Dict[str, Dict[int, Task]] = {}
+        self._by_status: Dict[str, Dict[int, Task]] = {}
+        self._by_user_status: Dict[Tuple[str, str], Dict[int, Task]] = {}
+        # Status buckets that received out-of-order rows from journal updates
+        self._unsorted: set = set()
+
+    def _file_signature(self) -> Optional[Tuple[int, int, int]]:
+        """Return the (inode, size, mtime_ns) of the tasks file, or None if it is missing."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def invalidate(self) -> None:
+        """
+        Force the store to reload the file on its next access.
+
+        Note:
+            Writers in this process call this after rewriting the base file, since a
+            rewrite can keep the same size within a single mtime tick.
+        """
+        self._signature = _UNLOADED
+
+    def refresh(self) -> None:
+        """
+        Bring the store up to date with the tasks file and its journal.
+
+        Note:
+            - Costs two stat() calls when nothing has changed
+            - Lines appended to the base file and new journal records are applied
+              without re-reading what was already parsed
+            - A replaced, truncated or rewritten base file, or a journal that was
+              replaced or truncated by compaction, triggers a full reload
+        """
+        signature = self._file_signature()
+        if signature != self._signature and not self._follow(signature):
+            self._load(signature)
+            return
+
+        try:
+            journal_stat = os.stat(self.journal_path)
+        except FileNotFoundError:
+            if self._journal_offset:
+                self._load(signature)
+            return
+
+        if journal_stat.st_ino != self._journal_inode or journal_stat.st_size < self._journal_offset:
+            self._load(signature)
+        elif journal_stat.st_size > self._journal_offset:
+            self._replay_journal()
+
+    def _index(self, row: int, task: Task) -> None:
+        """Add a parsed task to every index."""
+        self._tasks[row] = task
+        # Keep the first occurrence of an ID, matching the old linear search
+        if self._by_id.setdefault(task.key, row) != row:
+            self._duplicates.setdefault(task.key, []).append(row)
+        self._by_user.setdefault(task.username, {})[row] = task
+        self._by_status.setdefault(task.status, {})[row] = task
+        self._by_user_status.setdefault((task.username, task.status), {})[row] = task
+
+    def _unindex_status(self, row: int, task: Task) -> None:
+        """Remove a task from the status-keyed indexes."""
+        del self._by_status[task.status][row]
+        del self._by_user_status[(task.username, task.status)][row]
+
+    @metrics.instrument("task_store.follow")
+    def _follow(self, signature: Optional[Tuple[int, int, int]]) -> bool:
+        """
+        Parse only the lines appended to the base file since it was last read.
+
+        Returns:
+            bool: False if the file was not simply appended to (it is missing, was
+            replaced, truncated or rewritten in place), in which case nothing is
+            changed and the caller must reload it
+        """
+        if signature is None or not isinstance(self._signature, tuple) or self._partial:
+            return False
+        # Growth is required: a same-size change with a new mtime is a rewrite
+        if signature[0] != self._signature[0] or signature[1] <= self._offset:
+            return False
+
+        with file_lock(self.path, exclusive=False):
+            try:
+                with open(self.path, "rb") as file:
+                    stat = os.fstat(file.fileno())
+                    if stat.st_ino != self._signature[0] or stat.st_size <= self._offset:
+                        return False
+                    # An in-place rewrite that happened to grow the file changes
+                    # the bytes before our offset
+                    start = max(0, self._offset - FINGERPRINT_BYTES)
+                    file.seek(start)
+                    if file.read(self._offset - start) != self._fingerprint:
+                        return False
+                    data = file.read(stat.st_size - self._offset)
+            except IOError:
+                return False
+
+        # Same newline handling as iterating over the file in text mode
+        line_number = self._line_count
+        for line_number, line in enumerate(io.TextIOWrapper(io.BytesIO(data), encoding="utf-8"),
+                                           start=self._line_count + 1):
+            try:
+                task = parse_task_line(line, line_number)
+            except Exception as e:
+                warn("Warning: Error parsing line {line_number}: {error}", line_number=line_number, error=e)
+                continue
+            if task is not None:
+                self._index(line_number, task)
+        metrics.count("task_store.follow", "rows_parsed", line_number - self._line_count)
+        metrics.count("task_store.follow", "bytes_read", len(data))
+        self._mark_parsed(stat, line_number, (self._fingerprint + data)[-FINGERPRINT_BYTES:])
+        return True
+
+    def _mark_parsed(self, stat: os.stat_result, line_count: int, tail: bytes) -> None:
+        """Record how far the base file has been parsed."""
+        self._signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        self._offset = stat.st_size
+        self._line_count = line_count
+        self._fingerprint = tail
+        # A last line without a newline may still grow, so it cannot be followed
+        self._partial = not tail.endswith(b"\n") if tail else False
+
+    @metrics.instrument("task_store.load")
+    def _load(self, signature: Optional[Tuple[int, int, int]]) -> None:
+        """Parse the whole tasks file, rebuild the indexes and replay the journal."""
+        self._reset()
+        self._signature = signature
+        self._offset = self._line_count = 0
+        self._fingerprint = b""
+        self._partial = False
+        self._journal_inode = None
+        self._journal_offset = 0
+
+        if signature is None:
+            warn("No tasks file found. Starting with empty task list.")
+            self._replay_journal()
+            return
+
+        # A shared lock keeps compaction from swapping the base file and the
+        # journal between reading one and the other
+        with file_lock(self.path, exclusive=False):
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    # The file may have changed since it was stat'ed; describe what is read
+                    stat = os.fstat(file.fileno())
+                    self._signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+                    line_number = 0
+                    workers = parse_workers(stat.st_size)
+                    if workers > 1:
+                        try:
+                            line_number = parse_parallel(self.path, stat.st_ino, stat.st_size, workers, self._index)
+                        except (OSError, RuntimeError) as e:
+                            # E.g. worker processes cannot be started; fall back to one process
+                            warn("Warning: Parallel parse failed, parsing in one process: {error}", error=e)
+                            self._reset()
+                            workers = 1
+                    if workers == 1:
+                        for line_number, line in enumerate(file, start=1):
+                            try:
+                                task = parse_task_line(line, line_number)
+                            except Exception as e:
+                                warn("Warning: Error parsing line {line_number}: {error}", line_number=line_number, error=e)
+                                continue
+                            if task is not None:
+                                self._index(line_number, task)
+                    metrics.count("task_store.load", "rows_parsed", line_number)
+                    metrics.count("task_store.load", "bytes_read", stat.st_size)
+                    self._mark_parsed(stat, line_number,
+                                      os.pread(file.fileno(), FINGERPRINT_BYTES,
+                                               max(0, stat.st_size - FINGERPRINT_BYTES)))
+            except IOError as e:
+                warn("IO Error reading tasks file: {error}", error=e)
+                # Leave the store unloaded so the next access retries the read
+                self._signature = _UNLOADED
+                return
+
+            self._replay_journal()
+
+    @metrics.instrument("journal.replay")
+    def _replay_journal(self) -> None:
+        """Apply journal records appended since the last replay."""
+        try:
+            self._journal_inode = os.stat(self.journal_path).st_ino
+        except FileNotFoundError:
+            self._journal_inode = None
+            self._journal_offset = 0
+            return
+
+        offset = self._journal_offset
+        records, self._journal_offset = read_journal(self.journal_path, offset)
+        metrics.count("journal.replay", "rows_parsed", len(records))
+        metrics.count("journal.replay", "bytes_read", self._journal_offset - offset)
+        # A record applies to every row with its (task_id, username), as compaction
+        # and iter_tasks apply it
+        for operation, task_id, username, new_status in records:
+            for row in self._find_rows(task_id, username):
+                task = self._tasks[row]
+                self._unindex_status(row, task)
+                if operation == "D":
+                    del self._tasks[row]
+                    del self._by_user[username][row]
+                    self._unindex_id(row, task.key)
+                    continue
+                # The updated record takes the old row, so file order is kept in the
+                # ID and user indexes; the new status buckets are re-sorted lazily
+                task = task.with_status(new_status)
+                self._tasks[row] = task
+                self._by_user[username][row] = task
+                self._by_status.setdefault(task.status, {})[row] = task
+                self._by_user_status.setdefault((username, task.status), {})[row] = task
+                self._unsorted.add(task.status)
+                self._unsorted.add((username, task.status))
+
+    def _unindex_id(self, row: int, key: Union[bytes, str]) -> None:
+        """Remove a deleted row from the ID index, promoting the next row with its ID."""
+        duplicates = self._duplicates.get(key)
+        if self._by_id.get(key) == row:
+            if duplicates:
+                self._by_id[key] = duplicates.pop(0)
+            else:
+                del self._by_id[key]
+        elif duplicates and row in duplicates:
+            duplicates.remove(row)
+        if duplicates is not None and not duplicates:
+            del self._duplicates[key]
+
+    def _find_rows(self, task_id: str, username: Optional[str]) -> List[int]:
+        """Return the rows of a task by ID in file order, optionally restricted to one owner."""
+        key = pack_task_id(task_id)
+        row = self._by_id.get(key)
+        if row is None:
+            return []
+        # An ID repeated within or across users is possible in hand-edited files
+        rows = [row] + self._duplicates.get(key, [])
+        if username is None:
+            return rows
+        return [row for row in rows if self._tasks[row].username == username]
+
+    def _find_row(self, task_id: str, username: Optional[str]) -> Optional[int]:
+        """Return the first row of a task by ID, optionally restricted to one owner."""
+        key = pack_task_id(task_id)
+        row = self._by_id.get(key)
+        if row is None:
+            return None
+        if key in self._duplicates:
+            rows = self._find_rows(task_id, username)
+            return rows[0] if rows else None
+        return row if username is None or self._tasks[row].username == username else None
+
+    def _bucket(self, index: Dict, key) -> List[Task]:
+        """Return a status bucket in file order, re-sorting it if journal updates disturbed it."""
+        bucket = index.get(key)
+        if not bucket:
+            return []
+        if key in self._unsorted:
+            index[key] = bucket = dict(sorted(bucket.items()))
+            self._unsorted.discard(key)
+        return list(bucket.values())
+
+    def all(self) -> List[Task]:
+        """Return every task in file order."""
+        with self._lock:
+            self.refresh()
+            return list(self._tasks.values())
+
+    def for_user(self, username: str) -> List[Task]:
+        """Return the tasks owned by a user, in file order."""
+        with self._lock:
+            self.refresh()
+            return list(self._by_user.get(username, {}).values())
+
+    def recent(self, username: Optional[str] = None, limit: int = 5) -> List[Task]:
+        """Return the last limit tasks in file order, optionally restricted to one owner."""
+        with self._lock:
+            self.refresh()
+            rows = self._tasks if username is None else self._by_user.get(username, {})
+            # Dicts keep file order, so the newest rows are read from the end
+            tasks = list(islice(reversed(rows.values()), limit))
+        tasks.reverse()
+        return tasks
+
+    def by_id(self, task_id: str, username: Optional[str] = None) -> Optional[Task]:
+        """
+        Return the task with the given ID, optionally restricted to one owner.
+
+        Args:
+            task_id (str): The task ID to look up
+            username (Optional[str]): If provided, the task must belong to this user
+
+        Returns:
+            Optional[Task]: The matching task, or None
+        """
+        with self._lock:
+            self.refresh()
+            row = self._find_row(task_id, username)
+            return self._tasks[row] if row is not None else None
+
+    def statuses(self, keys: Iterable[Tuple[str, str]]) -> Tuple[tuple, Dict[Tuple[str, str], Optional[str]]]:
+        """
+        Look up the current status of several tasks in one consistent view.
+
+        Args:
+            keys (Iterable[Tuple[str, str]]): (task_id, username) pairs
+
+        Returns:
+            Tuple[tuple, Dict[Tuple[str, str], Optional[str]]]: The (inode, size, mtime_ns,
+            journal inode, journal offset) of the file state the answer reflects, and
+            each key's status (None for missing tasks)
+        """
+        with self._lock:
+            self.refresh()
+            signature = self._signature if isinstance(self._signature, tuple) else (None, None, None)
+            statuses = {}
+            for task_id, username in keys:
+                row = self._find_row(task_id, username)
+                statuses[(task_id, username)] = self._tasks[row].status if row is not None else None
+            return tuple(signature) + (self._journal_inode, self._journal_offset), statuses
+
+    def by_status(self, status: str, username: Optional[str] = None) -> List[Task]:
+        """Return the tasks with a given status in file order, optionally restricted to one owner."""
+        with self._lock:
+            self.refresh()
+            if username is None:
+                return self._bucket(self._by_status, status)
+            return self._bucket(self._by_user_status, (username, status))
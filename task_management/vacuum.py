@@ -0,0 +1,288 @@
+"""
+Task Management System - Vacuum Module
+
+This module cleans up a tasks file in a single streaming pass, so that every later
+load stops paying for rows it can only skip. It:
+
+- folds the task journal into the file first (see journal.compact_journal)
+- rewrites old-format rows (task_id|title|status) in the current four-field format,
+  keeping their 'unknown' owner
+- removes malformed lines and rows whose owner is no longer in users.txt, copying
+  them to a quarantine file (tasks.txt.quarantine) so nothing is lost
+- drops blank lines
+- optionally orders the rows by username (a stable sort, so each user's tasks keep
+  their order), which keeps one user's rows close together on disk
+
+The cleaned file is written next to the original and atomically swapped in under the
+exclusive tasks-file lock, so concurrent readers see either the old or the new file.
+Sorting large files is done with an external merge sort in bounded memory.
+
+For sharded storage, run it once per shard file.
+
+Usage:
+    python -m task_management.vacuum [--tasks tasks.txt] [--users users.txt] [--sort]
+        [--keep-orphans] [--no-quarantine] [--dry-run] [--interval SECONDS]
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import argparse
+import heapq
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import IO, Iterator, List, Optional, Set
+
+from storage.diagnostics import warn
+from storage.locking import atomic_replace, file_lock
+import metrics
+
+from .journal import compact_journal
+from .query_cache import get_query_cache
+from .task_store import check_task_line
+
+
+# Owner given to old-format rows; never treated as a missing user
+LEGACY_USERNAME = "unknown"
+
+# Rows sorted in memory at a time when ordering by username; larger files are
+# sorted in runs that are merged from temporary files
+SORT_RUN_ROWS = 500_000
+
+
+def quarantine_path_for(tasks_path: str) -> str:
+    """
+    Return the quarantine file path belonging to a tasks file.
+
+    Args:
+        tasks_path (str): Path of the tasks file
+
+    Returns:
+        str: The tasks path with a '.quarantine' suffix
+    """
+    return tasks_path + ".quarantine"
+
+
+@dataclass
+class VacuumReport:
+    """
+    What a vacuum pass found and did.
+
+    Attributes:
+        rows_kept (int): Rows written to the cleaned file
+        legacy_normalized (int): Old-format rows rewritten in the four-field format
+        malformed (int): Lines that could not be parsed
+        orphaned (int): Rows whose owner is not in the users file
+        blank_lines (int): Empty lines dropped
+        bytes_before (int): Size of the tasks file before the pass
+        bytes_after (int): Size of the cleaned file
+        quarantine_path (Optional[str]): File the removed rows were appended to, if any
+    """
+    rows_kept: int = 0
+    legacy_normalized: int = 0
+    malformed: int = 0
+    orphaned: int = 0
+    blank_lines: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    quarantine_path: Optional[str] = None
+
+
+def read_usernames(users_path: str) -> Optional[Set[str]]:
+    """
+    Read every registered username.
+
+    Args:
+        users_path (str): Path of the users file
+
+    Returns:
+        Optional[Set[str]]: The usernames, or None if the users file does not exist
+    """
+    try:
+        with open(users_path, "r", encoding="utf-8") as file:
+            return {line.split(":", 1)[0] for line in file if ":" in line}
+    except FileNotFoundError:
+        return None
+
+
+def _username_of(line: str) -> str:
+    return line.split("|", 2)[1]
+
+
+class _RunSorter:
+    """Stable external sort of normalized task lines by username."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._rows: List[str] = []
+        self._runs: List[IO] = []
+
+    def add(self, line: str) -> None:
+        self._rows.append(line)
+        if len(self._rows) >= SORT_RUN_ROWS:
+            self._spill()
+
+    def _spill(self) -> None:
+        run = tempfile.TemporaryFile("w+", encoding="utf-8", dir=self.directory)
+        # list.sort is stable, so rows of one user keep their file order
+        self._rows.sort(key=_username_of)
+        run.writelines(self._rows)
+        run.seek(0)
+        self._runs.append(run)
+        self._rows = []
+
+    def sorted_lines(self) -> Iterator[str]:
+        self._rows.sort(key=_username_of)
+        # heapq.merge takes equal keys from earlier runs first, which keeps the sort stable
+        return heapq.merge(*self._runs, self._rows, key=_username_of)
+
+    def close(self) -> None:
+        for run in self._runs:
+            run.close()
+
+
+def _quarantine(report: VacuumReport, quarantine_file: Optional[IO], line: str) -> Optional[IO]:
+    """Append a removed line to the quarantine file (opened on first use), if quarantining."""
+    if report.quarantine_path is None:
+        return None
+    if quarantine_file is None:
+        quarantine_file = open(report.quarantine_path, "a", encoding="utf-8")
+    quarantine_file.write(line if line.endswith("\n") else line + "\n")
+    return quarantine_file
+
+
+@metrics.instrument("tasks.vacuum")
+def vacuum_tasks(tasks_path: str = "tasks.txt", users_path: str = "users.txt", drop_orphans: bool = True,
+                 quarantine: bool = True, sort_by_user: bool = False, dry_run: bool = False) -> Optional[VacuumReport]:
+    """
+    Clean up a tasks file in one streaming pass and atomically swap in the result.
+
+    Args:
+        tasks_path (str): Path of the tasks file
+        users_path (str): Path of the users file, used to find orphaned rows
+        drop_orphans (bool): Remove rows whose owner is not in the users file
+        quarantine (bool): Append removed rows to the quarantine file instead of
+            discarding them
+        sort_by_user (bool): Order the rows by username
+        dry_run (bool): Only report what would change; nothing is written
+
+    Returns:
+        Optional[VacuumReport]: What was found, or None if the file could not be cleaned
+
+    Note:
+        - If the users file does not exist, no row is treated as orphaned
+        - Blank lines are always dropped; they are not quarantined
+        - Rows keep their task ID and owner, so journal records written while the
+          pass ran still apply to them
+    """
+    if not os.path.exists(tasks_path):
+        warn("Error: Tasks file {path} does not exist", path=tasks_path)
+        return None
+    if not dry_run and not compact_journal(tasks_path):
+        return None
+
+    known_users = read_usernames(users_path) if drop_orphans else None
+    if drop_orphans and known_users is None:
+        warn("Warning: {path} not found; keeping rows of every user", path=users_path)
+
+    report = VacuumReport()
+    if quarantine and not dry_run:
+        report.quarantine_path = quarantine_path_for(tasks_path)
+    quarantine_file: Optional[IO] = None
+    directory = os.path.dirname(os.path.abspath(tasks_path))
+    sorter = _RunSorter(directory) if sort_by_user else None
+
+    try:
+        with file_lock(tasks_path, exclusive=not dry_run):
+            report.bytes_before = os.path.getsize(tasks_path)
+            target_context = open(os.devnull, "w", encoding="utf-8") if dry_run else atomic_replace(tasks_path)
+            with open(tasks_path, "r", encoding="utf-8") as source, target_context as target:
+                for line in source:
+                    fields, warning = check_task_line(line)
+                    if fields is None:
+                        if warning is None:
+                            report.blank_lines += 1
+                        else:
+                            report.malformed += 1
+                            quarantine_file = _quarantine(report, quarantine_file, line)
+                        continue
+                    task_id, username, title, status = fields
+                    if known_users is not None and username != LEGACY_USERNAME and username not in known_users:
+                        report.orphaned += 1
+                        quarantine_file = _quarantine(report, quarantine_file, line)
+                        continue
+                    if line.count("|") == 2:
+                        report.legacy_normalized += 1
+                    row = f"{task_id}|{username}|{title}|{status}\n"
+                    report.rows_kept += 1
+                    report.bytes_after += len(row.encode("utf-8"))
+                    if sorter is None:
+                        target.write(row)
+                    else:
+                        sorter.add(row)
+
+                if sorter is not None:
+                    target.writelines(sorter.sorted_lines())
+
+                if quarantine_file is not None:
+                    # Removed rows reach the disk before the cleaned file replaces the old one
+                    quarantine_file.flush()
+                    os.fsync(quarantine_file.fileno())
+    except Exception as e:
+        warn("Error vacuuming tasks file: {error}", error=e)
+        return None
+    finally:
+        if sorter is not None:
+            sorter.close()
+        if quarantine_file is not None:
+            quarantine_file.close()
+
+    if not dry_run:
+        # Cached query results may include rows that were just removed
+        get_query_cache().clear()
+    return report
+
+
+def format_report(report: VacuumReport, dry_run: bool = False) -> str:
+    """Describe a vacuum report in one line."""
+    verb = "Would keep" if dry_run else "Kept"
+    text = (f"{verb} {report.rows_kept} rows ({report.bytes_before} -> {report.bytes_after} bytes): "
+            f"{report.legacy_normalized} normalized, {report.malformed} malformed, "
+            f"{report.orphaned} orphaned, {report.blank_lines} blank")
+    if report.quarantine_path and (report.malformed or report.orphaned):
+        text += f"; removed rows appended to {report.quarantine_path}"
+    return text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Clean up and compact a tasks file.")
+    parser.add_argument("--tasks", default="tasks.txt", help="Path of the tasks file")
+    parser.add_argument("--users", default="users.txt", help="Path of the users file")
+    parser.add_argument("--sort", action="store_true", help="Order rows by username")
+    parser.add_argument("--keep-orphans", action="store_true", help="Keep rows of users missing from the users file")
+    parser.add_argument("--no-quarantine", action="store_true", help="Discard removed rows instead of quarantining them")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument("--interval", type=float, default=None,
+                        help="Keep running in the background, vacuuming every INTERVAL seconds")
+    args = parser.parse_args()
+
+    while True:
+        report = vacuum_tasks(args.tasks, args.users, drop_orphans=not args.keep_orphans,
+                              quarantine=not args.no_quarantine, sort_by_user=args.sort, dry_run=args.dry_run)
+        if report is None and args.interval is None:
+            raise SystemExit(1)
+        if report is not None:
+            print(format_report(report, args.dry_run))
+        if args.interval is None:
+            return
+        try:
+            time.sleep(args.interval)
+        except KeyboardInterrupt:
+            return
+
+
+if __name__ == "__main__":
+    main()
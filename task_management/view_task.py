@@ -10,10 +10,11 @@ Version: 1.0.0
 """
 
 from typing import List, Dict, Optional
-from .load_task import load_tasks, get_tasks_by_status
+from .load_task import load_tasks, get_tasks_by_status, get_status_counts, get_recent_tasks, page_tasks, DEFAULT_PAGE_SIZE
 from .complete_task import complete_task, select_task_by_id, display_task_with_id
 from .delete_task import delete_task
 from .add_task import add_task
+from .search import search_tasks
 
 
 def display_task(task: Dict[str, str], show_id: bool = False) -> None:
@@ -54,30 +55,79 @@ def display_tasks(tasks: List[Dict[str, str]], title: str = "Tasks", show_id: bo
             print()  # Add spacing between tasks
 
 
-def display_task_summary() -> None:
+def _continue_paging() -> bool:
+    """Ask whether to show the next page. Returns False if the user wants to stop."""
+    return input("Press Enter for more, or 'q' to stop: ").strip().lower() != "q"
+
+
+def display_task_pages(username: str, status: Optional[str] = None, title: str = "All Tasks",
+                       page_size: int = DEFAULT_PAGE_SIZE) -> int:
     """
-    Display a summary of all tasks grouped by status.
+    Display a user's tasks one page at a time, fetching each page only when needed.
+    
+    Args:
+        username (str): Username whose tasks to list
+        status (Optional[str]): If provided, only list tasks with this status
+        title (str): Title to display above the list
+        page_size (int): Number of tasks per page
+        
+    Returns:
+        int: Number of tasks displayed
+        
+    Note:
+        Pages are fetched with a cursor, so memory use and the time to the first
+        page do not depend on how many tasks the user has.
     """
-    all_tasks = load_tasks()
+    counts = get_status_counts(username)
+    total = counts.get(status, 0) if status is not None else sum(counts.values())
+    
+    tasks, cursor = page_tasks(username, status, None, page_size)
+    if not tasks:
+        return 0
+    
+    print(f"\n=== {title} ({total}) ===")
+    shown = 0
+    while True:
+        for task in tasks:
+            shown += 1
+            display_task_with_id(task, shown)
+            print()
+        if cursor is None or not _continue_paging():
+            return shown
+        tasks, cursor = page_tasks(username, status, cursor, page_size)
+        if not tasks:
+            return shown
+
+
+def display_task_summary(username: Optional[str] = None) -> None:
+    """
+    Display a summary of tasks grouped by status.
     
-    if not all_tasks:
+    Args:
+        username (Optional[str]): If provided, only summarize this user's tasks
+        
+    Note:
+        Counts come from the backend's status counters and the recent tasks are
+        read from the end of the data, so the summary does not load every task.
+    """
+    counts = get_status_counts(username)
+    total = sum(counts.values())
+    
+    if not total:
         print("No tasks found.")
         return
     
-    # Group tasks by status
-    pending_tasks = [task for task in all_tasks if task["status"] == "pending"]
-    completed_tasks = [task for task in all_tasks if task["status"] == "completed"]
-    other_tasks = [task for task in all_tasks if task["status"] not in ["pending", "completed"]]
+    other = total - counts.get("pending", 0) - counts.get("completed", 0)
     
     print("\n=== Task Summary ===")
-    print(f"Total Tasks: {len(all_tasks)}")
-    print(f"Pending: {len(pending_tasks)}")
-    print(f"Completed: {len(completed_tasks)}")
-    if other_tasks:
-        print(f"Other: {len(other_tasks)}")
+    print(f"Total Tasks: {total}")
+    print(f"Pending: {counts.get('pending', 0)}")
+    print(f"Completed: {counts.get('completed', 0)}")
+    if other:
+        print(f"Other: {other}")
     
     # Display recent tasks (last 5)
-    recent_tasks = all_tasks[-5:] if len(all_tasks) > 5 else all_tasks
+    recent_tasks = get_recent_tasks(username, 5)
     if recent_tasks:
         print(f"\nRecent Tasks:")
         for task in recent_tasks:
@@ -121,41 +171,31 @@ def display_main_task_menu(username: str) -> None:
         print("3. View Tasks by Status")
         print("4. Complete Task")
         print("5. Delete Task")
-        print("6. Back to Main Menu")
+        print("6. Search Tasks")
+        print("7. Back to Main Menu")
         
-        choice = input("Enter your choice (1-6): ").strip()
+        choice = input("Enter your choice (1-7): ").strip()
         
         if choice == "1":
             add_task(username)
         
         elif choice == "2":
-            tasks = load_tasks(username)
-            if not tasks:
+            if not display_task_pages(username):
                 print("No tasks found.")
-            else:
-                print(f"\n=== All Tasks ({len(tasks)}) ===")
-                for i, task in enumerate(tasks, 1):
-                    display_task_with_id(task, i)
-                    print()
         
         elif choice == "3":
+            counts = get_status_counts(username)
             print("\nView by status:")
-            print("1. Pending")
-            print("2. Completed")
-            print("3. In Progress")
-            print("4. Cancelled")
+            print(f"1. Pending ({counts.get('pending', 0)})")
+            print(f"2. Completed ({counts.get('completed', 0)})")
+            print(f"3. In Progress ({counts.get('in_progress', 0)})")
+            print(f"4. Cancelled ({counts.get('cancelled', 0)})")
             print("5. Back")
             status_map = {"1": "pending", "2": "completed", "3": "in_progress", "4": "cancelled"}
             status_choice = input("Enter your choice (1-5): ").strip()
             if status_choice in status_map:
                 status = status_map[status_choice]
-                tasks = get_tasks_by_status(status, username)
-                if tasks:
-                    print(f"\n=== {status.title()} Tasks ({len(tasks)}) ===")
-                    for i, task in enumerate(tasks, 1):
-                        display_task_with_id(task, i)
-                        print()
-                else:
+                if not display_task_pages(username, status, f"{status.title()} Tasks"):
                     print(f"No {status} tasks found.")
             elif status_choice == "5":
                 continue
@@ -163,32 +203,34 @@ def display_main_task_menu(username: str) -> None:
                 print("Invalid choice.")
         
         elif choice == "4":
-            tasks = get_tasks_by_status("pending", username)
-            if not tasks:
+            if not display_task_pages(username, "pending", "Pending Tasks"):
                 print("No pending tasks to complete.")
             else:
-                print("\nPending tasks:")
-                for i, task in enumerate(tasks, 1):
-                    display_task_with_id(task, i)
-                    print()
                 task_id = select_task_by_id(username, "Enter task ID to complete: ")
                 if task_id:
                     complete_task(task_id, username)
         
         elif choice == "5":
-            tasks = load_tasks(username)
-            if not tasks:
+            if not display_task_pages(username, title="Your Tasks"):
                 print("No tasks to delete.")
             else:
-                print("\nYour tasks:")
-                for i, task in enumerate(tasks, 1):
-                    display_task_with_id(task, i)
-                    print()
                 task_id = select_task_by_id(username, "Enter task ID to delete: ")
                 if task_id:
                     delete_task(task_id, username)
         
         elif choice == "6":
+            query = input("Search for (end a word with * to match prefixes): ").strip()
+            if query:
+                tasks = search_tasks(username, query, limit=DEFAULT_PAGE_SIZE)
+                if not tasks:
+                    print("No matching tasks found.")
+                else:
+                    print(f"\n=== Search Results ({len(tasks)}{'+' if len(tasks) == DEFAULT_PAGE_SIZE else ''}) ===")
+                    for i, task in enumerate(tasks, 1):
+                        display_task_with_id(task, i)
+                        print()
+        
+        elif choice == "7":
             break
         else:
             print("Invalid choice. Please try again.")
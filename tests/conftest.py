@@ -0,0 +1,21 @@
+import os
+import sys
+
+# Make the top-level packages (storage, task_management, user_management) importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import storage
+from storage.flat_file import FlatFileBackend
+from task_management.query_cache import get_query_cache
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    """Make a flat-file backend in a temporary directory the active backend."""
+    backend = FlatFileBackend(str(tmp_path / "tasks.txt"), str(tmp_path / "users.txt"))
+    monkeypatch.setattr(storage, "_backend", backend)
+    get_query_cache().clear()
+    yield backend
+    get_query_cache().clear()
@@ -0,0 +1,40 @@
+from storage.user_file import UserFileStore
+from user_management.bloom import UsernameBloomFilter, bloom_path_for, rebuild_bloom_filter
+
+
+def test_two_stores_keep_the_sidecar_current(tmp_path):
+    users_path = str(tmp_path / "users.txt")
+    rebuild_bloom_filter(users_path)
+    first = UserFileStore(users_path)
+    second = UserFileStore(users_path)
+
+    # The second store loads the sidecar before the first one appends to it
+    assert not second.user_exists("newa")
+    first.add_user("newa", "hash-a")
+    second.add_user("newb", "hash-b")
+    first.add_user("newc", "hash-c")
+
+    bloom = UsernameBloomFilter.load(bloom_path_for(users_path))
+    with open(users_path, "rb") as file:
+        assert bloom.users_size == len(file.read())
+    for username in ("newa", "newb", "newc"):
+        assert bloom.might_contain(username)
+    for accounts in (first, second):
+        assert accounts.bloom.definitely_absent("nobody")
+        assert accounts.user_exists("newa") and accounts.user_exists("newb") and accounts.user_exists("newc")
+
+
+def test_password_rewrite_by_another_store(tmp_path):
+    users_path = str(tmp_path / "users.txt")
+    first = UserFileStore(users_path)
+    first.add_user("alice", "hash-a")
+    rebuild_bloom_filter(users_path)
+    second = UserFileStore(users_path)
+
+    assert not second.user_exists("bob")
+    first.add_user("bob", "hash-b")
+    second.update_password_hash("alice", "hash-a2")
+
+    assert second.bloom.definitely_absent("nobody")
+    assert first.bloom.definitely_absent("nobody")
+    assert first.get_password_hash("alice") == "hash-a2"
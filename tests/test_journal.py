@@ -0,0 +1,56 @@
+from storage.flat_file import FlatFileBackend
+from task_management.journal import compact_journal
+from task_management.operations import (CONFLICT, DUPLICATE_TASK_MESSAGE, create_task, delete_tasks, save_tasks,
+                                        update_task_statuses)
+
+TASK_ID = "3f0c1c8e-8a0b-4f3e-9a57-1b2c3d4e5f60"
+
+
+def views(backend, username):
+    """Every read path's idea of the user's tasks, as (id, title, status) tuples."""
+    fresh = FlatFileBackend(backend.tasks_path, backend.users_path)
+    task = backend.get_task(TASK_ID, username)
+    return {
+        "load_tasks": [(t.id, t.title, t.status) for t in backend.load_tasks(username)],
+        "fresh load_tasks": [(t.id, t.title, t.status) for t in fresh.load_tasks(username)],
+        "iter_tasks": [(t.id, t.title, t.status) for t in backend.iter_tasks(username)],
+        "get_task": [(task.id, task.title, task.status)] if task is not None else [],
+    }
+
+
+def test_task_saved_again_after_deletion_is_visible_on_every_path(backend):
+    assert create_task("alice", "first", task_id=TASK_ID).success
+    assert delete_tasks([TASK_ID], "alice")[0][1]
+    assert create_task("alice", "second", task_id=TASK_ID).success
+
+    expected = [(TASK_ID, "second", "pending")]
+    assert all(tasks == expected for tasks in views(backend, "alice").values())
+    assert compact_journal(backend.tasks_path)
+    assert all(tasks == expected for tasks in views(backend, "alice").values())
+
+
+def test_existing_ids_are_rejected(backend):
+    assert create_task("alice", "first", task_id=TASK_ID).success
+
+    result = create_task("alice", "again", task_id=TASK_ID)
+    assert not result.success and result.error == CONFLICT
+
+    other_id = "9d1e2f3a-4b5c-4d6e-8f70-8192a3b4c5d6"
+    results = save_tasks([(other_id, "alice", "one", "pending"), (other_id, "alice", "two", "pending")])
+    assert results == [(other_id, True, "Task added successfully"), (other_id, False, DUPLICATE_TASK_MESSAGE)]
+    assert [t.title for t in backend.load_tasks("alice")] == ["first", "one"]
+
+
+def test_journal_records_apply_to_every_row_with_the_key(backend):
+    with open(backend.tasks_path, "w", encoding="utf-8") as file:
+        file.write(f"{TASK_ID}|alice|copy one|pending\n{TASK_ID}|alice|copy two|pending\n")
+
+    update_task_statuses({TASK_ID: "completed"}, "alice")
+    statuses = {name: [status for _, _, status in tasks] for name, tasks in views(backend, "alice").items()}
+    assert statuses == {"load_tasks": ["completed"] * 2, "fresh load_tasks": ["completed"] * 2,
+                        "iter_tasks": ["completed"] * 2, "get_task": ["completed"]}
+
+    delete_tasks([TASK_ID], "alice")
+    assert all(not tasks for tasks in views(backend, "alice").values())
+    assert compact_journal(backend.tasks_path)
+    assert all(not tasks for tasks in views(backend, "alice").values())
@@ -0,0 +1,34 @@
+from task_management.search import SearchIndex
+
+
+def write_tasks(path, lines, end="\n"):
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write("\n".join(lines) + end)
+
+
+def test_results_stay_in_file_order_with_unicode_line_breaks_in_titles(tmp_path):
+    tasks_path = str(tmp_path / "tasks.txt")
+    write_tasks(tasks_path, [
+        "1|alice|zeta report\x0cdraft|Pending",
+        "2|alice|alpha report notes|Pending",
+        "3|alice|beta report\x85final|Pending",
+        "4|alice|gamma report|Pending",
+    ])
+    index = SearchIndex(tasks_path)
+
+    assert index.search("alice", "report") == [("1", "alice"), ("2", "alice"), ("3", "alice"), ("4", "alice")]
+    assert index.search("alice", "notes") == [("2", "alice")]
+
+
+def test_last_line_without_newline_is_searchable(tmp_path):
+    tasks_path = str(tmp_path / "tasks.txt")
+    write_tasks(tasks_path, ["1|alice|buy milk|Pending", "2|alice|buy bread|Pending"], end="")
+    index = SearchIndex(tasks_path)
+    assert index.search("alice", "bread") == [("2", "alice")]
+
+    # The unterminated line gets its newline, then another line is appended
+    with open(tasks_path, "a", encoding="utf-8") as file:
+        file.write("\n3|alice|buy eggs|Pending\n")
+
+    assert index.search("alice", "buy") == [("1", "alice"), ("2", "alice"), ("3", "alice")]
+    assert index.search("alice", "eggs") == [("3", "alice")]
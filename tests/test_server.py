@@ -0,0 +1,32 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from server import TaskAPI
+from task_management.operations import save_tasks
+from user_management.sessions import SessionManager
+
+
+def get(api, target, token):
+    async def request():
+        return await api.handle("GET", target, {"authorization": f"Bearer {token}"}, {})
+    return asyncio.run(request())
+
+
+def test_search_honours_the_status_filter(backend):
+    save_tasks([
+        ("1b4e28ba-2fa1-4d2c-883f-0016d3cca427", "alice", "buy milk", "completed"),
+        ("2c5f39cb-3fb2-4e3d-994f-1127e4ddb538", "alice", "buy bread", "pending"),
+        ("3d6f4adc-4fc3-4f4e-8a5f-2238f5eec649", "bob", "buy eggs", "pending"),
+    ])
+    sessions = SessionManager(secret=b"test-secret")
+    token, _ = sessions.issue("alice")
+    with ThreadPoolExecutor(2) as executor:
+        api = TaskAPI(executor, executor, sessions)
+
+        status, tasks = get(api, "/tasks?q=buy&status=pending", token)
+        assert status == HTTPStatus.OK
+        assert [task["title"] for task in tasks] == ["buy bread"]
+
+        status, tasks = get(api, "/tasks?q=buy", token)
+        assert [task["title"] for task in tasks] == ["buy milk", "buy bread"]
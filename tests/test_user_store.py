@@ -0,0 +1,38 @@
+from storage.user_file import UserFileStore
+from user_management.user_store import UserStore
+
+
+def test_last_line_without_newline_is_found(tmp_path):
+    users_path = tmp_path / "users.txt"
+    users_path.write_text("alice:hash-a\nbob:hash-b", encoding="utf-8")
+    store = UserStore(str(users_path))
+
+    assert store.get("bob") == "hash-b"
+    assert "bob" in store
+    assert len(store) == 2
+
+
+def test_unterminated_line_is_reread_when_it_grows(tmp_path):
+    users_path = tmp_path / "users.txt"
+    users_path.write_text("alice:hash-a\nbob:ha", encoding="utf-8")
+    store = UserStore(str(users_path))
+    assert store.get("bob") == "ha"
+
+    with open(users_path, "a", encoding="utf-8") as file:
+        file.write("sh-b\ncarol:hash-c\n")
+
+    assert store.get("bob") == "hash-b"
+    assert store.get("carol") == "hash-c"
+
+
+def test_add_user_after_unterminated_line(tmp_path):
+    users_path = tmp_path / "users.txt"
+    users_path.write_text("alice:hash-a", encoding="utf-8")
+    accounts = UserFileStore(str(users_path))
+    assert accounts.user_exists("alice")
+
+    accounts.add_user("bob", "hash-b")
+
+    assert list(accounts.iter_users()) == [("alice", "hash-a"), ("bob", "hash-b")]
+    assert accounts.get_password_hash("alice") == "hash-a"
+    assert accounts.get_password_hash("bob") == "hash-b"
@@ -8,6 +8,10 @@ and credential management.
 The module is organized into the following components:
 - login: Functions for user authentication and login verification
 - register: Functions for user registration and account creation
+- passwords: Salted, tunable KDF password hashing with constant-time verification
+- sessions: Signed, expiring session tokens backed by a bounded in-memory table
+- user_store: In-memory credential cache for the users file
+- bloom: Optional Bloom filter sidecar for username availability checks
 - utils: Utility functions for input validation and user operations
 
 Author: Alex Clark
@@ -16,13 +20,23 @@ Version: 1.0.0
 """
 
 # Import main functions for easy access
-from .login import login
-from .register import sign_up
+from .login import login, authenticate
+from .register import sign_up, register_user
+from .passwords import hash_password, verify_password, needs_rehash
+from .sessions import SessionManager
+from .user_store import UserStore
 
 # Define what should be available when importing the module
 __all__ = [
     'login',
-    'sign_up'
+    'authenticate',
+    'sign_up',
+    'register_user',
+    'hash_password',
+    'verify_password',
+    'needs_rehash',
+    'SessionManager',
+    'UserStore'
 ]
 
 # Module metadata
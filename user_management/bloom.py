@@ -0,0 +1,288 @@
+"""
+User Management System - Username Bloom Filter Module
+
+This module provides an optional on-disk Bloom filter over the set of registered
+usernames. It lets username availability checks answer "definitely free" without
+reading users.txt at all; only possible hits fall through to the exact lookup.
+
+Sidecar format (users.txt.bloom):
+    8-byte magic, bit count (uint64), hash count (uint32), users-file size at the
+    time of the last update (uint64), followed by the bit array.
+
+The recorded users-file size lets readers detect that users.txt was changed by
+something other than save_user, in which case the filter is ignored until rebuilt.
+
+Usage:
+    python -m user_management.bloom rebuild [--users users.txt] [--fp-rate 0.01]
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import argparse
+import hashlib
+import math
+import os
+import struct
+import sys
+from typing import Iterable, Optional
+
+# Add parent directory to path for storage import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.locking import atomic_replace, file_lock
+
+
+# Default target false-positive rate for newly built filters
+DEFAULT_FP_RATE = 0.01
+
+# Minimum capacity, so small user bases leave room to grow before a rebuild
+MIN_CAPACITY = 1024
+
+_MAGIC = b"TMBLOOM1"
+_HEADER = struct.Struct("<8sQIQ")
+
+
+def bloom_path_for(users_path: str) -> str:
+    """
+    Return the Bloom filter sidecar path belonging to a users file.
+
+    Args:
+        users_path (str): Path of the users file
+
+    Returns:
+        str: The users path with a '.bloom' suffix
+    """
+    return users_path + ".bloom"
+
+
+class UsernameBloomFilter:
+    """
+    Bloom filter over usernames, persisted next to the users file.
+
+    Attributes:
+        bit_count (int): Number of bits in the filter
+        hash_count (int): Number of hash probes per username
+        users_size (int): Size of the users file the filter was last synced with
+    """
+
+    def __init__(self, bit_count: int, hash_count: int, bits: Optional[bytearray] = None, users_size: int = 0):
+        self.bit_count = bit_count
+        self.hash_count = hash_count
+        self.bits = bits if bits is not None else bytearray((bit_count + 7) // 8)
+        self.users_size = users_size
+
+    @classmethod
+    def for_capacity(cls, capacity: int, fp_rate: float = DEFAULT_FP_RATE) -> "UsernameBloomFilter":
+        """
+        Create an empty filter sized for a number of usernames.
+
+        Args:
+            capacity (int): Expected number of usernames
+            fp_rate (float): Target false-positive rate at that capacity (0 < fp_rate < 1)
+
+        Returns:
+            UsernameBloomFilter: An empty, optimally sized filter
+        """
+        if not 0 < fp_rate < 1:
+            raise ValueError("False-positive rate must be between 0 and 1")
+        capacity = max(capacity, MIN_CAPACITY)
+        bit_count = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+        hash_count = max(1, round(bit_count / capacity * math.log(2)))
+        return cls(bit_count, hash_count)
+
+    def _positions(self, username: str) -> Iterable[int]:
+        # Double hashing: position_i = h1 + i * h2 over one 128-bit digest
+        digest = hashlib.blake2b(username.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.bit_count
+
+    def add(self, username: str) -> None:
+        """Add a username to the filter."""
+        for position in self._positions(username):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, username: str) -> bool:
+        """
+        Check whether a username may be in the set.
+
+        Returns:
+            bool: False if the username is definitely absent, True if it may be present
+        """
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(username))
+
+    def save(self, path: str) -> None:
+        """Atomically write the filter to a sidecar file."""
+        with atomic_replace(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, self.bit_count, self.hash_count, self.users_size))
+            file.write(self.bits)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["UsernameBloomFilter"]:
+        """
+        Read a filter from a sidecar file.
+
+        Returns:
+            Optional[UsernameBloomFilter]: The filter, or None if the file is missing or invalid
+        """
+        try:
+            with open(path, "rb") as file:
+                header = file.read(_HEADER.size)
+                bits = bytearray(file.read())
+        except FileNotFoundError:
+            return None
+        if len(header) != _HEADER.size:
+            return None
+        magic, bit_count, hash_count, users_size = _HEADER.unpack(header)
+        if magic != _MAGIC or len(bits) != (bit_count + 7) // 8 or not hash_count:
+            return None
+        return cls(bit_count, hash_count, bits, users_size)
+
+
+def _users_file_size(users_path: str) -> int:
+    try:
+        return os.path.getsize(users_path)
+    except FileNotFoundError:
+        return 0
+
+
+def rebuild_bloom_filter(users_path: str = "users.txt", fp_rate: float = DEFAULT_FP_RATE) -> UsernameBloomFilter:
+    """
+    Build the username Bloom filter from the users file and write its sidecar.
+
+    Args:
+        users_path (str): Path of the users file (default: users.txt)
+        fp_rate (float): Target false-positive rate
+
+    Returns:
+        UsernameBloomFilter: The newly built filter
+
+    Note:
+        The filter is sized for twice the current number of users, so registrations
+        can keep updating it for a while before the false-positive rate degrades.
+    """
+    # Registrations wait until the sidecar matches the file it was built from
+    with file_lock(users_path):
+        users_size = _users_file_size(users_path)
+        usernames = []
+        if users_size:
+            with open(users_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    stored_username, separator, _ = line.strip().partition(":")
+                    if separator:
+                        usernames.append(stored_username)
+
+        bloom = UsernameBloomFilter.for_capacity(2 * len(usernames), fp_rate)
+        for username in usernames:
+            bloom.add(username)
+        bloom.users_size = users_size
+        bloom.save(bloom_path_for(users_path))
+    return bloom
+
+
+class UsernameBloomSidecar:
+    """
+    Keeps a UsernameBloomFilter in sync with a users file.
+
+    Attributes:
+        users_path (str): Path of the users file
+        path (str): Path of the sidecar file
+    """
+
+    def __init__(self, users_path: str = "users.txt"):
+        self.users_path = users_path
+        self.path = bloom_path_for(users_path)
+        self._bloom: Optional[UsernameBloomFilter] = None
+        self._loaded = False
+
+    def _current(self) -> Optional[UsernameBloomFilter]:
+        """Return the filter if it still describes the users file, or None."""
+        users_size = _users_file_size(self.users_path)
+        if not self._loaded or (self._bloom is not None and self._bloom.users_size != users_size):
+            # Another process may have appended a user and updated the sidecar since
+            self._bloom = UsernameBloomFilter.load(self.path)
+            self._loaded = True
+        if self._bloom is None or self._bloom.users_size != users_size:
+            # Missing, or users.txt changed behind our back: only a rebuild can fix it
+            self._bloom = None
+            self._loaded = False
+            return None
+        return self._bloom
+
+    def definitely_absent(self, username: str) -> bool:
+        """
+        Check whether a username is certainly not registered.
+
+        Returns:
+            bool: True only if the filter is current and rules the username out;
+            False means the caller must fall back to an exact lookup
+        """
+        bloom = self._current()
+        return bloom is not None and not bloom.might_contain(username)
+
+    def record(self, username: str, users_size_before: int) -> None:
+        """
+        Add a newly appended username to the sidecar.
+
+        Args:
+            username (str): The username that was just appended to the users file
+            users_size_before (int): Size of the users file before the append
+
+        Note:
+            - Must be called while holding the users-file lock
+            - The sidecar is always re-read from disk, since the in-memory copy may
+              predate appends made by other processes
+            - If the filter was out of date before the append it is left alone, so it
+              keeps reporting itself as stale until rebuilt
+        """
+        # Re-read under the users-file lock: another process may have updated the sidecar
+        bloom = UsernameBloomFilter.load(self.path)
+        if bloom is None or bloom.users_size != users_size_before:
+            return
+        bloom.add(username)
+        bloom.users_size = _users_file_size(self.users_path)
+        bloom.save(self.path)
+        self._bloom = bloom
+        self._loaded = True
+
+    def record_rewrite(self, users_size_before: int) -> None:
+        """
+        Keep the sidecar current after the users file was rewritten with the same usernames.
+
+        Args:
+            users_size_before (int): Size of the users file before the rewrite
+
+        Note:
+            Used when only password hashes changed; like record(), a filter that was
+            already out of date is left alone.
+        """
+        bloom = UsernameBloomFilter.load(self.path)
+        if bloom is None or bloom.users_size != users_size_before:
+            return
+        bloom.users_size = _users_file_size(self.users_path)
+        bloom.save(self.path)
+        self._bloom = bloom
+        self._loaded = True
+
+    def rebuild(self, fp_rate: float = DEFAULT_FP_RATE) -> None:
+        """Rebuild the sidecar from the users file."""
+        self._bloom = rebuild_bloom_filter(self.users_path, fp_rate)
+        self._loaded = True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the username Bloom filter sidecar.")
+    parser.add_argument("command", choices=["rebuild"], help="Action to perform")
+    parser.add_argument("--users", default="users.txt", help="Path of the users file")
+    parser.add_argument("--fp-rate", type=float, default=DEFAULT_FP_RATE,
+                        help="Target false-positive rate (default: %(default)s)")
+    args = parser.parse_args()
+
+    bloom = rebuild_bloom_filter(args.users, args.fp_rate)
+    print(f"Rebuilt {bloom_path_for(args.users)}: {bloom.bit_count} bits, {bloom.hash_count} hashes")
+
+
+if __name__ == "__main__":
+    main()
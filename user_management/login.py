@@ -3,23 +3,28 @@ User Management System - Login Module
 
 This module provides functionality for user authentication and login verification.
 It includes functions for finding user credentials, password verification, and
-the main login process.
+the main login process. Stored hashes made with the legacy format or outdated
+cost settings are re-hashed with the current settings after a successful login.
 
 Author: Alex Clark
 Date: July 2nd, 2025
 Version: 1.0.0
 """
 
-import hashlib
 import sys
 import os
 from typing import Optional, Tuple
 
-# Add parent directory to path for utils import
+# Add parent directory to path for utils and storage imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils import get_valid_input
+from storage import get_backend
+from storage.diagnostics import warn
+import metrics
+from .passwords import dummy_hash, hash_password, needs_rehash, verify_password as check_password_hash
 
 
+@metrics.instrument()
 def find_user_credentials(username: str) -> Optional[str]:
     """
     Find stored credentials for a given username.
@@ -31,20 +36,13 @@ def find_user_credentials(username: str) -> Optional[str]:
         Optional[str]: The hashed password if found, None otherwise
         
     Note:
-        Searches the users.txt file for the specified username and returns
+        Looks the username up through the active storage backend and returns
         the corresponding hashed password.
     """
-    try:
-        with open("users.txt", "r", encoding="utf-8") as file:
-            for line in file:
-                stored_username, stored_password = line.strip().split(":")
-                if username == stored_username:
-                    return stored_password
-        return None
-    except FileNotFoundError:
-        return None
+    return get_backend().get_password_hash(username)
 
 
+@metrics.instrument()
 def verify_password(input_password: str, stored_password: str) -> bool:
     """
     Verify if input password matches stored password.
@@ -57,10 +55,64 @@ def verify_password(input_password: str, stored_password: str) -> bool:
         bool: True if passwords match, False otherwise
         
     Note:
-        Compares the SHA256 hash of the input password with the stored hash.
+        Accepts every format understood by the passwords module, including legacy
+        unsalted SHA256 hashes, and compares in constant time.
+    """
+    return check_password_hash(input_password, stored_password)
+
+
+def upgrade_password_hash(username: str, password: str, stored_password: str) -> None:
+    """
+    Re-hash a just-verified password if its stored hash is outdated.
+    
+    Args:
+        username (str): The user who just logged in
+        password (str): The plain-text password that matched
+        stored_password (str): The hash it was checked against
+        
+    Note:
+        A failure to store the new hash is reported but does not fail the login;
+        the old hash keeps working and the upgrade is retried on the next login.
+    """
+    if not needs_rehash(stored_password):
+        return
+    try:
+        get_backend().update_password_hash(username, hash_password(password))
+    except Exception as e:
+        warn("Warning: Could not upgrade the password hash for {username}: {error}", username=username, error=e)
+
+
+@metrics.instrument()
+def authenticate(username: str, password: str) -> Tuple[bool, str, Optional[str]]:
+    """
+    Non-interactive login - checks a username and password without prompting.
+    
+    Args:
+        username (str): The username to authenticate
+        password (str): The plain-text password supplied by the client
+        
+    Returns:
+        Tuple[bool, str, Optional[str]]: Same (success, message, username) tuple as login()
+        
+    Note:
+        - Used by API front ends, which receive credentials in requests rather than
+          from the terminal
+        - An unknown username is checked against a dummy hash and gets the same
+          message as a wrong password, so neither the answer nor its timing reveals
+          which usernames exist
     """
-    hashed_input = hashlib.sha256(input_password.encode()).hexdigest()
-    return hashed_input == stored_password
+    if not username or not password:
+        return False, "Username and password are required", None
+    
+    stored_password = find_user_credentials(username)
+    if not stored_password:
+        verify_password(password, dummy_hash())
+        return False, "Invalid username or password", None
+    
+    if verify_password(password, stored_password):
+        upgrade_password_hash(username, password, stored_password)
+        return True, "Login successful", username
+    return False, "Invalid username or password", None
 
 
 def login() -> Tuple[bool, str, Optional[str]]:
@@ -78,7 +130,8 @@ def login() -> Tuple[bool, str, Optional[str]]:
             
     Note:
         - Uses get_valid_input for robust input handling
-        - Provides clear feedback for different failure scenarios
+        - Always asks for the password and reports unknown usernames and wrong
+          passwords alike (see authenticate)
         - Returns username for session management
     """
     # Get valid username from user input
@@ -87,22 +140,14 @@ def login() -> Tuple[bool, str, Optional[str]]:
         "Username cannot be empty"
     )
     
-    # Check if username exists in the system
-    stored_password = find_user_credentials(username)
-    if not stored_password:
-        return False, "Invalid username", None
-    
-    # Get and verify password from user input
+    # Get password from user input
     password = get_valid_input(
         "Enter your password: ",
         "Password cannot be empty"
     )
     
-    # Verify the provided password against stored hash
-    if verify_password(password, stored_password):
-        return True, "Login successful", username
-    else:
-        return False, "Invalid password", None
+    # Verify the credentials against the stored hash
+    return authenticate(username, password)
 
 
 # Example usage and testing (when run as main module)
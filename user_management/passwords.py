@@ -0,0 +1,221 @@
+"""
+User Management System - Passwords Module
+
+This module hashes and verifies user passwords. Passwords are stored as salted,
+deliberately slow key-derivation hashes in a self-describing format, so that the
+algorithm and its cost can be changed later without invalidating existing accounts:
+
+    scrypt$<n>$<r>$<p>$<salt>$<hash>               (default)
+    pbkdf2_sha256$<iterations>$<salt>$<hash>
+    <64 hex digits>                                 legacy unsalted SHA-256
+
+Salts and hashes are base64 encoded. Every comparison is made with
+hmac.compare_digest, so the time taken does not reveal how much of a hash matched.
+Stored hashes that use the legacy format, another scheme or other cost parameters
+are reported by needs_rehash(), and login re-hashes them with the current settings.
+
+The scheme and cost are tuned with environment variables:
+    TASK_MANAGER_PASSWORD_SCHEME     scrypt (default) or pbkdf2_sha256
+    TASK_MANAGER_SCRYPT_N            scrypt CPU/memory cost, a power of two (default 16384)
+    TASK_MANAGER_PBKDF2_ITERATIONS   PBKDF2 iterations (default 600000)
+    TASK_MANAGER_KDF_WORKERS         threads the API server spends on hashing (default 4)
+
+Measure what a setting costs on the target machine before changing it:
+    python -m benchmarks.kdf [--seconds 3] [--threads 4]
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import secrets
+import sys
+from typing import Dict, Optional, Tuple
+
+# Add parent directory to path for utils and storage imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import get_env_int
+from storage.diagnostics import warn
+
+
+PASSWORD_SCHEME_ENV_VAR = "TASK_MANAGER_PASSWORD_SCHEME"
+SCRYPT_N_ENV_VAR = "TASK_MANAGER_SCRYPT_N"
+PBKDF2_ITERATIONS_ENV_VAR = "TASK_MANAGER_PBKDF2_ITERATIONS"
+KDF_WORKERS_ENV_VAR = "TASK_MANAGER_KDF_WORKERS"
+
+SCRYPT = "scrypt"
+PBKDF2_SHA256 = "pbkdf2_sha256"
+
+# scrypt is missing from hashlib when Python is built against an old OpenSSL
+SCHEMES = (SCRYPT, PBKDF2_SHA256) if hasattr(hashlib, "scrypt") else (PBKDF2_SHA256,)
+
+DEFAULT_SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+DEFAULT_PBKDF2_ITERATIONS = 600_000
+DEFAULT_KDF_WORKERS = 4
+
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+# Length of a legacy unsalted SHA-256 hex digest
+_LEGACY_LENGTH = 64
+
+# Hashes of a throwaway password, one per (scheme, cost) setting; see dummy_hash()
+_dummy_hashes: Dict[Tuple[str, int], str] = {}
+
+
+def current_scheme() -> str:
+    """Return the scheme new password hashes are created with."""
+    setting = os.environ.get(PASSWORD_SCHEME_ENV_VAR, "").strip().lower()
+    if not setting:
+        return SCHEMES[0]
+    if setting not in SCHEMES:
+        warn("Warning: Ignoring unsupported {name} value: {setting!r}", name=PASSWORD_SCHEME_ENV_VAR, setting=setting)
+        return SCHEMES[0]
+    return setting
+
+
+def scrypt_n() -> int:
+    """Return the configured scrypt CPU/memory cost."""
+    n = get_env_int(SCRYPT_N_ENV_VAR, DEFAULT_SCRYPT_N)
+    if n & (n - 1) or n < 2:
+        warn("Warning: {name} must be a power of two greater than 1, using {default}",
+             name=SCRYPT_N_ENV_VAR, default=DEFAULT_SCRYPT_N)
+        return DEFAULT_SCRYPT_N
+    return n
+
+
+def pbkdf2_iterations() -> int:
+    """Return the configured PBKDF2 iteration count."""
+    return get_env_int(PBKDF2_ITERATIONS_ENV_VAR, DEFAULT_PBKDF2_ITERATIONS)
+
+
+def kdf_workers() -> int:
+    """Return how many threads a server should dedicate to password hashing."""
+    return get_env_int(KDF_WORKERS_ENV_VAR, DEFAULT_KDF_WORKERS)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text.encode("ascii"), validate=True)
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # hashlib's default 32 MiB limit is too small for n above 2**14
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + 1024 * 1024, dklen=HASH_BYTES)
+
+
+def _pbkdf2(password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations, dklen=HASH_BYTES)
+
+
+def hash_password(password: str, scheme: Optional[str] = None) -> str:
+    """
+    Hash a password with a fresh random salt.
+
+    Args:
+        password (str): The plain-text password
+        scheme (Optional[str]): SCRYPT or PBKDF2_SHA256 (defaults to current_scheme())
+
+    Returns:
+        str: The encoded hash, ready to be stored
+
+    Raises:
+        ValueError: If the scheme is not supported by this Python build
+    """
+    scheme = scheme or current_scheme()
+    if scheme not in SCHEMES:
+        raise ValueError(f"Unsupported password scheme: {scheme}")
+    salt = secrets.token_bytes(SALT_BYTES)
+    if scheme == SCRYPT:
+        n = scrypt_n()
+        digest = _scrypt(password, salt, n, SCRYPT_R, SCRYPT_P)
+        return f"{SCRYPT}${n}${SCRYPT_R}${SCRYPT_P}${_b64encode(salt)}${_b64encode(digest)}"
+    iterations = pbkdf2_iterations()
+    digest = _pbkdf2(password, salt, iterations)
+    return f"{PBKDF2_SHA256}${iterations}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def dummy_hash() -> str:
+    """
+    Return a hash made with the current scheme and cost, for checking against when
+    a username is unknown.
+
+    Verifying a password against it costs as much as verifying a real user's, so
+    a failed login takes the same time whether or not the username exists.
+    """
+    scheme = current_scheme()
+    key = (scheme, scrypt_n() if scheme == SCRYPT else pbkdf2_iterations())
+    stored = _dummy_hashes.get(key)
+    if stored is None:
+        stored = _dummy_hashes[key] = hash_password(secrets.token_urlsafe(16), scheme)
+    return stored
+
+
+def is_legacy_hash(stored_password: str) -> bool:
+    """Return True if a stored hash uses the old unsalted SHA-256 format."""
+    return "$" not in stored_password and len(stored_password) == _LEGACY_LENGTH
+
+
+def verify_password(password: str, stored_password: str) -> bool:
+    """
+    Check a password against a stored hash of any supported format.
+
+    Args:
+        password (str): The plain-text password entered by the user
+        stored_password (str): The stored hash
+
+    Returns:
+        bool: True if the password matches; False if it does not, or if the
+        stored hash is malformed or uses a scheme this build cannot compute
+    """
+    if is_legacy_hash(stored_password):
+        candidate = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(candidate, stored_password.lower())
+
+    scheme, _, fields = stored_password.partition("$")
+    try:
+        if scheme == SCRYPT and SCRYPT in SCHEMES:
+            n, r, p, salt, digest = fields.split("$")
+            expected = _b64decode(digest)
+            candidate = _scrypt(password, _b64decode(salt), int(n), int(r), int(p))
+        elif scheme == PBKDF2_SHA256:
+            iterations, salt, digest = fields.split("$")
+            expected = _b64decode(digest)
+            candidate = _pbkdf2(password, _b64decode(salt), int(iterations))
+        else:
+            return False
+    except (ValueError, binascii.Error):
+        # Wrong field count, bad base64 or numbers, or parameters hashlib rejects
+        return False
+    return hmac.compare_digest(candidate, expected)
+
+
+def needs_rehash(stored_password: str) -> bool:
+    """
+    Check whether a stored hash should be replaced by one made with the current settings.
+
+    Args:
+        stored_password (str): The stored hash
+
+    Returns:
+        bool: True for legacy hashes, hashes made with another scheme and hashes whose
+        cost parameters differ from the configured ones
+    """
+    scheme, _, fields = stored_password.partition("$")
+    if scheme != current_scheme():
+        return True
+    parameters = fields.split("$")
+    if scheme == SCRYPT:
+        return parameters[:3] != [str(scrypt_n()), str(SCRYPT_R), str(SCRYPT_P)]
+    return parameters[:1] != [str(pbkdf2_iterations())]
@@ -10,16 +10,19 @@ Date: July 2nd, 2025
 Version: 1.0.0
 """
 
-import hashlib
 import sys
 import os
 from typing import Optional, Tuple, Callable
 
-# Add parent directory to path for utils import
+# Add parent directory to path for utils and storage imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils import get_valid_input
+from storage import UserExistsError, get_backend
+import metrics
+from .passwords import hash_password
 
 
+@metrics.instrument()
 def check_username(username: str) -> bool:
     """
     Check if a username already exists in the system.
@@ -31,18 +34,10 @@ def check_username(username: str) -> bool:
         bool: True if username exists, False otherwise
         
     Note:
-        Searches the users.txt file for the specified username.
-        Returns True if found, False if not found or file doesn't exist.
+        Checks the active storage backend for the specified username.
+        Returns True if found, False if not found.
     """
-    try:
-        with open("users.txt", "r", encoding="utf-8") as file:
-            for line in file:
-                stored_username = line.strip().split(":")[0]
-                if username == stored_username:
-                    return True
-        return False
-    except FileNotFoundError:
-        return False
+    return get_backend().user_exists(username)
 
 
 def is_username_available(username: str) -> bool:
@@ -68,9 +63,10 @@ def is_username_available(username: str) -> bool:
     return True
 
 
+@metrics.instrument()
 def save_user(username: str, password: str) -> bool:
     """
-    Save user credentials to the persistent storage file.
+    Save user credentials to persistent storage.
     
     Args:
         username (str): The username to save
@@ -80,18 +76,59 @@ def save_user(username: str, password: str) -> bool:
         bool: True if user was saved successfully, False otherwise
         
     Note:
-        Appends the user credentials to the users.txt file in the format
-        username:hashed_password. Handles file I/O errors gracefully.
+        Stores the credentials through the active storage backend (for the flat-file
+        backend, appended to users.txt as username:hashed_password). Handles storage
+        errors gracefully; a username taken by a concurrent registration is reported
+        as "Username already exists".
     """
     try:
-        with open("users.txt", "a", encoding="utf-8") as file:
-            file.write(f"{username}:{password}\n")
+        get_backend().add_user(username, password)
         return True
+    except UserExistsError:
+        print("Username already exists")
+        return False
     except Exception as e:
         print(f"Error saving user: {e}")
         return False
 
 
+@metrics.instrument()
+def register_user(username: str, password: str) -> Tuple[bool, str]:
+    """
+    Non-interactive registration - creates an account without prompting.
+    
+    Args:
+        username (str): The requested username
+        password (str): The plain-text password supplied by the client
+        
+    Returns:
+        Tuple[bool, str]: (success, message)
+        
+    Note:
+        Rejects usernames containing characters that would corrupt the users or
+        tasks files (':', '|' and line breaks), since API clients are not limited
+        to what input() can return.
+    """
+    if not username:
+        return False, "Username cannot be empty"
+    if not password:
+        return False, "Password cannot be empty"
+    if any(character in username for character in ":|\r\n"):
+        return False, "Username cannot contain ':', '|' or line breaks"
+    if check_username(username):
+        return False, "Username already exists"
+    
+    hashed_password = hash_password(password)
+    try:
+        get_backend().add_user(username, hashed_password)
+    except UserExistsError:
+        # Registered by a concurrent request since the check above
+        return False, "Username already exists"
+    except Exception:
+        return False, "Registration failed. Please try again."
+    return True, "Registration successful!"
+
+
 def sign_up() -> Tuple[bool, Optional[str]]:
     """
     Register a new user and return registration status.
@@ -107,7 +144,7 @@ def sign_up() -> Tuple[bool, Optional[str]]:
     Note:
         - Uses get_valid_input for robust input handling
         - Validates username availability before proceeding
-        - Hashes passwords using SHA256 for security
+        - Hashes passwords with a salted KDF (see the passwords module)
         - Provides clear feedback for success/failure scenarios
     """
     # Get valid username with availability validation
@@ -123,8 +160,8 @@ def sign_up() -> Tuple[bool, Optional[str]]:
         "Password cannot be empty"
     )
     
-    # Hash password for secure storage
-    hashed_password = hashlib.sha256(password.encode()).hexdigest()
+    # Hash password with a salted, deliberately slow KDF for secure storage
+    hashed_password = hash_password(password)
     
     # Save user credentials to persistent storage
     if save_user(username, hashed_password):
@@ -0,0 +1,234 @@
+"""
+User Management System - Sessions Module
+
+This module issues and validates login session tokens, so that a client which has
+logged in once can make further requests without sending its password again. Checking
+a token costs one HMAC and one dictionary lookup: it never reads the users file and
+never runs the password KDF.
+
+A token is "<payload>.<signature>", both base64url encoded. The payload carries the
+username, the expiry time and a random session ID, and the signature is an HMAC-SHA256
+of the payload under a server secret, so forged or altered tokens are rejected before
+the session table is consulted. The table itself is an LRU with a size bound: the
+least recently used sessions are evicted when it is full, and expired ones are dropped
+as they are met. Logging out removes a session from the table, which invalidates its
+token immediately.
+
+Sessions live in memory. A SessionManager created with a snapshot path restores the
+table (and its secret) from that file and writes it back on save(), so a restart does
+not log every client out.
+
+Settings (environment variables):
+    TASK_MANAGER_SESSION_TTL       Session lifetime in seconds (default 3600)
+    TASK_MANAGER_MAX_SESSIONS      Size bound of the session table (default 10000)
+    TASK_MANAGER_SESSION_SECRET    Signing secret; a random one is generated if unset
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+# Add parent directory to path for utils and storage imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import get_env_int
+from storage.diagnostics import warn
+from storage.locking import atomic_replace
+
+
+SESSION_TTL_ENV_VAR = "TASK_MANAGER_SESSION_TTL"
+MAX_SESSIONS_ENV_VAR = "TASK_MANAGER_MAX_SESSIONS"
+SESSION_SECRET_ENV_VAR = "TASK_MANAGER_SESSION_SECRET"
+
+DEFAULT_SESSION_TTL = 3600
+DEFAULT_MAX_SESSIONS = 10_000
+
+SESSION_ID_BYTES = 18
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class SessionManager:
+    """
+    Issues signed, expiring session tokens and keeps the table of live sessions.
+
+    Thread-safe: the API server validates tokens on its event loop while login calls
+    issue them from worker threads.
+
+    Attributes:
+        ttl (int): Session lifetime in seconds
+        max_sessions (int): Most sessions kept; the least recently used are evicted
+        snapshot_path (Optional[str]): File the table is restored from and saved to
+    """
+
+    def __init__(self, ttl: Optional[int] = None, max_sessions: Optional[int] = None,
+                 secret: Optional[bytes] = None, snapshot_path: Optional[str] = None):
+        self.ttl = ttl or get_env_int(SESSION_TTL_ENV_VAR, DEFAULT_SESSION_TTL)
+        self.max_sessions = max_sessions or get_env_int(MAX_SESSIONS_ENV_VAR, DEFAULT_MAX_SESSIONS)
+        self.snapshot_path = snapshot_path
+        env_secret = os.environ.get(SESSION_SECRET_ENV_VAR, "")
+        self._secret = secret or env_secret.encode() or secrets.token_bytes(32)
+        # session ID -> (username, expiry as a Unix timestamp), least recently used first
+        self._sessions: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if snapshot_path:
+            # An explicit secret wins over the one stored in the snapshot
+            self._restore(snapshot_path, keep_secret=bool(secret or env_secret))
+
+    def _sign(self, payload: str) -> str:
+        return _b64encode(hmac.new(self._secret, payload.encode("ascii"), hashlib.sha256).digest())
+
+    def issue(self, username: str) -> Tuple[str, int]:
+        """
+        Start a session for a user who has just authenticated.
+
+        Args:
+            username (str): The authenticated user
+
+        Returns:
+            Tuple[str, int]: The session token and its expiry as a Unix timestamp
+        """
+        session_id = _b64encode(secrets.token_bytes(SESSION_ID_BYTES))
+        expires_at = int(time.time()) + self.ttl
+        payload = _b64encode(f"{username}\n{expires_at}\n{session_id}".encode("utf-8"))
+        with self._lock:
+            self._sessions[session_id] = (username, expires_at)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return f"{payload}.{self._sign(payload)}", expires_at
+
+    def _decode(self, token: str) -> Optional[Tuple[str, int, str]]:
+        """Return the (username, expiry, session ID) of a correctly signed token, or None."""
+        payload, separator, signature = token.partition(".")
+        if not separator or not hmac.compare_digest(self._sign(payload), signature):
+            return None
+        try:
+            username, expires_at, session_id = _b64decode(payload).decode("utf-8").split("\n")
+            return username, int(expires_at), session_id
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            return None
+
+    def validate(self, token: str) -> Optional[str]:
+        """
+        Check a session token.
+
+        Args:
+            token (str): Token returned by issue()
+
+        Returns:
+            Optional[str]: The session's username, or None if the token is forged,
+            expired, logged out or was evicted from the table
+        """
+        try:
+            decoded = self._decode(token)
+        except (UnicodeEncodeError, TypeError):
+            return None
+        if decoded is None:
+            return None
+        username, expires_at, session_id = decoded
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session != (username, expires_at):
+                return None
+            if expires_at <= time.time():
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+        return username
+
+    def revoke(self, token: str) -> bool:
+        """
+        End the session a token belongs to.
+
+        Returns:
+            bool: True if a live session was ended
+        """
+        try:
+            decoded = self._decode(token)
+        except (UnicodeEncodeError, TypeError):
+            return False
+        if decoded is None:
+            return False
+        with self._lock:
+            return self._sessions.pop(decoded[2], None) is not None
+
+    def purge_expired(self) -> int:
+        """
+        Drop every expired session from the table.
+
+        Returns:
+            int: Number of sessions dropped
+        """
+        now = time.time()
+        with self._lock:
+            expired = [session_id for session_id, (_, expires_at) in self._sessions.items() if expires_at <= now]
+            for session_id in expired:
+                del self._sessions[session_id]
+        return len(expired)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        Write the live sessions and the signing secret to a snapshot file.
+
+        Args:
+            path (Optional[str]): Snapshot file (defaults to snapshot_path)
+
+        Note:
+            The snapshot holds everything needed to forge tokens, so it is written
+            readable by its owner only.
+        """
+        path = path or self.snapshot_path
+        if not path:
+            return
+        self.purge_expired()
+        with self._lock:
+            sessions = [[session_id, username, expires_at]
+                        for session_id, (username, expires_at) in self._sessions.items()]
+        with atomic_replace(path) as file:
+            os.chmod(file.name, 0o600)
+            json.dump({"secret": self._secret.hex(), "sessions": sessions}, file)
+
+    def _restore(self, path: str, keep_secret: bool) -> None:
+        """Load a snapshot written by save(), if there is one."""
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+            secret = bytes.fromhex(snapshot["secret"])
+            sessions = [(str(session_id), str(username), int(expires_at))
+                        for session_id, username, expires_at in snapshot["sessions"]]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            warn("Warning: Ignoring unreadable session snapshot {path}: {error}", path=path, error=e)
+            return
+        if keep_secret and secret != self._secret:
+            # Tokens signed with the old secret could never validate
+            return
+        self._secret = secret
+        now = time.time()
+        with self._lock:
+            for session_id, username, expires_at in sessions[-self.max_sessions:]:
+                if expires_at > now:
+                    self._sessions[session_id] = (username, expires_at)
@@ -0,0 +1,125 @@
+"""
+User Management System - User Store Module
+
+This module provides an in-memory credential cache for the users file. The file is
+parsed once into a dictionary keyed by username, so login and username availability
+checks are O(1) dictionary lookups instead of a scan of users.txt per call.
+
+The store follows the file as it changes: appended lines (including those written
+by save_user) are parsed incrementally, and any other change on disk triggers a
+full reload.
+
+Author: Alex Clark
+Date: July 2nd, 2025
+Version: 1.0.0
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+import metrics
+
+
+class UserStore:
+    """
+    Cached username -> password hash mapping for users.txt.
+
+    Attributes:
+        path (str): Path of the users file backing this store
+    """
+
+    def __init__(self, path: str = "users.txt"):
+        self.path = path
+        self._users: Dict[str, str] = {}
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._size = 0
+        self._mtime_ns: Optional[int] = None
+        # User added from a last line without a newline, which is re-read next refresh
+        self._tail_user: Optional[str] = None
+        # Serializes refreshes against reads when the store is shared by threads
+        self._lock = threading.Lock()
+
+    @metrics.instrument("user_store.parse")
+    def _parse(self, data: bytes) -> None:
+        """Add the users found in a block of complete lines to the cache."""
+        for line in data.decode("utf-8").splitlines():
+            stored_username, separator, stored_password = line.strip().partition(":")
+            if separator:
+                # The first entry for a username wins, matching the old linear search
+                self._users.setdefault(stored_username, stored_password)
+        metrics.count("user_store.parse", "rows_parsed", data.count(b"\n"))
+        metrics.count("user_store.parse", "bytes_read", len(data))
+
+    def refresh(self) -> None:
+        """
+        Bring the cache up to date with the users file.
+
+        Note:
+            - Costs a single stat() call when the file is unchanged
+            - If the file only grew, just the appended lines are parsed
+            - A replaced, truncated or rewritten file triggers a full reload
+            - A last line without a newline is used as it stands, but is parsed
+              again on the next refresh in case it was still being written
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._users = {}
+            self._inode = None
+            self._offset = self._size = 0
+            self._mtime_ns = None
+            self._tail_user = None
+            return
+
+        if stat.st_ino == self._inode and stat.st_size == self._size and stat.st_mtime_ns == self._mtime_ns:
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._size or \
+                (stat.st_size == self._size and stat.st_mtime_ns != self._mtime_ns):
+            # Not a pure append: start over
+            self._users = {}
+            self._offset = 0
+        elif self._tail_user is not None:
+            # The unterminated last line may have grown; it is parsed again below
+            del self._users[self._tail_user]
+        self._tail_user = None
+
+        with open(self.path, "rb") as file:
+            file.seek(self._offset)
+            data = file.read()
+        end = data.rfind(b"\n") + 1
+        self._parse(data[:end])
+        stored_username, separator, stored_password = data[end:].decode("utf-8", "replace").strip().partition(":")
+        if separator and stored_username not in self._users:
+            self._users[stored_username] = stored_password
+            self._tail_user = stored_username
+        self._inode = stat.st_ino
+        # Only complete lines advance the offset, so the tail is read again next time
+        self._size = self._offset + len(data)
+        self._offset += end
+        self._mtime_ns = stat.st_mtime_ns
+
+    def get(self, username: str) -> Optional[str]:
+        """
+        Return the stored password hash for a username.
+
+        Args:
+            username (str): The username to look up
+
+        Returns:
+            Optional[str]: The hashed password if the user exists, None otherwise
+        """
+        with self._lock:
+            self.refresh()
+            return self._users.get(username)
+
+    def __contains__(self, username: str) -> bool:
+        with self._lock:
+            self.refresh()
+            return username in self._users
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.refresh()
+            return len(self._users)
@@ -9,8 +9,11 @@ Date: July 2nd, 2025
 Version: 1.0.0
 """
 
+import os
 from typing import Optional, Callable
 
+from storage.diagnostics import warn
+
 
 def get_valid_input(prompt: str, error_message: str, validator: Optional[Callable[[str], bool]] = None) -> str:
     """
@@ -50,6 +53,35 @@ def get_valid_input(prompt: str, error_message: str, validator: Optional[Callabl
         return value
 
 
+def get_env_int(name: str, default: int, minimum: int = 1) -> int:
+    """
+    Read an integer setting from an environment variable.
+    
+    Args:
+        name (str): Name of the environment variable
+        default (int): Value used when the variable is unset or invalid
+        minimum (int): Smallest valid value (default: 1)
+        
+    Returns:
+        int: The configured value, or the default
+        
+    Note:
+        An invalid value is reported with a warning rather than raising, so a typo in
+        the environment never stops the application from starting.
+    """
+    setting = os.environ.get(name, "").strip()
+    if not setting:
+        return default
+    try:
+        value = int(setting)
+        if value < minimum:
+            raise ValueError(setting)
+        return value
+    except ValueError:
+        warn("Warning: Ignoring invalid {name} value: {setting!r}", name=name, setting=setting)
+        return default
+
+
 # Example usage and testing (when run as main module)
 if __name__ == "__main__":
     print("Task Manager System - Utilities Module")